@@ -1,7 +1,7 @@
 # apps/alerts/admin.py
 
 from django.contrib import admin
-from .models import Alert
+from .models import Alert, AlertRule
 
 @admin.register(Alert)  # Decorator-based registration for brevity
 class AlertAdmin(admin.ModelAdmin):
@@ -11,3 +11,10 @@ class AlertAdmin(admin.ModelAdmin):
     )
     list_filter   = ('severity', 'status', 'timestamp')
     search_fields = ('type', 'source', 'message')
+
+@admin.register(AlertRule)
+class AlertRuleAdmin(admin.ModelAdmin):
+    list_display  = ('name', 'incubator', 'metric', 'severity', 'min_value', 'max_value', 'is_active')
+    list_select_related = ('incubator',)
+    list_filter   = ('metric', 'severity', 'is_active')
+    search_fields = ('name',)
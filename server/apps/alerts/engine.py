@@ -0,0 +1,167 @@
+# apps/alerts/engine.py
+
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.db import transaction
+
+from apps.core.signals import bulk_created, bulk_updated
+from apps.incubation.models import Incubator
+from .models import Alert, AlertRule
+
+UNITS = {'temperature': '°C', 'humidity': '%', 'co2': 'ppm'}
+
+
+def evaluate(readings):
+    """
+    Check a batch of (incubator_id, metric, timestamp, value) readings
+    against every active AlertRule and raise, refresh or resolve Alerts.
+
+    Each rule is applied to the whole batch with NumPy array operations;
+    per-incubator results come from grouped reductions, not Python loops
+    over readings. Alerts are written with one bulk_create and one
+    bulk_update. Returns the number of alerts written.
+    """
+    if not readings:
+        return 0
+    metrics = sorted({r[1] for r in readings})
+    rules   = list(AlertRule.objects.filter(is_active=True, metric__in=metrics))
+    if not rules:
+        return 0
+
+    n      = len(readings)
+    code   = {m: i for i, m in enumerate(metrics)}
+    inc    = np.fromiter((r[0] for r in readings), dtype=np.int64, count=n)
+    met    = np.fromiter((code[r[1]] for r in readings), dtype=np.int16, count=n)
+    ts     = np.fromiter((r[2].timestamp() for r in readings), dtype=np.float64, count=n)
+    val    = np.fromiter((r[3] for r in readings), dtype=np.float64, count=n)
+
+    outcomes = []
+    for rule in rules:
+        scope = met == code[rule.metric]
+        if rule.incubator_id is not None:
+            scope &= inc == rule.incubator_id
+        if scope.any():
+            outcomes.extend(_evaluate_rule(rule, inc[scope], ts[scope], val[scope]))
+    if not outcomes:
+        return 0
+    return _write_alerts(outcomes)
+
+
+def _evaluate_rule(rule, inc, ts, val):
+    """One rule over its in-scope readings -> per-incubator outcome dicts."""
+    upper = rule.max_value if rule.max_value is not None else np.inf
+    lower = rule.min_value if rule.min_value is not None else -np.inf
+    # Distance outside the band; <= 0 means in range.
+    excess = np.maximum(val - upper, lower - val)
+
+    groups, index = np.unique(inc, return_inverse=True)
+    breaches = np.bincount(index, weights=excess > 0, minlength=len(groups))
+
+    # Latest reading per incubator: sort by (incubator, time), take group ends.
+    order  = np.lexsort((ts, index))
+    ends   = np.r_[np.flatnonzero(np.diff(index[order])), len(order) - 1]
+    latest = order[ends]
+
+    # Worst reading per incubator: same trick ordered by excess.
+    order = np.lexsort((excess, index))
+    worst = order[np.r_[np.flatnonzero(np.diff(index[order])), len(order) - 1]]
+
+    return [
+        {
+            'rule':           rule,
+            'incubator_id':   int(groups[g]),
+            'breaches':       int(breaches[g]),
+            'worst_value':    float(val[worst[g]]),
+            'worst_at':       float(ts[worst[g]]),
+            'worst_high':     bool(val[worst[g]] > upper),
+            'recovered':      bool(excess[latest[g]] <= 0),
+            'latest_at':      float(ts[latest[g]]),
+        }
+        for g in range(len(groups))
+    ]
+
+
+@transaction.atomic
+def _write_alerts(outcomes):
+    rules      = {o['rule'].pk for o in outcomes}
+    incubators = {o['incubator_id'] for o in outcomes}
+    active = {
+        (a.rule_id, a.incubator_id): a
+        for a in Alert.objects.select_for_update().filter(
+            rule_id__in=rules, incubator_id__in=incubators, status='active',
+        )
+    }
+    names = dict(Incubator.objects.filter(pk__in=incubators).values_list('pk', 'name'))
+
+    to_create, to_update = [], []
+    for o in outcomes:
+        rule  = o['rule']
+        alert = active.get((rule.pk, o['incubator_id']))
+        if not o['breaches']:
+            if alert is not None and o['recovered']:
+                _resolve(alert, o['latest_at'])
+                to_update.append(alert)
+            continue
+
+        if alert is None:
+            alert = Alert(
+                rule=rule, incubator_id=o['incubator_id'], metric=rule.metric,
+                type=rule.metric, severity=rule.severity,
+                source=names.get(o['incubator_id'], str(o['incubator_id'])),
+                status='active',
+            )
+            to_create.append(alert)
+        elif alert.numeric_value is not None and _excess(rule, alert.numeric_value) >= _excess(rule, o['worst_value']):
+            # Already recorded something at least as bad; only resolution can change.
+            if o['recovered']:
+                _resolve(alert, o['latest_at'])
+                to_update.append(alert)
+            continue
+        else:
+            to_update.append(alert)
+
+        threshold = rule.max_value if o['worst_high'] else rule.min_value
+        unit      = UNITS.get(rule.metric, '')
+        alert.numeric_value     = o['worst_value']
+        alert.numeric_threshold = threshold
+        alert.value     = f"{o['worst_value']:.2f}{unit}"
+        alert.threshold = f"{'>' if o['worst_high'] else '<'} {threshold:.2f}{unit}"
+        alert.timestamp = alert.timestamp or _to_datetime(o['worst_at'])
+        alert.message   = (
+            f"{rule.metric.capitalize()} {'above' if o['worst_high'] else 'below'} "
+            f"{threshold:.2f}{unit} on {alert.source}: {o['breaches']} reading(s), worst {alert.value}."
+        )
+        if o['recovered']:
+            _resolve(alert, o['latest_at'])
+
+    fields = ['numeric_value', 'numeric_threshold', 'value', 'threshold', 'timestamp',
+              'message', 'status', 'duration']
+    Alert.objects.bulk_create(to_create, batch_size=500)
+    Alert.objects.bulk_update(to_update, fields, batch_size=500)
+    if to_create:
+        bulk_created.send(sender=Alert, instances=to_create)
+    if to_update:
+        bulk_updated.send(sender=Alert, instances=to_update, fields=fields)
+    return len(to_create) + len(to_update)
+
+
+def _excess(rule, value):
+    upper = rule.max_value if rule.max_value is not None else float('inf')
+    lower = rule.min_value if rule.min_value is not None else float('-inf')
+    return max(value - upper, lower - value)
+
+
+def _resolve(alert, at):
+    alert.status   = 'resolved'
+    alert.duration = _format_duration(_to_datetime(at) - alert.timestamp) if alert.timestamp else ''
+
+
+def _to_datetime(epoch):
+    return datetime.fromtimestamp(epoch, tz=dt_timezone.utc)
+
+
+def _format_duration(delta):
+    minutes = max(int(delta.total_seconds() // 60), 0)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m"
@@ -1,6 +1,41 @@
 # apps/alerts/models.py
 
 from django.db import models  # Base ORM layer
+from apps.incubation.models import Incubator
+from apps.telemetry.models import METRIC_CHOICES
+
+SEVERITY_CHOICES = [
+    ('low',    'Low'),
+    ('medium', 'Medium'),
+    ('high',   'High'),
+]
+
+class AlertRule(models.Model):
+    """
+    Numeric bounds for one metric. A reading outside [min_value, max_value]
+    raises an Alert; incubator=None applies the rule to every incubator.
+    """
+    name       = models.CharField(max_length=100)
+    incubator  = models.ForeignKey(
+                   Incubator,
+                   on_delete=models.CASCADE,
+                   null=True, blank=True,
+                   related_name='alert_rules'
+                 )                                       # None = all incubators
+    metric     = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    severity   = models.CharField(max_length=20, choices=SEVERITY_CHOICES)
+    min_value  = models.FloatField(null=True, blank=True)  # breach below
+    max_value  = models.FloatField(null=True, blank=True)  # breach above
+    is_active  = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', 'metric'], name='alertrule_active_metric_idx'),
+        ]
+
+    def __str__(self):
+        scope = self.incubator.name if self.incubator_id else 'all incubators'
+        return f"{self.name}: {self.metric} [{self.min_value}, {self.max_value}] on {scope}"
 
 class Alert(models.Model):
     type       = models.CharField(max_length=50)            # Short string for alert category
@@ -21,5 +56,21 @@ class Alert(models.Model):
     duration   = models.CharField(max_length=50, blank=True) # e.g., "2h 15m"
     resolution = models.TextField(blank=True)               # Resolution notes
 
+    # Set when the alert was raised by the rule engine (engine.py)
+    rule              = models.ForeignKey(AlertRule, on_delete=models.SET_NULL,
+                                          null=True, blank=True, related_name='alerts')
+    incubator         = models.ForeignKey(Incubator, on_delete=models.SET_NULL,
+                                          null=True, blank=True, related_name='alerts')
+    metric            = models.CharField(max_length=20, choices=METRIC_CHOICES, blank=True)
+    numeric_value     = models.FloatField(null=True, blank=True)
+    numeric_threshold = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'timestamp'], name='alert_status_ts_idx'),
+            models.Index(fields=['timestamp', 'id'],     name='alert_ts_id_idx'),
+            models.Index(fields=['rule', 'status'],      name='alert_rule_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.type} ({self.severity}) at {self.timestamp}"
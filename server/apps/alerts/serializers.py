@@ -1,9 +1,25 @@
 # apps/alerts/serializers.py
 
 from rest_framework import serializers
-from .models import Alert
+from apps.core.serializers import SparseFieldsetMixin
+from .models import Alert, AlertRule
 
-class AlertSerializer(serializers.ModelSerializer):
+class AlertSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = Alert
         fields = '__all__'
+
+
+class AlertRuleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model  = AlertRule
+        fields = '__all__'
+
+    def validate(self, attrs):
+        low  = attrs.get('min_value', getattr(self.instance, 'min_value', None))
+        high = attrs.get('max_value', getattr(self.instance, 'max_value', None))
+        if low is None and high is None:
+            raise serializers.ValidationError('Set min_value, max_value or both.')
+        if low is not None and high is not None and low >= high:
+            raise serializers.ValidationError('min_value must be below max_value.')
+        return attrs
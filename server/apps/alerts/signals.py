@@ -0,0 +1,45 @@
+# apps/alerts/signals.py
+
+from django.db.models.signals import post_delete, post_save
+
+from apps.core.events import publish_on_commit
+from apps.core.signals import bulk_created, bulk_updated
+from apps.core.stream import ALERTS_CHANNEL
+from apps.telemetry.ingest import readings_ingested
+from .engine import evaluate
+from .models import Alert
+from .serializers import AlertSerializer
+
+
+def evaluate_ingested(sender, readings, **kwargs):
+    evaluate(readings)
+
+
+def push_saved(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        event = 'alert.created' if created else 'alert.changed'
+        publish_on_commit(ALERTS_CHANNEL, event, AlertSerializer(instance).data)
+
+
+def push_deleted(sender, instance, **kwargs):
+    publish_on_commit(ALERTS_CHANNEL, 'alert.deleted', {'id': instance.pk})
+
+
+def push_bulk_created(sender, instances, **kwargs):
+    for data in AlertSerializer(instances, many=True).data:
+        publish_on_commit(ALERTS_CHANNEL, 'alert.created', data)
+
+
+def push_bulk_updated(sender, instances, **kwargs):
+    for data in AlertSerializer(instances, many=True).data:
+        publish_on_commit(ALERTS_CHANNEL, 'alert.changed', data)
+
+
+def connect():
+    readings_ingested.connect(evaluate_ingested, dispatch_uid='alerts.evaluate_ingested')
+
+    uid = 'alerts.push'
+    post_save.connect(push_saved, sender=Alert, dispatch_uid=uid)
+    post_delete.connect(push_deleted, sender=Alert, dispatch_uid=uid)
+    bulk_created.connect(push_bulk_created, sender=Alert, dispatch_uid=uid)
+    bulk_updated.connect(push_bulk_updated, sender=Alert, dispatch_uid=uid)
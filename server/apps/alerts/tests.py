@@ -1,3 +1,131 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.assertions import EventStreamAssertionsMixin, QueryPlanAssertionsMixin
+from apps.core.stream import ALERTS_CHANNEL
+from apps.incubation.models import Incubator
+from apps.telemetry.ingest import ingest
+from .engine import evaluate
+from .models import Alert, AlertRule
+
+
+class AlertQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_active_alerts_newest_first(self):
+        qs = Alert.objects.filter(status='active').order_by('-timestamp')
+        self.assertIndexSearch(qs, 'alert_status_ts_idx')
+
+    def test_status_in_time_window(self):
+        qs = Alert.objects.filter(
+            status='active',
+            timestamp__gte=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        )
+        self.assertIndexSearch(qs, 'alert_status_ts_idx')
+
+    def test_time_window(self):
+        qs = Alert.objects.filter(
+            timestamp__range=(datetime(2025, 1, 1, tzinfo=timezone.utc),
+                              datetime(2025, 2, 1, tzinfo=timezone.utc)),
+        )
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = Alert.objects.order_by('-timestamp', '-id')[:51]
+        self.assertNoSequentialScan(qs)
+
+
+class AlertExportTests(TestCase):
+
+    def test_day_bounds_on_timestamp(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('qa', password='pw'))
+        for day, hour in ((1, 23), (2, 0), (2, 23), (3, 0)):
+            Alert.objects.create(
+                type='temperature', severity='high', source='Setter 1', value='38.5', threshold='38.0',
+                timestamp=datetime(2025, 3, day, hour, 30, tzinfo=timezone.utc), status='active',
+            )
+        response = client.get('/api/alerts/export/?output=ndjson&from=2025-03-02&to=2025-03-02')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+
+
+class AlertRuleEngineTests(TestCase):
+
+    def setUp(self):
+        self.setter  = Incubator.objects.create(name='Setter 1', capacity=50000)
+        self.hatcher = Incubator.objects.create(name='Hatcher 1', capacity=20000)
+        self.rule = AlertRule.objects.create(
+            name='Setter temperature', metric='temperature', severity='high',
+            min_value=37.2, max_value=38.0,
+        )
+        self.t0 = datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+    def readings(self, incubator, values, metric='temperature', start=0):
+        return [
+            (incubator.pk, metric, self.t0 + timedelta(seconds=5 * (start + i)), v)
+            for i, v in enumerate(values)
+        ]
+
+    def test_breach_raises_one_alert_per_incubator(self):
+        evaluate(self.readings(self.setter, [37.5, 38.4, 38.9, 38.6])
+                 + self.readings(self.hatcher, [37.5, 37.6]))
+        alert = Alert.objects.get()
+        self.assertEqual((alert.incubator, alert.status, alert.severity), (self.setter, 'active', 'high'))
+        self.assertEqual(alert.numeric_value, 38.9)
+        self.assertEqual(alert.numeric_threshold, 38.0)
+        self.assertEqual(alert.value, '38.90°C')
+        self.assertEqual(alert.timestamp, self.t0 + timedelta(seconds=10))
+
+    def test_later_batches_update_then_resolve(self):
+        evaluate(self.readings(self.setter, [38.4]))
+        evaluate(self.readings(self.setter, [36.0], start=1))          # worse, below the band
+        alert = Alert.objects.get()
+        self.assertEqual((alert.numeric_value, alert.numeric_threshold), (36.0, 37.2))
+
+        evaluate(self.readings(self.setter, [37.6], start=720))         # back in range an hour later
+        alert.refresh_from_db()
+        self.assertEqual(alert.status, 'resolved')
+        self.assertEqual(alert.duration, '1h 0m')
+        self.assertEqual(Alert.objects.count(), 1)
+
+    def test_rule_scoped_to_incubator_and_metric(self):
+        self.rule.incubator = self.hatcher
+        self.rule.save()
+        evaluate(self.readings(self.setter, [40.0]) + self.readings(self.hatcher, [90.0], metric='humidity'))
+        self.assertFalse(Alert.objects.exists())
+
+    def test_query_count_is_constant_in_batch_size(self):
+        values = np.random.default_rng(0).normal(37.6, 0.5, 5000)
+        # rules, active alerts, incubator names, savepoint, insert,
+        # table version bump, change log insert, release
+        with self.assertNumQueries(8):
+            evaluate(self.readings(self.setter, values) + self.readings(self.hatcher, values))
+        self.assertEqual(Alert.objects.count(), 2)
+
+    def test_ingest_runs_the_engine_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest([(self.setter.pk, 'temperature', self.t0, 39.5)])
+        self.assertEqual(Alert.objects.get().source, 'Setter 1')
+
+
+class AlertPushTests(EventStreamAssertionsMixin, TestCase):
+
+    def test_engine_alerts_are_pushed_after_commit(self):
+        setter = Incubator.objects.create(name='Setter 1', capacity=50000)
+        AlertRule.objects.create(name='Too hot', metric='temperature', severity='high', max_value=38.0)
+        events = self.listen(ALERTS_CHANNEL)
+        t0 = datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            evaluate([(setter.pk, 'temperature', t0, 38.6)])
+        event, data = events()
+        self.assertEqual((event, data['status'], data['numeric_value']), ('alert.created', 'active', 38.6))
 
-# Create your tests here.
+        with self.captureOnCommitCallbacks(execute=True):
+            evaluate([(setter.pk, 'temperature', t0 + timedelta(minutes=5), 37.5)])
+        event, data = events()
+        self.assertEqual((event, data['status'], data['duration']), ('alert.changed', 'resolved', '5m'))
@@ -2,13 +2,28 @@
 
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from .models      import Alert
-from .serializers import AlertSerializer
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.exports import ExportMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
+from .models      import Alert, AlertRule
+from .serializers import AlertSerializer, AlertRuleSerializer
 
-class AlertViewSet(viewsets.ModelViewSet):
+class AlertViewSet(ExportMixin, ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """
     CRUD API for Alert instances.
     """
     queryset           = Alert.objects.all()
     serializer_class   = AlertSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-timestamp', '-id')
+    export_date_field  = 'timestamp'
+
+class AlertRuleViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
+    """
+    CRUD API for the numeric thresholds the rule engine checks
+    incoming telemetry against.
+    """
+    queryset           = AlertRule.objects.all()
+    serializer_class   = AlertRuleSerializer
+    permission_classes = [IsAuthenticated]
+    ordering           = ('metric', 'id')
@@ -0,0 +1,9 @@
+# apps/batches/admin.py
+
+from django.contrib import admin
+from .models import Batch
+
+@admin.register(Batch)
+class BatchAdmin(admin.ModelAdmin):
+    list_display  = ('code', 'key', 'created_at')
+    search_fields = ('key', 'code')
@@ -0,0 +1,165 @@
+# apps/batches/lineage.py
+
+import re
+
+from django.db.models import Prefetch
+
+from apps.core.signals import bulk_created, bulk_updated
+
+from apps.egg_candling.models import ClearEggCandling, FertileEggCandling
+from apps.egg_candling.serializers import ClearEggCandlingSerializer, FertileEggCandlingSerializer
+from apps.egg_settings.models import EggSetting
+from apps.egg_settings.serializers import EggSettingSerializer
+from apps.final_packaging.models import PackagingBatch
+from apps.final_packaging.serializers import PackagingBatchSerializer
+from apps.hatching.models import HatchingRecord
+from apps.hatching.serializers import HatchingRecordSerializer
+from apps.incubation.models import IncubationBatch
+from apps.incubation.serializers import IncubationBatchSerializer
+from apps.lockdown.models import LockdownBatch
+from apps.lockdown.serializers import LockdownBatchSerializer
+from apps.sales.models import SaleRecord
+from apps.sales.serializers import SaleRecordSerializer
+from .models import Batch
+
+
+class Stage:
+    """
+    One step of a batch's life. ``name`` is both the key in the lifecycle
+    response and the reverse accessor of the stage's ``lineage`` FK;
+    ``totals`` maps summary keys to the fields they add up.
+    """
+
+    def __init__(self, name, model, serializer, date_field, totals=None, prefetch=()):
+        self.name       = name
+        self.model      = model
+        self.serializer = serializer
+        self.date_field = date_field
+        self.totals     = totals or {}
+        self.prefetch   = prefetch
+
+    def queryset(self):
+        return self.model.objects.order_by(self.date_field, 'id').prefetch_related(*self.prefetch)
+
+
+STAGES = [
+    Stage('egg_settings', EggSetting, EggSettingSerializer, 'setting_date',
+          totals={'eggs_set': 'eggs_set'}, prefetch=('collection_ids',)),
+    Stage('incubations', IncubationBatch, IncubationBatchSerializer, 'start_date',
+          totals={'incubated': 'quantity'}),
+    Stage('fertile_candlings', FertileEggCandling, FertileEggCandlingSerializer, 'candling_date',
+          totals={'fertile': 'count'}),
+    Stage('clear_candlings', ClearEggCandling, ClearEggCandlingSerializer, 'candling_date',
+          totals={'clear': 'count'}),
+    Stage('lockdowns', LockdownBatch, LockdownBatchSerializer, 'lockdown_date',
+          totals={'locked_down': 'quantity'}),
+    Stage('hatchings', HatchingRecord, HatchingRecordSerializer, 'hatch_date',
+          totals={'hatched': 'hatched_eggs'}),
+    # Packaging follows its hatch_batch FK, so it must come after hatchings.
+    Stage('packaging_batches', PackagingBatch, PackagingBatchSerializer, 'packaging_date',
+          totals={'chicks_packed': 'chicks_packed'}),
+    Stage('sales', SaleRecord, SaleRecordSerializer, 'date',
+          totals={'sold': 'quantity', 'revenue': 'total_amount'}),
+]
+
+STAGE_MODELS = [stage.model for stage in STAGES]
+
+
+def normalize(code):
+    """' b_001 ' and 'B-001' are the same batch."""
+    return re.sub(r'[\s_]+', '-', (code or '').strip()).upper()
+
+
+def resolve(codes):
+    """{code: Batch id} for the given batch codes, creating unseen batches."""
+    keys  = {code: normalize(code) for code in set(codes)}
+    keys  = {code: key for code, key in keys.items() if key}
+    found = dict(Batch.objects.filter(key__in=set(keys.values())).values_list('key', 'id'))
+
+    missing = {}
+    for code, key in keys.items():
+        if key not in found:
+            missing.setdefault(key, code)
+    if missing:
+        created = Batch.objects.bulk_create(
+            [Batch(key=key, code=code) for key, code in missing.items()],
+            ignore_conflicts=True,      # a concurrent writer may get there first
+        )
+        found.update(Batch.objects.filter(key__in=missing).values_list('key', 'id'))
+        for batch in created:
+            batch.pk = found[batch.key]
+        bulk_created.send(sender=Batch, instances=created)
+    return {code: found[key] for code, key in keys.items()}
+
+
+def assign(model, instances):
+    """Set ``lineage_id`` on in-memory rows; returns the ones that changed."""
+    lineage = [None] * len(instances)
+    if model is PackagingBatch:
+        # The hatch record is the authoritative link; the packaging code is
+        # only used when the hatch record has no lineage yet.
+        hatch_ids = {obj.hatch_batch_id for obj in instances}
+        via_hatch = dict(HatchingRecord.objects.filter(pk__in=hatch_ids).values_list('pk', 'lineage_id'))
+        lineage   = [via_hatch.get(obj.hatch_batch_id) for obj in instances]
+
+    unresolved = [obj.batch_id for obj, batch_id in zip(instances, lineage) if batch_id is None]
+    if unresolved:
+        batch_ids = resolve(unresolved)
+        lineage   = [batch_id or batch_ids.get(obj.batch_id) for obj, batch_id in zip(instances, lineage)]
+
+    changed = []
+    for obj, batch_id in zip(instances, lineage):
+        if obj.lineage_id != batch_id:
+            obj.lineage_id = batch_id
+            changed.append(obj)
+    return changed
+
+
+def link(model, instances, batch_size=1000):
+    """Link rows that are already in the database (rebuilds, backfills)."""
+    changed = assign(model, instances)
+    if changed:
+        model.objects.bulk_update(changed, ['lineage'], batch_size=batch_size)
+        bulk_updated.send(sender=model, instances=changed, fields=['lineage'])
+    return len(changed)
+
+
+def rebuild(model, chunk_size=2000):
+    fields = ['pk', 'batch_id', 'lineage_id']
+    if model is PackagingBatch:
+        fields.append('hatch_batch_id')
+    linked, chunk = 0, []
+    for obj in model.objects.only(*fields).iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            linked += link(model, chunk)
+            chunk = []
+    if chunk:
+        linked += link(model, chunk)
+    return linked
+
+
+def lifecycle_queryset():
+    """Batches with every stage prefetched: one query per stage, whatever the row count."""
+    return Batch.objects.prefetch_related(*[
+        Prefetch(stage.name, queryset=stage.queryset()) for stage in STAGES
+    ])
+
+
+def lifecycle(batch, context=None):
+    stages, summary = {}, {}
+    reached = None
+    for stage in STAGES:
+        rows = list(getattr(batch, stage.name).all())
+        stages[stage.name] = stage.serializer(rows, many=True, context=context).data
+        for key, field in stage.totals.items():
+            summary[key] = sum((getattr(row, field) for row in rows), 0)
+        if rows:
+            reached = stage.name
+    return {
+        'batch':   batch.code,
+        'key':     batch.key,
+        'stage':   reached,
+        'summary': summary,
+        'stages':  stages,
+    }
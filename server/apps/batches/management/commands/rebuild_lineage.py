@@ -0,0 +1,15 @@
+# apps/batches/management/commands/rebuild_lineage.py
+
+from django.core.management.base import BaseCommand
+
+from apps.batches.lineage import STAGES, rebuild
+
+
+class Command(BaseCommand):
+    help = "Link every stage record to its batch (backfill after upgrades or raw imports)."
+
+    def handle(self, *args, **options):
+        for stage in STAGES:
+            linked = rebuild(stage.model)
+            self.stdout.write(f"{stage.model.__name__}: {linked} rows relinked")
+        self.stdout.write(self.style.SUCCESS("Lineage rebuilt."))
@@ -0,0 +1,35 @@
+# apps/batches/management/commands/refresh_batch_schedule.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.batches.schedule import refresh
+
+
+class Command(BaseCommand):
+    help = ("Recompute IncubationBatch.progress, LockdownBatch.day and the transfer-due flag "
+            "with one UPDATE per table. Run nightly from cron, or keep it running with --every.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help="Compute as of this day (YYYY-MM-DD) instead of today.")
+        parser.add_argument('--every', type=int, metavar='SECONDS',
+                            help="Keep running and refresh every SECONDS.")
+
+    def handle(self, *args, date=None, every=None, **options):
+        today = None
+        if date:
+            today = parse_date(date)
+            if today is None:
+                raise CommandError("--date must be YYYY-MM-DD.")
+
+        while True:
+            changed = refresh(today)
+            self.stdout.write(
+                f"progress: {changed['incubation_progress']} rows, "
+                f"lockdown day: {changed['lockdown_days']} rows"
+            )
+            if not every:
+                break
+            time.sleep(every)
@@ -0,0 +1,15 @@
+# apps/batches/models.py
+
+from django.db import models
+
+class Batch(models.Model):
+    """
+    One production batch, keyed by its normalized batch code. Every stage
+    record points here through its ``lineage`` foreign key.
+    """
+    key         = models.CharField(max_length=50, unique=True)
+    code        = models.CharField(max_length=50)     # as first written
+    created_at  = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.code
@@ -0,0 +1,65 @@
+# apps/batches/schedule.py
+
+from django.db import transaction
+from django.db.models import BooleanField, DateField, DecimalField, ExpressionWrapper, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, NullIf, Round
+from django.db.models.lookups import GreaterThanOrEqual, LessThan
+from django.utils import timezone
+
+from apps.core.functions import DaysBetween
+from apps.core.signals import queryset_updated
+from apps.incubation.models import IncubationBatch
+from apps.lockdown.models import HATCH_DAY, TRANSFER_DAY, LockdownBatch
+
+
+def incubation_progress(today):
+    """Percent of start_date -> expected_hatch_date elapsed, clamped to 0..100."""
+    elapsed = Cast(DaysBetween(Value(today, DateField()), 'start_date'), FloatField())
+    length  = NullIf(DaysBetween('expected_hatch_date', 'start_date'), Value(0))
+    percent = Coalesce(elapsed * Value(100.0) / length, Value(100.0))
+    return Cast(Round(Least(Greatest(percent, Value(0.0)), Value(100.0)), 2),
+                DecimalField(max_digits=5, decimal_places=2))
+
+
+def lockdown_day(today):
+    return Greatest(DaysBetween(Value(today, DateField()), 'start_date'), Value(0))
+
+
+def transfer_due(day):
+    """Between lockdown (day 18) and hatch (day 21): waiting to move to a hatcher."""
+    return ExpressionWrapper(Q(GreaterThanOrEqual(day, TRANSFER_DAY)) & Q(LessThan(day, HATCH_DAY)),
+                             output_field=BooleanField())
+
+
+def refresh_incubation_progress(today):
+    progress = incubation_progress(today)
+    # Rows already up to date are skipped, so a refresh only writes what moved.
+    changed = IncubationBatch.objects.exclude(progress=progress).update(progress=progress)
+    if changed:
+        queryset_updated.send(sender=IncubationBatch)
+    return changed
+
+
+def refresh_lockdown_days(today):
+    day = lockdown_day(today)
+    due = transfer_due(day)
+    changed = (LockdownBatch.objects
+               .exclude(day=day, transfer_due=due)
+               .update(day=day, transfer_due=due))
+    if changed:
+        queryset_updated.send(sender=LockdownBatch)
+    return changed
+
+
+def refresh(today=None):
+    """
+    Recompute both tables with one UPDATE each; returns rows changed per
+    table. Rows are not listed to ``queryset_updated``, so the change feed
+    logs a reset and clients reload these two lists once per refresh.
+    """
+    today = today or timezone.localdate()
+    with transaction.atomic():
+        return {
+            'incubation_progress': refresh_incubation_progress(today),
+            'lockdown_days':       refresh_lockdown_days(today),
+        }
@@ -0,0 +1,10 @@
+# apps/batches/serializers.py
+
+from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
+from .models import Batch
+
+class BatchSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model  = Batch
+        fields = '__all__'
@@ -0,0 +1,36 @@
+# apps/batches/signals.py
+
+from django.db.models.signals import post_save, pre_save
+
+from apps.core.signals import pre_bulk_create, queryset_updated
+from apps.final_packaging.models import PackagingBatch
+from apps.hatching.models import HatchingRecord
+from .lineage import STAGE_MODELS, assign
+
+
+def link_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        assign(sender, [instance])
+
+
+def link_bulk_creating(sender, instances, **kwargs):
+    assign(sender, instances)
+
+
+def relink_packaging(sender, instance, raw=False, **kwargs):
+    """Packaging rows follow their hatch record when it moves batch."""
+    if not raw and instance.lineage_id is not None:
+        pks = list(PackagingBatch.objects.filter(hatch_batch=instance)
+                   .exclude(lineage_id=instance.lineage_id)
+                   .values_list('pk', flat=True))
+        if pks:
+            PackagingBatch.objects.filter(pk__in=pks).update(lineage_id=instance.lineage_id)
+            queryset_updated.send(sender=PackagingBatch, pks=pks)
+
+
+def connect():
+    for model in STAGE_MODELS:
+        uid = f'lineage.{model._meta.label}'
+        pre_save.connect(link_saved, sender=model, dispatch_uid=uid)
+        pre_bulk_create.connect(link_bulk_creating, sender=model, dispatch_uid=uid)
+    post_save.connect(relink_packaging, sender=HatchingRecord, dispatch_uid='lineage.relink_packaging')
@@ -0,0 +1,187 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.egg_candling.models import ClearEggCandling, FertileEggCandling
+from apps.egg_collections.models import EggCollection
+from apps.egg_settings.models import EggSetting
+from apps.final_packaging.models import PackagingBatch
+from apps.hatching.models import HatchingRecord
+from apps.incubation.models import IncubationBatch, Incubator
+from apps.lockdown.models import LockdownBatch
+from apps.sales.models import SaleRecord
+from .lineage import normalize
+from .schedule import refresh
+from .models import Batch
+
+
+def make_chain(code, sales=1, day=1):
+    collection = EggCollection.objects.create(
+        farmer_name='Farm', label='L', animal_type='chicken', type_of_eggs='broiler',
+        full_trays=10, unfull_trays=0, unfull_tray_count=0, damaged_eggs=0, date=date(2025, 1, day),
+    )
+    setting = EggSetting.objects.create(
+        batch_id=code, setting_date=date(2025, 1, day), type_of_eggs='broiler', full_setters=1,
+        unfull_setters=0, unfull_setter_eggs=0, eggs_set=300, dirty_eggs=0, damaged_eggs=0,
+        reject_eggs=0, cumulative_reject_eggs=0,
+    )
+    setting.collection_ids.add(collection)
+    IncubationBatch.objects.create(
+        batch_id=code, incubator=Incubator.objects.create(name='Setter', capacity=1000),
+        start_date=date(2025, 1, day), expected_hatch_date=date(2025, 1, day + 21), quantity=300,
+        breed='Ross 308', progress=Decimal('0'), status='incubating',
+    )
+    FertileEggCandling.objects.create(batch_id=code, candling_date=date(2025, 1, day + 7), count=280)
+    ClearEggCandling.objects.create(batch_id=code, candling_date=date(2025, 1, day + 7), count=20)
+    LockdownBatch.objects.create(
+        batch_id=code, label='L', start_date=date(2025, 1, day), lockdown_date=date(2025, 1, day + 18),
+        quantity=280, incubator_id='1', transferred_to='H1', humidity=Decimal('65'),
+        temperature=Decimal('37.2'), day=18,
+    )
+    hatch = HatchingRecord.objects.create(
+        batch_id=code, label='L', hatch_date=date(2025, 1, day + 21), quantity=280, hatched_eggs=250,
+        unhatched_eggs=30, cull_chicks=0, dead_chicks=0, status='completed',
+    )
+    PackagingBatch.objects.create(
+        batch_id=f'PK-{code}', label='L', packaging_date=date(2025, 1, day + 21), hatch_batch=hatch,
+        type_of_chicks='broiler', box_type='100', full_boxes=2, unfull_boxes=1, unfull_box_count=50,
+        chicks_packed=250, status='completed',
+    )
+    for i in range(sales):
+        SaleRecord.objects.create(
+            batch_id=code, date=date(2025, 1, day + 22), customer=f'C{i}', product_type='chicks',
+            quantity=10, unit_price=Decimal('2'), total_amount=Decimal('20'), paid=Decimal('20'),
+            balance=Decimal('0'), payment_method='Cash', status='completed',
+        )
+    return hatch
+
+
+class LineageIndexTests(TestCase):
+
+    def test_codes_are_normalized_into_one_batch(self):
+        self.assertEqual(normalize(' b_001 '), 'B-001')
+        make_chain('B-001')
+        SaleRecord.objects.filter(batch_id='B-001').update(batch_id=' b_001')
+        sale = SaleRecord.objects.get()
+        sale.save()
+        batch = Batch.objects.get()
+        self.assertEqual((batch.key, batch.code), ('B-001', 'B-001'))
+        self.assertEqual(sale.lineage, batch)
+
+    def test_packaging_follows_the_hatch_record(self):
+        hatch = make_chain('B-001')
+        packaging = PackagingBatch.objects.get()
+        self.assertEqual(packaging.lineage.key, 'B-001')     # not PK-B-001
+        hatch.batch_id = 'B-002'
+        hatch.save()
+        packaging.refresh_from_db()
+        self.assertEqual(packaging.lineage.key, 'B-002')
+
+    def test_bulk_created_rows_are_linked(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('qa', password='pw'))
+        response = client.post('/api/egg-candling/fertile/', [
+            {'batch_id': code, 'candling_date': '2025-01-08', 'count': 10}
+            for code in ('B-001', 'b-001', 'B-002')
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(FertileEggCandling.objects.values_list('lineage__key', flat=True)),
+            ['B-001', 'B-001', 'B-002'],
+        )
+
+    def test_rebuild_backfills_unlinked_rows(self):
+        make_chain('B-001')
+        for model in (EggSetting, SaleRecord, PackagingBatch):
+            model.objects.update(lineage=None)
+        call_command('rebuild_lineage', stdout=StringIO())
+        batch = Batch.objects.get()
+        self.assertEqual(batch.egg_settings.count(), 1)
+        self.assertEqual(batch.sales.count(), 1)
+        self.assertEqual(batch.packaging_batches.count(), 1)
+
+
+class LifecycleEndpointTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('qa', password='pw'))
+
+    def test_whole_chain_in_one_call(self):
+        make_chain('B-001', sales=2)
+        make_chain('B-002')
+        response = self.client.get('/api/batches/b_001/lifecycle/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['batch'], 'B-001')
+        self.assertEqual(response.data['stage'], 'sales')
+        self.assertEqual({name: len(rows) for name, rows in response.data['stages'].items()}, {
+            'egg_settings': 1, 'incubations': 1, 'fertile_candlings': 1, 'clear_candlings': 1,
+            'lockdowns': 1, 'hatchings': 1, 'packaging_batches': 1, 'sales': 2,
+        })
+        self.assertEqual(response.data['summary']['hatched'], 250)
+        self.assertEqual(response.data['summary']['revenue'], Decimal('40'))
+
+    def test_query_count_does_not_grow_with_records(self):
+        make_chain('B-001', sales=1)
+        make_chain('B-002', sales=40)
+        # batch + 8 stages + the settings' egg collections
+        with self.assertNumQueries(10):
+            self.client.get('/api/batches/B-001/lifecycle/')
+        with self.assertNumQueries(10):
+            self.client.get('/api/batches/B-002/lifecycle/')
+
+    def test_unknown_batch(self):
+        self.assertEqual(self.client.get('/api/batches/NOPE/lifecycle/').status_code, 404)
+
+
+class BatchScheduleTests(TestCase):
+
+    def setUp(self):
+        incubator = Incubator.objects.create(name='Setter', capacity=1000)
+        for code, start in (('B-001', date(2025, 1, 1)), ('B-002', date(2025, 1, 10))):
+            IncubationBatch.objects.create(
+                batch_id=code, incubator=incubator, start_date=start,
+                expected_hatch_date=start + timedelta(days=21), quantity=300, breed='Ross 308',
+                progress=Decimal('0'), status='incubating',
+            )
+            LockdownBatch.objects.create(
+                batch_id=code, label='L', start_date=start, lockdown_date=start + timedelta(days=18),
+                quantity=280, incubator_id='1', transferred_to='H1', humidity=Decimal('65'),
+                temperature=Decimal('37.2'), day=0,
+            )
+
+    def test_one_update_per_table(self):
+        # transaction + per table: UPDATE, version bump, change log reset
+        with self.assertNumQueries(2 + 2 * 3):
+            changed = refresh(date(2025, 1, 19))
+        self.assertEqual(changed, {'incubation_progress': 2, 'lockdown_days': 2})
+        self.assertEqual(
+            list(IncubationBatch.objects.order_by('batch_id').values_list('progress', flat=True)),
+            [Decimal('85.71'), Decimal('42.86')],
+        )
+        self.assertEqual(
+            list(LockdownBatch.objects.order_by('batch_id').values_list('day', 'transfer_due')),
+            [(18, True), (9, False)],
+        )
+
+    def test_unchanged_rows_are_not_rewritten(self):
+        refresh(date(2025, 1, 19))
+        self.assertEqual(refresh(date(2025, 1, 19)), {'incubation_progress': 0, 'lockdown_days': 0})
+
+    def test_values_are_clamped_and_transfer_window_closes(self):
+        refresh(date(2024, 12, 1))
+        self.assertEqual(set(IncubationBatch.objects.values_list('progress', flat=True)), {Decimal('0')})
+        self.assertEqual(set(LockdownBatch.objects.values_list('day', flat=True)), {0})
+        refresh(date(2025, 3, 1))
+        self.assertEqual(set(IncubationBatch.objects.values_list('progress', flat=True)), {Decimal('100')})
+        self.assertFalse(LockdownBatch.objects.filter(transfer_due=True).exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command('refresh_batch_schedule', date='2025-01-19', stdout=out)
+        self.assertEqual(out.getvalue(), 'progress: 2 rows, lockdown day: 2 rows\n')
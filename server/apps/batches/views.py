@@ -0,0 +1,36 @@
+# apps/batches/views.py
+
+from django.http import Http404
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.mixins import FastListMixin
+from .lineage      import lifecycle, lifecycle_queryset, normalize
+from .models       import Batch
+from .serializers  import BatchSerializer
+
+class BatchViewSet(ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only API over the batch lineage index. Batches are looked up by
+    code, case- and separator-insensitively (``b_001`` finds ``B-001``).
+    """
+    queryset           = Batch.objects.all()
+    serializer_class   = BatchSerializer
+    permission_classes = [IsAuthenticated]
+    ordering           = ('-id',)
+    lookup_field       = 'key'
+    lookup_value_regex = '[^/]+'
+
+    def get_object(self):
+        self.kwargs['key'] = normalize(self.kwargs['key'])
+        return super().get_object()
+
+    @action(detail=True, methods=['get'])
+    def lifecycle(self, request, key=None):
+        """Every stage record of the batch, oldest first, in a fixed number of queries."""
+        batch = lifecycle_queryset().filter(key=normalize(key)).first()
+        if batch is None:
+            raise Http404
+        return Response(lifecycle(batch, self.get_serializer_context()))
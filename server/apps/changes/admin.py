@@ -0,0 +1,15 @@
+# apps/changes/admin.py
+
+from django.contrib import admin
+from .models import Change, TableVersion
+
+@admin.register(TableVersion)
+class TableVersionAdmin(admin.ModelAdmin):
+    list_display    = ('table', 'version', 'updated_at')
+    readonly_fields = ('table', 'version', 'updated_at')
+
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    list_display    = ('id', 'table', 'object_id', 'action', 'created_at')
+    list_filter     = ('table', 'action')
+    readonly_fields = ('table', 'object_id', 'action', 'created_at')
@@ -0,0 +1,100 @@
+# apps/changes/conditional.py
+
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from .feed import change_feed, parse_cursor
+from .versions import current
+
+
+def conditional_response(request, models, render, cursor=False):
+    """
+    Answer ``request`` from the versions of ``models``: a 304 when the
+    client's validators still match, otherwise ``render()`` with ETag and
+    Last-Modified set. The versions are read before ``render`` runs, so a
+    concurrent write can only make the next validator miss, never hit.
+    With ``cursor``, X-Change-Cursor carries the first model's newest
+    change id, the starting point for ``?since=`` deltas.
+
+    A rendered response marked ``unversioned`` (its body may predate the
+    versions, e.g. read from a lagging replica) goes out without
+    validators, so no client revalidates against it.
+    """
+    versions, last_modified, cursors = current(models)
+    etag = make_etag(request, versions)
+
+    if not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+    else:
+        response = render()
+        if response.status_code != 200:
+            return response
+        if getattr(response, 'unversioned', False):
+            response['Cache-Control'] = 'no-store'
+            return response
+
+    response['ETag'] = etag
+    if cursor:
+        response['X-Change-Cursor'] = str(cursors[0])
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Revalidate every time; responses differ per user.
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ('Authorization', 'Accept'))
+    return response
+
+
+def make_etag(request, versions):
+    user = getattr(request, 'user', None)
+    seed = '|'.join([
+        str(getattr(user, 'pk', '')),
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+        ','.join(map(str, versions)),
+    ])
+    return f'W/"{hashlib.md5(seed.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def not_modified(request, etag, last_modified):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # Weak comparison; If-Modified-Since is ignored when this is sent.
+        tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+        return '*' in tags or etag.removeprefix('W/') in tags
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return since is not None and last_modified is not None and int(last_modified.timestamp()) <= since
+
+
+class ConditionalGetMixin:
+    """
+    ModelViewSet mixin: ETag / Last-Modified on list and retrieve, keyed
+    to the table versions of the viewset's model plus
+    ``version_depends_on``. A 304 costs one version lookup; the main
+    query and serializer never run.
+
+    ``?since=<cursor>`` on the list turns it into the delta feed of
+    ``feed.change_feed``; the list itself reports the cursor to start
+    from in X-Change-Cursor.
+    """
+    version_depends_on  = ()
+    since_query_param   = 'since'
+    change_page_size    = 500
+
+    def get_version_models(self):
+        return (self.queryset.model, *self.version_depends_on)
+
+    def list(self, request, *args, **kwargs):
+        if self.since_query_param in request.query_params:
+            since = parse_cursor(request.query_params[self.since_query_param])
+            return conditional_response(request, self.get_version_models(),
+                                        lambda: change_feed(self, request, since, self.change_page_size))
+        return conditional_response(request, self.get_version_models(),
+                                    lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+                                    cursor=True)
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(request, self.get_version_models(),
+                                    lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,59 @@
+# apps/changes/log.py
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Change
+from .versions import scope_column, table_key
+
+
+def record(model, action, pks=None, owners=None, scope=None):
+    """
+    Append one change row per pk; ``pks=None`` logs a RESET of the whole
+    table, or with ``scope`` of that owner's rows only.
+
+    Rows of SCOPED_MODELS carry their owner: ``scope`` when it owns all
+    of them, else from ``owners`` (pk -> owner id), and pks neither
+    covers are looked up in the table.
+    """
+    key = table_key(model)
+    if pks is None:
+        rows = [Change(table=key, action=Change.RESET, scope=scope)]
+    else:
+        pks    = list(dict.fromkeys(pks))
+        owners = dict.fromkeys(pks, scope) if scope is not None else owners_of(model, pks, owners)
+        rows   = [Change(table=key, object_id=pk, action=action, scope=owners.get(pk)) for pk in pks]
+    Change.objects.bulk_create(rows, batch_size=1000)
+
+
+def owners_of(model, pks, known=None):
+    column = scope_column(model)
+    if column is None:
+        return {}
+    owners  = dict(known or {})
+    missing = [pk for pk in pks if pk not in owners]
+    if missing:
+        owners.update(model._base_manager.filter(pk__in=missing).values_list('pk', column))
+    return owners
+
+
+def prune(older_than):
+    """
+    Delete change rows older than ``older_than`` seconds; how many went.
+
+    Each table keeps its newest pruned row, turned into a RESET: a client
+    whose cursor predates what is left reloads instead of missing the
+    pruned changes, and clients past it notice nothing.
+    """
+    cutoff   = timezone.now() - timedelta(seconds=older_than)
+    horizons = (Change.objects.filter(created_at__lt=cutoff)
+                .values('table').annotate(horizon=Max('id')).values_list('table', 'horizon'))
+    deleted  = 0
+    for table, horizon in list(horizons):
+        with transaction.atomic():
+            deleted += Change.objects.filter(table=table, id__lt=horizon).delete()[0]
+            Change.objects.filter(pk=horizon).update(action=Change.RESET, object_id=None, scope=None)
+    return deleted
@@ -0,0 +1,18 @@
+# apps/changes/management/commands/prune_changes.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.changes.log import prune
+
+
+class Command(BaseCommand):
+    help = "Delete change-log rows older than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.CHANGE_LOG_RETENTION_DAYS,
+                            help='Keep this many days of changes (default: CHANGE_LOG_RETENTION_DAYS).')
+
+    def handle(self, *args, **options):
+        deleted = prune(options['days'] * 86400)
+        self.stdout.write(self.style.SUCCESS(f"Change log pruned: {deleted} rows deleted."))
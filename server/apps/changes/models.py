@@ -0,0 +1,37 @@
+# apps/changes/models.py
+
+from django.db import models
+from django.utils import timezone
+
+class TableVersion(models.Model):
+    """Write counter per tracked table; bumped in the writing transaction."""
+    table       = models.CharField(max_length=100, primary_key=True)   # app_label.model
+    version     = models.PositiveBigIntegerField(default=0)
+    updated_at  = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
+
+
+class Change(models.Model):
+    """
+    One row per written object, in commit order per table: the log behind
+    the ``?since=<cursor>`` delta feed. The id is the cursor.
+    """
+    INSERT = 'insert'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    RESET  = 'reset'      # table-wide rewrite; clients reload
+    ACTION_CHOICES = [(INSERT, 'Insert'), (UPDATE, 'Update'), (DELETE, 'Delete'), (RESET, 'Reset')]
+
+    table       = models.CharField(max_length=100)
+    object_id   = models.BigIntegerField(null=True, blank=True)      # null on RESET
+    scope       = models.BigIntegerField(null=True, blank=True)      # owner id, for SCOPED_MODELS
+    action      = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    created_at  = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=['table', 'id'], name='change_table_id_idx')]
+
+    def __str__(self):
+        return f"{self.table} #{self.object_id} {self.action}"
@@ -0,0 +1,63 @@
+# apps/changes/signals.py
+
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+
+from apps.core.signals import bulk_created, bulk_updated, queryset_updated
+from .log import record
+from .models import Change
+from .versions import bump, scope_column, seed, tracked_models
+
+
+def write(model, action, pks, owners=None, scope=None):
+    # The version UPDATE takes the table's row lock first, so concurrent
+    # writers to one table allocate change ids in commit order.
+    bump(model)
+    record(model, action, pks, owners, scope)
+
+
+def owners(model, instances):
+    column = scope_column(model)
+    return {obj.pk: getattr(obj, column) for obj in instances} if column else None
+
+
+def saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        write(sender, Change.INSERT if created else Change.UPDATE, [instance.pk], owners(sender, [instance]))
+
+
+def deleted(sender, instance, **kwargs):
+    # The row is gone; its owner is only known from the instance.
+    write(sender, Change.DELETE, [instance.pk], owners(sender, [instance]))
+
+
+def bulk_written(sender, instances, fields=None, **kwargs):
+    pks = [obj.pk for obj in instances]
+    if None in pks:         # ignore_conflicts inserts come back without ids
+        pks = None
+    write(sender, Change.UPDATE if fields is not None else Change.INSERT, pks, owners(sender, instances))
+
+
+def queryset_written(sender, pks=None, scope=None, **kwargs):
+    write(sender, Change.UPDATE, pks, scope=scope)
+
+
+def m2m_written(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        # The serialized id list lives on the forward side's rows.
+        if reverse:
+            write(model, Change.UPDATE, None if pk_set is None else list(pk_set))
+        else:
+            write(type(instance), Change.UPDATE, [instance.pk])
+
+
+def connect(app_config):
+    post_migrate.connect(seed, sender=app_config, dispatch_uid='versions.seed')
+    for model in tracked_models():
+        uid = f'changes.{model._meta.label}'
+        post_save.connect(saved, sender=model, dispatch_uid=uid)
+        post_delete.connect(deleted, sender=model, dispatch_uid=uid)
+        bulk_created.connect(bulk_written, sender=model, dispatch_uid=uid)
+        bulk_updated.connect(bulk_written, sender=model, dispatch_uid=uid)
+        queryset_updated.connect(queryset_written, sender=model, dispatch_uid=uid)
+        for field in model._meta.many_to_many:
+            m2m_changed.connect(m2m_written, sender=field.remote_field.through, dispatch_uid=uid)
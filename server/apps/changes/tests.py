@@ -0,0 +1,241 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from apps.core.assertions import QueryPlanAssertionsMixin
+from apps.core.signals import queryset_updated
+
+from apps.egg_collections.models import EggCollection
+from apps.egg_collections.views import EggCollectionViewSet
+from apps.egg_settings.models import EggSetting
+from apps.lockdown.models import LockdownBatch
+from apps.notifications.models import Notification
+from apps.sales.models import SaleRecord
+from .models import Change, TableVersion
+
+
+def make_collection(i=0):
+    return EggCollection.objects.create(
+        farmer_name=f'Farmer {i}', label=f'L{i}', animal_type='chicken', type_of_eggs='broiler',
+        full_trays=10, unfull_trays=1, unfull_tray_count=12, damaged_eggs=0, date=date(2025, 3, 1),
+    )
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_user('clerk', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.collection = make_collection()
+
+    def get(self, url, **headers):
+        return self.client.get(url, headers=headers)
+
+    def test_list_and_detail_carry_validators(self):
+        for url in ('/api/egg-collections/', f'/api/egg-collections/{self.collection.pk}/'):
+            response = self.get(url)
+            self.assertTrue(response['ETag'].startswith('W/"'))
+            self.assertIn('Last-Modified', response)
+            self.assertEqual(response['Cache-Control'], 'private, no-cache')
+
+    def test_matching_etag_is_a_304_without_the_main_query(self):
+        etag = self.get('/api/egg-collections/')['ETag']
+        with self.assertNumQueries(1):      # table versions only
+            response = self.get('/api/egg-collections/', if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_writes_change_the_etag(self):
+        url  = '/api/egg-collections/'
+        etag = self.get(url)['ETag']
+        writes = [
+            lambda: make_collection(1),
+            lambda: self.collection.save(),
+            lambda: self.client.post(url, [{
+                'farmer_name': 'Bulk', 'label': 'B', 'animal_type': 'chicken', 'type_of_eggs': 'broiler',
+                'full_trays': 1, 'unfull_trays': 0, 'unfull_tray_count': 0, 'damaged_eggs': 0,
+                'date': '2025-03-02',
+            }], format='json'),
+            lambda: self.collection.delete(),
+        ]
+        for write in writes:
+            write()
+            response = self.get(url, if_none_match=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+
+    def test_queryset_update_through_the_api_changes_the_etag(self):
+        Notification.objects.create(user=self.user, title='hello')
+        etag = self.get('/api/notifications/')['ETag']
+        self.client.post('/api/notifications/mark-all-read/')
+        self.assertEqual(self.get('/api/notifications/', if_none_match=etag).status_code, 200)
+
+    def test_m2m_change_bumps_the_owner(self):
+        setting = EggSetting.objects.create(
+            batch_id='B-1', setting_date=date(2025, 3, 2), type_of_eggs='broiler', full_setters=1,
+            unfull_setters=0, unfull_setter_eggs=0, eggs_set=90, dirty_eggs=0, damaged_eggs=0,
+            reject_eggs=0, cumulative_reject_eggs=0,
+        )
+        before = TableVersion.objects.get(table='egg_settings.eggsetting').version
+        setting.collection_ids.add(self.collection)
+        self.assertEqual(TableVersion.objects.get(table='egg_settings.eggsetting').version, before + 1)
+
+    def test_if_modified_since(self):
+        last_modified = self.get('/api/egg-collections/')['Last-Modified']
+        self.assertEqual(self.get('/api/egg-collections/', if_modified_since=last_modified).status_code, 304)
+        self.assertEqual(self.get('/api/egg-collections/', if_modified_since=http_date(0)).status_code, 200)
+
+    def test_etag_is_per_user_and_per_url(self):
+        etag = self.get('/api/egg-collections/')['ETag']
+        self.assertNotEqual(self.get('/api/egg-collections/?page_size=1')['ETag'], etag)
+        self.client.force_authenticate(User.objects.create_user('other', password='pw'))
+        self.assertEqual(self.get('/api/egg-collections/', if_none_match=etag).status_code, 200)
+
+    def test_report_304_skips_the_cache(self):
+        caches['reports'].clear()
+        SaleRecord.objects.create(
+            batch_id='B-1', date=date(2025, 3, 1), customer='Acme', product_type='chicks', quantity=10,
+            unit_price=Decimal('1.00'), total_amount=Decimal('10.00'), paid=Decimal('10.00'),
+            balance=Decimal('0'), payment_method='Cash', status='completed',
+        )
+        etag = self.get('/api/reports/sales/')['ETag']
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get('/api/reports/sales/', if_none_match=etag).status_code, 304)
+
+
+class ChangeFeedTests(QueryPlanAssertionsMixin, TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_user('clerk', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.rows   = [make_collection(i) for i in range(3)]
+
+    def feed(self, since, url='/api/egg-collections/'):
+        response = self.client.get(url, {'since': since})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_list_reports_the_cursor_to_start_from(self):
+        cursor = self.client.get('/api/egg-collections/')['X-Change-Cursor']
+        self.assertEqual(int(cursor), Change.objects.latest('id').pk)
+        self.assertEqual(self.feed(cursor), {
+            'cursor': cursor, 'has_more': False, 'reset': False, 'changed': [], 'deleted': [],
+        })
+
+    def test_delta_holds_only_what_changed(self):
+        cursor = self.client.get('/api/egg-collections/')['X-Change-Cursor']
+        self.rows[0].label = 'edited'
+        self.rows[0].save()
+        added = make_collection(9)
+        gone  = self.rows[1].pk
+        self.rows[1].delete()
+
+        delta = self.feed(cursor)
+        self.assertEqual(sorted(row['id'] for row in delta['changed']), [self.rows[0].pk, added.pk])
+        self.assertEqual(delta['deleted'], [gone])
+        self.assertEqual(self.feed(delta['cursor'])['changed'], [])
+
+    def test_created_then_deleted_is_a_tombstone(self):
+        cursor = self.client.get('/api/egg-collections/')['X-Change-Cursor']
+        doomed = make_collection(9)
+        pk = doomed.pk
+        doomed.delete()
+        self.assertEqual(self.feed(cursor)['deleted'], [pk])
+
+    def test_pages_through_long_deltas(self):
+        cursor, seen = '0', []
+        with patch.object(EggCollectionViewSet, 'change_page_size', 2):
+            while True:
+                page = self.feed(cursor)
+                seen += [row['id'] for row in page['changed']]
+                cursor = page['cursor']
+                if not page['has_more']:
+                    break
+        self.assertEqual(sorted(seen), [row.pk for row in self.rows])
+
+    def test_delta_cost_does_not_grow_with_the_table(self):
+        cursor = self.client.get('/api/egg-collections/')['X-Change-Cursor']
+        self.rows[0].save()
+        # versions for the ETag, change log page, changed rows
+        with self.assertNumQueries(3):
+            self.feed(cursor)
+        self.assertIndexSearch(
+            Change.objects.filter(table='egg_collections.eggcollection', id__gt=0).order_by('id')[:10],
+            'change_table_id_idx',
+        )
+
+    def test_scoped_views_only_return_visible_rows(self):
+        other = User.objects.create_user('other', password='pw')
+        cursor = self.client.get('/api/notifications/')['X-Change-Cursor']
+        mine   = Notification.objects.create(user=self.user, title='mine')
+        theirs = Notification.objects.create(user=other, title='theirs')
+        delta  = self.feed(cursor, '/api/notifications/')
+        self.assertEqual([row['title'] for row in delta['changed']], ['mine'])
+        self.assertEqual(delta['deleted'], [])
+        self.client.post('/api/notifications/mark-read/', {'ids': [mine.pk]}, format='json')
+        self.assertEqual(self.feed(delta['cursor'], '/api/notifications/')['changed'][0]['is_read'], True)
+
+    def test_scoped_views_only_report_their_own_deletes(self):
+        other  = User.objects.create_user('other', password='pw')
+        mine   = Notification.objects.create(user=self.user, title='mine')
+        theirs = Notification.objects.create(user=other, title='theirs')
+        cursor = self.client.get('/api/notifications/')['X-Change-Cursor']
+        pks    = [mine.pk, theirs.pk]
+        mine.delete()
+        theirs.delete()
+        self.assertEqual(self.feed(cursor, '/api/notifications/')['deleted'], pks[:1])
+        self.assertEqual(Change.objects.filter(object_id=pks[1], action=Change.DELETE).get().scope, other.pk)
+
+    def test_mark_all_read_resets_only_that_users_feed(self):
+        other = User.objects.create_user('other', password='pw')
+        for user in (self.user, self.user, other):
+            Notification.objects.create(user=user, title='unread')
+        cursor = self.client.get('/api/notifications/')['X-Change-Cursor']
+        self.client.post('/api/notifications/mark-all-read/')
+        self.assertEqual(Change.objects.filter(id__gt=cursor).count(), 1)
+        self.assertTrue(self.feed(cursor, '/api/notifications/')['reset'])
+        self.client.force_authenticate(other)
+        self.assertFalse(self.feed(cursor, '/api/notifications/')['reset'])
+
+    def test_pruned_changes_ask_old_cursors_to_reload(self):
+        old = make_collection(1)
+        Change.objects.update(created_at=timezone.now() - timedelta(days=40))
+        stale   = str(Change.objects.filter(table='egg_collections.eggcollection').order_by('id').first().pk)
+        current = self.client.get('/api/egg-collections/')['X-Change-Cursor']
+        make_collection(2)
+
+        call_command('prune_changes', days=30, stdout=StringIO())
+
+        self.assertTrue(self.feed(stale)['reset'])
+        delta = self.feed(current)
+        self.assertFalse(delta['reset'])
+        self.assertEqual(len(delta['changed']), 1)
+        self.assertNotIn(old.pk, [row['id'] for row in delta['changed']])
+        self.assertEqual(Change.objects.filter(table='egg_collections.eggcollection').count(), 2)
+
+    def test_table_wide_rewrite_asks_for_a_reload(self):
+        cursor = self.client.get('/api/lockdown-batches/')['X-Change-Cursor']
+        queryset_updated.send(sender=LockdownBatch)         # as schedule.refresh() does
+        self.assertTrue(self.feed(cursor, '/api/lockdown-batches/')['reset'])
+
+    def test_unchanged_delta_is_a_304(self):
+        cursor = self.client.get('/api/egg-collections/')['X-Change-Cursor']
+        etag   = self.client.get('/api/egg-collections/', {'since': cursor})['ETag']
+        response = self.client.get('/api/egg-collections/', {'since': cursor}, headers={'if_none_match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_bad_cursor_is_a_400(self):
+        self.assertEqual(self.client.get('/api/egg-collections/', {'since': 'abc'}).status_code, 400)
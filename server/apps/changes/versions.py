@@ -0,0 +1,103 @@
+# apps/changes/versions.py
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from apps.core.routers import replica_alias
+from .models import Change, TableVersion
+
+# The domain tables whose writes are versioned. Derived tables (rollups,
+# counters, telemetry buckets) follow their sources and are left out.
+TRACKED_MODELS = (
+    'egg_collections.EggCollection',
+    'egg_settings.EggSetting',
+    'incubation.Incubator',
+    'incubation.IncubationBatch',
+    'egg_candling.FertileEggCandling',
+    'egg_candling.ClearEggCandling',
+    'lockdown.LockdownBatch',
+    'hatching.HatchingRecord',
+    'final_packaging.PackagingBatch',
+    'sales.SaleRecord',
+    'alerts.Alert',
+    'alerts.AlertRule',
+    'notifications.Notification',
+    'batches.Batch',
+    'jobs.Job',
+)
+
+# Tracked tables whose rows each belong to one user, with the owning
+# field. Their change rows record the owner, so a user's ``?since=``
+# feed never hears of another user's rows.
+SCOPED_MODELS = {
+    'notifications.Notification': 'user',
+    'jobs.Job':                   'created_by',
+}
+
+
+def tracked_models():
+    return [apps.get_model(label) for label in TRACKED_MODELS]
+
+
+def table_key(model):
+    return model._meta.label_lower
+
+
+def scope_column(model):
+    """The owner column (``user_id``) of a SCOPED_MODELS table, else None."""
+    field = SCOPED_MODELS.get(model._meta.label)
+    return model._meta.get_field(field).attname if field else None
+
+
+def seed(**kwargs):
+    """post_migrate: one row per tracked table, so a bump is a single UPDATE."""
+    now = timezone.now()
+    TableVersion.objects.bulk_create(
+        [TableVersion(table=table_key(model), version=0, updated_at=now) for model in tracked_models()],
+        ignore_conflicts=True,
+    )
+
+
+def bump(model):
+    """+1 on the model's table version, inside the caller's transaction."""
+    key, now = table_key(model), timezone.now()
+    if TableVersion.objects.filter(table=key).update(version=F('version') + 1, updated_at=now):
+        return
+    try:                        # table tracked after the last migrate
+        with transaction.atomic():
+            TableVersion.objects.create(table=key, version=1, updated_at=now)
+    except IntegrityError:      # created concurrently
+        TableVersion.objects.filter(table=key).update(version=F('version') + 1, updated_at=now)
+
+
+def current(models):
+    """
+    ``(versions, last_modified, cursors)`` for the given models with one
+    query: versions and newest change ids in the order given (0 for
+    never-written tables) and the newest ``updated_at`` among them (None
+    if none were ever written).
+    """
+    keys   = [table_key(model) for model in models]
+    latest = Change.objects.filter(table=OuterRef('table')).order_by('-id').values('id')[:1]
+    rows   = {row.table: row for row in
+              TableVersion.objects.filter(table__in=keys).annotate(cursor=Subquery(latest))}
+    versions = [rows[key].version if key in rows else 0 for key in keys]
+    cursors  = [(rows[key].cursor or 0) if key in rows else 0 for key in keys]
+    stamps   = [row.updated_at for row in rows.values()]
+    return versions, (max(stamps) if stamps else None), cursors
+
+
+def replica_behind(models):
+    """
+    True while the read replica has not applied every write the primary
+    has counted for ``models``; always False without a replica.
+    """
+    alias = replica_alias()
+    if alias == DEFAULT_DB_ALIAS:
+        return False
+    keys    = [table_key(model) for model in models]
+    primary = TableVersion.objects.using(DEFAULT_DB_ALIAS).filter(table__in=keys).values_list('table', 'version')
+    replica = dict(TableVersion.objects.using(alias).filter(table__in=keys).values_list('table', 'version'))
+    return any(replica.get(table, 0) < version for table, version in primary)
@@ -0,0 +1,67 @@
+# apps/core/assertions.py
+
+import json
+import re
+
+from django.db import connection
+
+
+class QueryPlanAssertionsMixin:
+    """
+    TestCase mixin that checks SQLite's EXPLAIN QUERY PLAN for a queryset.
+
+    ``SEARCH t USING INDEX``  – index seek, what filters should produce
+    ``SCAN t USING INDEX``    – ordered walk of an index, fine under LIMIT
+    ``SCAN t``                – sequential scan of the whole table
+    """
+
+    def get_query_plan(self, queryset):
+        if connection.vendor != 'sqlite':
+            self.skipTest('query plan assertions are written against SQLite')
+        return queryset.explain()
+
+    def assertNoSequentialScan(self, queryset):
+        plan  = self.get_query_plan(queryset)
+        table = re.escape(queryset.model._meta.db_table)
+        if re.search(rf'\bSCAN (TABLE )?{table}\b(?! USING)', plan):
+            self.fail(f'Sequential scan of {queryset.model._meta.db_table}:\n{plan}\n{queryset.query}')
+
+    def assertIndexSearch(self, queryset, index=None):
+        plan  = self.get_query_plan(queryset)
+        table = re.escape(queryset.model._meta.db_table)
+        self.assertNoSequentialScan(queryset)
+        pattern = rf'\bSEARCH (TABLE )?{table}\b.*USING (COVERING )?INDEX'
+        if index:
+            pattern += rf' {re.escape(index)}\b'
+        if not re.search(pattern, plan):
+            self.fail(f'Expected an index search on {queryset.model._meta.db_table}'
+                      f'{" via " + index if index else ""}:\n{plan}')
+
+
+class EventStreamAssertionsMixin:
+    """TestCase mixin that listens on the event broker from synchronous tests."""
+
+    def listen(self, *channels):
+        """Subscribe now; returns ``next_event()`` -> ``(event, data)``."""
+        import asyncio
+
+        from .events import get_broker
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        async def subscribe():
+            return get_broker().subscribe(channels)
+
+        subscription = loop.run_until_complete(subscribe())
+        self.addCleanup(subscription.close)
+
+        def next_event(timeout=1):
+            frame = loop.run_until_complete(asyncio.wait_for(subscription.get(), timeout))
+            return parse_event(frame)
+        return next_event
+
+
+def parse_event(frame):
+    fields = dict(line.split(': ', 1) for line in frame.decode('utf-8').strip().splitlines())
+    return fields['event'], json.loads(fields['data'])
@@ -0,0 +1,197 @@
+# apps/core/authentication.py
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from uuid import uuid4
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    Users resolved from access tokens, per process: at most
+    ``max_entries`` of them, least recently used dropped first, each
+    trusted for ``ttl`` seconds after it was loaded.
+
+    Revocations go through ``stamps``, a cache alias every process
+    reads: saving, deleting or queryset_updated() on a user (see
+    ``connect``) gives them a new stamp, and a cached user whose stamp
+    changed since it was loaded is a miss. That costs one stamp lookup
+    per hit. With a per-process stamps backend (locmem), other processes
+    only notice once their entry expires, after at most ``ttl`` seconds;
+    ``check_stamps_shared`` warns about that setup.
+    """
+    ALL_KEY = 'auth-user:*'     # stamp of table-wide user updates
+
+    def __init__(self, max_entries=1024, ttl=60.0, stamps='default'):
+        self.max_entries = max_entries
+        self.ttl         = ttl
+        self.stamps      = stamps
+        self._entries    = OrderedDict()   # str(user id) -> (expires at, user, stamp)
+        self._lock       = threading.Lock()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _stamp_key(user_id):
+        return f'auth-user:{user_id}'
+
+    def stamp(self, user_id):
+        """The user's current stamp; read it before loading the user."""
+        keys   = [self._stamp_key(user_id), self.ALL_KEY]
+        stamps = caches[self.stamps].get_many(keys)
+        return tuple(stamps.get(key) for key in keys)
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+        # The stamp lookup may go over the network: outside the lock.
+        fresh = entry is not None and entry[0] > time.monotonic() and entry[2] == self.stamp(user_id)
+        with self._lock:
+            if not fresh:
+                if entry is not None and self._entries.get(user_id) is entry:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            if user_id in self._entries:
+                self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user_id, user, stamp):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user, stamp)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        """Revoke the user's cached copies, in every process sharing ``stamps``."""
+        caches[self.stamps].set(self._stamp_key(user_id), uuid4().hex, timeout=None)
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_all(self):
+        caches[self.stamps].set(self.ALL_KEY, uuid4().hex, timeout=None)
+        with self._lock:
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    @contextmanager
+    def bypassed(self):
+        """Resolve every user from the database meanwhile (benchmarks, debugging)."""
+        ttl, self.ttl = self.ttl, 0
+        self.clear()
+        try:
+            yield
+        finally:
+            self.ttl = ttl
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+user_cache = UserCache(
+    max_entries=getattr(settings, 'AUTH_USER_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 10.0),
+    stamps=getattr(settings, 'AUTH_USER_CACHE_STAMPS', 'default'),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user through ``user_cache``
+    instead of loading the User row on every request.
+
+    A miss runs simplejwt's own lookup and checks; a hit re-runs the
+    checks against the cached user. Each request gets its own shallow
+    copy, so attributes set on ``request.user`` do not leak between
+    requests.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = user_cache.get(str(user_id))
+        if user is None:
+            stamp = user_cache.stamp(str(user_id))
+            user  = super().get_user(validated_token)
+            user_cache.set(str(user_id), user, stamp)
+            return copy.copy(user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return copy.copy(user)
+
+
+def revoke(invalidate, using=DEFAULT_DB_ALIAS):
+    # Now, and again once the write commits: a request in between still
+    # reads the old row and would cache it under the new stamp.
+    invalidate()
+    transaction.on_commit(invalidate, using=using)
+
+
+def evict_user(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
+    user_id = str(getattr(instance, api_settings.USER_ID_FIELD))
+    revoke(lambda: user_cache.invalidate(user_id), using)
+
+
+def evict_updated_users(sender, pks=None, **kwargs):
+    # QuerySet.update() on users is only seen when its caller sends
+    # queryset_updated; pks are primary keys, which may not be the
+    # token's USER_ID_FIELD, so anything but a pk lookup revokes all.
+    if pks is None or api_settings.USER_ID_FIELD != sender._meta.pk.attname:
+        revoke(user_cache.invalidate_all)
+    else:
+        user_ids = [str(pk) for pk in pks]
+        revoke(lambda: [user_cache.invalidate(user_id) for user_id in user_ids])
+
+
+def check_stamps_shared(app_configs=None, **kwargs):
+    backend = settings.CACHES.get(user_cache.stamps, {}).get('BACKEND', '')
+    if user_cache.ttl > 0 and backend.endswith('LocMemCache'):
+        return [checks.Warning(
+            f"The {user_cache.stamps!r} cache holding user revocations is per-process.",
+            hint='Other worker processes keep accepting tokens of deactivated users for up to '
+                 'AUTH_USER_CACHE_TTL seconds; set AUTH_CACHE_URL to a shared cache.',
+            id='core.W001',
+        )]
+    return []
+
+
+def connect():
+    from django.contrib.auth import get_user_model
+    from django.db.models.signals import post_delete, post_save
+
+    from .signals import queryset_updated
+
+    user_model = get_user_model()
+    uid = 'core.user_cache'
+    post_save.connect(evict_user, sender=user_model, dispatch_uid=uid)
+    post_delete.connect(evict_user, sender=user_model, dispatch_uid=uid)
+    queryset_updated.connect(evict_updated_users, sender=user_model, dispatch_uid=uid)
+    checks.register(check_stamps_shared, checks.Tags.caches)
@@ -0,0 +1,214 @@
+# apps/core/benchmark.py
+
+import platform
+import re
+import sqlite3
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import django
+import numpy as np
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.incubation.models import Incubator
+
+BENCHMARK_PASSWORD = 'benchmark'
+
+SERVER_TIMING_DB = re.compile(r'\bdb;dur=([\d.]+)')
+
+# Routes in config.urls that are not timed, and why. The admin site is
+# left out as a whole.
+SKIPPED = {
+    'event-stream': 'server-sent events: one long-lived response, not a request',
+}
+
+
+@dataclass
+class Route:
+    name:    str
+    method:  str
+    path:    str
+    data:    object = None
+    format:  str    = None
+
+
+@dataclass
+class Result:
+    name:           str
+    method:         str
+    path:           str
+    status:         int
+    queries:        int
+    cold_ms:        float
+    p50_ms:         float
+    p95_ms:         float
+    p99_ms:         float
+    mean_ms:        float
+    max_ms:         float
+    db_p50_ms:      float
+    peak_memory_kb: float
+    samples:        list = field(default_factory=list, repr=False)
+
+
+def discover_routes(router, user):
+    """
+    Every GET route the router exposes (list, detail, GET extra actions)
+    plus the hand-registered paths in config.urls. Detail URLs point at
+    the newest row; write-only actions are left out.
+    """
+    routes = []
+    for prefix, viewset, basename in router.registry:
+        model  = viewset.queryset.model
+        lookup = getattr(viewset, 'lookup_field', 'pk')
+        obj    = model.objects.order_by('-pk').first()
+        routes.append(Route(f'{basename}-list', 'get', reverse(f'{basename}-list')))
+        if obj is not None:
+            routes.append(Route(f'{basename}-detail', 'get',
+                                reverse(f'{basename}-detail', args=[getattr(obj, lookup)])))
+        for extra in viewset.get_extra_actions():
+            if 'get' not in extra.mapping:
+                continue
+            name = f'{basename}-{extra.url_name}'
+            if extra.detail:
+                if obj is None:
+                    continue
+                routes.append(Route(name, 'get', reverse(name, args=[getattr(obj, lookup)])))
+            else:
+                routes.append(Route(name, 'get', reverse(name)))
+
+    incubator = Incubator.objects.order_by('pk').first()
+    refresh   = str(RefreshToken.for_user(user))
+    now       = datetime.now(timezone.utc)
+    routes += [
+        Route('token_obtain_pair', 'post', reverse('token_obtain_pair'),
+              {'username': user.username, 'password': BENCHMARK_PASSWORD}, 'json'),
+        Route('token_refresh', 'post', reverse('token_refresh'), {'refresh': refresh}, 'json'),
+        Route('report-hatch-rate', 'get', reverse('report-hatch-rate')),
+        Route('report-hatch-rate-analytics', 'get', reverse('report-hatch-rate-analytics'),
+              {'group_by': 'incubator,month'}),
+        Route('report-sales', 'get', reverse('report-sales')),
+        Route('report-production', 'get', reverse('report-production')),
+        Route('report-dashboard', 'get', reverse('report-dashboard')),
+        Route('report-cache-stats', 'get', reverse('report-cache-stats')),
+        Route('report-hatch-rate-async', 'get', reverse('report-hatch-rate-async')),
+        Route('report-hatch-rate-analytics-async', 'get', reverse('report-hatch-rate-analytics-async'),
+              {'group_by': 'incubator,month'}),
+        Route('report-sales-async', 'get', reverse('report-sales-async')),
+        Route('report-production-async', 'get', reverse('report-production-async')),
+        Route('report-dashboard-async', 'get', reverse('report-dashboard-async')),
+        Route('telemetry-latest', 'get', reverse('telemetry-latest')),
+    ]
+    if incubator is not None:
+        routes += [
+            Route('telemetry-series', 'get', reverse('telemetry-series'),
+                  {'incubator': incubator.pk, 'metric': 'temperature'}),
+            Route('telemetry-ingest', 'post', reverse('telemetry-ingest'), [
+                {'incubator': incubator.pk, 'metric': 'temperature',
+                 'timestamp': (now - timedelta(seconds=s)).isoformat(), 'value': 37.5}
+                for s in range(60)
+            ], 'json'),
+        ]
+    return routes
+
+
+def unrouted(routes):
+    """Named paths in config.urls with neither a Route nor a SKIPPED entry."""
+    from config.urls import urlpatterns
+    covered = {route.name for route in routes} | set(SKIPPED)
+    return sorted(p.name for p in urlpatterns if getattr(p, 'name', None) and p.name not in covered)
+
+
+def benchmark_user():
+    user, created = User.objects.get_or_create(username='benchmark', defaults={'is_staff': True,
+                                                                              'is_superuser': True})
+    if created:
+        user.set_password(BENCHMARK_PASSWORD)
+        user.save()
+    return user
+
+
+class Runner:
+    """
+    Times routes through the full middleware stack with a JWT-authenticated
+    test client: one cold request, ``warmup`` discarded ones, then
+    ``requests`` timed ones. Peak memory is measured on a separate request
+    under tracemalloc, which would skew the timings.
+    """
+
+    def __init__(self, user, requests=50, warmup=3):
+        self.requests = requests
+        self.warmup   = warmup
+        self.client   = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+    def call(self, route):
+        send     = getattr(self.client, route.method)
+        response = send(route.path, route.data, format=route.format) if route.format else send(route.path, route.data)
+        if response.streaming:
+            for _ in response.streaming_content:    # exports: time the whole download
+                pass
+        return response
+
+    def timed(self, route):
+        start    = time.perf_counter()
+        response = self.call(route)
+        return (time.perf_counter() - start) * 1000, response
+
+    @staticmethod
+    def db_ms(response):
+        """Time spent in queries, from QueryCountMiddleware's Server-Timing entry."""
+        match = SERVER_TIMING_DB.search(response.get('Server-Timing', ''))
+        return float(match.group(1)) if match else 0.0
+
+    def run(self, route):
+        cold_ms, response = self.timed(route)
+        for _ in range(self.warmup):
+            self.call(route)
+        samples, db_samples = [], []
+        for _ in range(self.requests):
+            elapsed, response = self.timed(route)
+            samples.append(elapsed)
+            db_samples.append(self.db_ms(response))
+
+        tracemalloc.start()
+        try:
+            self.call(route)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        return Result(
+            name=route.name, method=route.method.upper(), path=route.path, status=response.status_code,
+            queries=int(response.get('X-DB-Queries', -1)), cold_ms=round(cold_ms, 3),
+            p50_ms=round(float(p50), 3), p95_ms=round(float(p95), 3), p99_ms=round(float(p99), 3),
+            mean_ms=round(float(np.mean(samples)), 3), max_ms=round(max(samples), 3),
+            db_p50_ms=round(float(np.median(db_samples)), 3), peak_memory_kb=round(peak / 1024, 1), samples=samples,
+        )
+
+
+def environment():
+    return {
+        'python':  platform.python_version(),
+        'django':  django.get_version(),
+        'sqlite':  sqlite3.sqlite_version,
+        'machine': platform.machine(),
+    }
+
+
+def report(results, volumes, options, seed_seconds):
+    """The JSON document written per run; stable keys so runs can be diffed."""
+    return {
+        'created_at':   datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment':  environment(),
+        'options':      options,
+        'volumes':      volumes,
+        'seed_seconds': round(seed_seconds, 1),
+        'routes':       [{k: v for k, v in asdict(r).items() if k != 'samples'} for r in results],
+        'skipped':      [{'name': name, 'reason': reason} for name, reason in SKIPPED.items()],
+    }
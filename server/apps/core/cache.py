@@ -0,0 +1,44 @@
+# apps/core/cache.py
+
+import os
+
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache that evicts least-recently-used entries.
+
+    Django's file backend culls a random sample once MAX_ENTRIES is reached.
+    Here every hit refreshes the file's mtime and culling drops the oldest
+    files first, so the bounded cache behaves like LocMemCache does.
+    """
+
+    def get(self, key, default=None, version=None):
+        sentinel = object()
+        value = super().get(key, sentinel, version)
+        if value is sentinel:
+            return default
+        try:
+            os.utime(self._key_to_file(key, version))
+        except OSError:
+            pass  # culled by another process in the meantime
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def last_used(fname):
+            try:
+                return os.path.getmtime(fname)
+            except OSError:
+                return 0
+
+        filelist.sort(key=last_used)
+        for fname in filelist[:num_entries // self._cull_frequency]:
+            self._delete(fname)
@@ -0,0 +1,123 @@
+# apps/core/events.py
+
+import asyncio
+import itertools
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+def encode_event(event, data, event_id=None):
+    """One server-sent-events frame, encoded once and shared by every subscriber."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))}')
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class Subscription:
+    """
+    A client's view of the broker: an asyncio queue fed from any thread.
+
+    If the client falls ``queue_size`` frames behind, the backlog is
+    dropped and it gets a single ``resync`` event telling it to refetch.
+    """
+
+    def __init__(self, broker, channels, queue_size):
+        self.broker     = broker
+        self.channels   = tuple(channels)
+        self.loop       = asyncio.get_running_loop()
+        self.queue      = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def deliver(self, frame):
+        """Called by the broker from whichever thread published."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, frame)
+        except RuntimeError:            # event loop already closed
+            self.close()
+
+    def _put(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        if self.overflowed:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.overflowed = False
+            return encode_event('resync', {})
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Fan-out to the subscribers living in this process.
+
+    Good for a single ASGI process serving both the API and the stream.
+    Deployments with several workers need a broker that crosses process
+    boundaries (Redis pub/sub, Postgres LISTEN/NOTIFY) behind the same
+    ``publish``/``subscribe``/``unsubscribe`` methods; see EVENT_BROKER.
+    """
+    queue_size = 1000
+
+    def __init__(self):
+        self._lock        = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._ids         = itertools.count(1)
+
+    def publish(self, channel, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+            event_id    = next(self._ids)
+        if subscribers:
+            frame = encode_event(event, data, event_id)
+            for subscription in subscribers:
+                subscription.deliver(frame)
+
+    def subscribe(self, channels):
+        """Must be called from the event loop that will read the subscription."""
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+
+_broker      = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENT_BROKER)()
+    return _broker
+
+
+def publish_on_commit(channel, event, data):
+    """Publish once the surrounding transaction commits (now, in autocommit)."""
+    transaction.on_commit(lambda: get_broker().publish(channel, event, data))
@@ -0,0 +1,111 @@
+# apps/core/exports.py
+
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+from .routers import replica_alias
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+class ExportMixin:
+    """
+    Adds ``GET <route>/export/`` to a ModelViewSet: the whole (optionally
+    date-filtered) table streamed as CSV or NDJSON.
+
+    Rows come straight from ``values_list().iterator()`` in chunks, so no
+    model instances or serializers are built and memory stays flat however
+    many rows are exported. The header goes out before the query runs.
+
+    Query parameters: ``output=csv|ndjson`` (default csv), ``from`` and
+    ``to`` as YYYY-MM-DD, both inclusive, applied to ``export_date_field``.
+    Exports read from the replica database when one is configured.
+    """
+    export_date_field = 'date'
+    export_chunk_size = 2000
+    export_formats    = {
+        'csv':    'text/csv; charset=utf-8',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request, *args, **kwargs):
+        output = request.query_params.get('output', 'csv')
+        if output not in self.export_formats:
+            raise ValidationError({'output': f'Choose one of: {", ".join(self.export_formats)}.'})
+
+        queryset = self.get_export_queryset(request)
+        response = StreamingHttpResponse(export_stream(queryset, output, self.export_chunk_size),
+                                         content_type=self.export_formats[output])
+        filename = f'{self.basename}-export.{output}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_export_queryset(self, request):
+        return export_queryset(self.filter_queryset(self.get_queryset()), self.export_date_field,
+                               parse_day(request.query_params, 'from'), parse_day(request.query_params, 'to'))
+
+
+def export_queryset(queryset, date_field, start=None, end=None):
+    """``queryset`` limited to [start, end] on ``date_field``, in export order."""
+    field = queryset.model._meta.get_field(date_field)
+    if isinstance(field, models.DateTimeField):
+        # Whole-day bounds keep the filter sargable on the timestamp index.
+        tz = timezone.get_current_timezone()
+        if start:
+            queryset = queryset.filter(**{f'{field.name}__gte': datetime.combine(start, time.min, tz)})
+        if end:
+            queryset = queryset.filter(**{f'{field.name}__lt': datetime.combine(end + timedelta(days=1), time.min, tz)})
+    else:
+        if start:
+            queryset = queryset.filter(**{f'{field.name}__gte': start})
+        if end:
+            queryset = queryset.filter(**{f'{field.name}__lte': end})
+    return queryset.order_by(field.name, 'id')
+
+
+def export_stream(queryset, output, chunk_size=2000):
+    """Every concrete column of ``queryset``'s rows, as CSV or NDJSON text chunks."""
+    columns = [f.attname for f in queryset.model._meta.concrete_fields]
+    rows    = queryset.using(replica_alias()).values_list(*columns).iterator(chunk_size=chunk_size)
+    return stream_csv(columns, rows) if output == 'csv' else stream_ndjson(columns, rows)
+
+
+def parse_day(params, param):
+    value = params.get(param)
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({param: 'Use YYYY-MM-DD.'})
+    return day
+
+
+def stream_csv(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(columns, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
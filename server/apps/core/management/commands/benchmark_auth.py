@@ -0,0 +1,76 @@
+# apps/core/management/commands/benchmark_auth.py
+
+import json
+import re
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core.authentication import user_cache
+from apps.core.benchmark import Runner, benchmark_user, discover_routes, environment
+from apps.core.seeding import Seeder
+from .seed_hatchery import add_volume_arguments, parse_volumes
+from config.urls import router
+
+
+class Command(BaseCommand):
+    help = ("Time the router list endpoints with JWT users loaded from the database on every "
+            "request and then through the cached authentication backend, and report the drop in "
+            "queries and database time per request. Run with --settings=config.settings.testing.")
+
+    def add_arguments(self, parser):
+        add_volume_arguments(parser)
+        parser.add_argument('--requests', type=int, default=50, help="Timed requests per route and mode.")
+        parser.add_argument('--warmup', type=int, default=3, help="Untimed requests per route and mode.")
+        parser.add_argument('--route', help="Only routes whose name matches this regex.")
+        parser.add_argument('--output', default='benchmark-auth.json', help="JSON results file ('-' for stdout).")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("The benchmark seeds data; it only runs against SQLite.")
+
+        if not connection.introspection.table_names():
+            call_command('migrate', run_syncdb=True, verbosity=0)
+
+        user = benchmark_user()
+        if Seeder.is_empty():
+            volumes = parse_volumes(options['scale'], options['volume'])
+            Seeder(volumes, seed=options['seed'], user=user).run(log=self.stderr.write)
+
+        routes = [r for r in discover_routes(router, user) if r.name.endswith('-list')]
+        if options['route']:
+            routes = [r for r in routes if re.search(options['route'], r.name)]
+
+        runner = Runner(user, requests=options['requests'], warmup=options['warmup'])
+        rows   = []
+        self.stderr.write(f"{'route':<28} {'queries':>11} {'db p50 ms':>17} {'p50 ms':>17}")
+        for route in routes:
+            with user_cache.bypassed():
+                uncached = runner.run(route)
+            cached = runner.run(route)
+            rows.append({
+                'name':     route.name,
+                'path':     route.path,
+                'uncached': {'queries': uncached.queries, 'db_p50_ms': uncached.db_p50_ms, 'p50_ms': uncached.p50_ms},
+                'cached':   {'queries': cached.queries, 'db_p50_ms': cached.db_p50_ms, 'p50_ms': cached.p50_ms},
+                'db_ms_saved': round(uncached.db_p50_ms - cached.db_p50_ms, 3),
+            })
+            self.stderr.write(
+                f'{route.name:<28} {uncached.queries:>5} -> {cached.queries:<3} '
+                f'{uncached.db_p50_ms:>7.3f} -> {cached.db_p50_ms:<7.3f} '
+                f'{uncached.p50_ms:>7.2f} -> {cached.p50_ms:<7.2f}'
+            )
+
+        document = json.dumps({
+            'environment': environment(),
+            'options':     {k: options[k] for k in ('scale', 'volume', 'seed', 'requests', 'warmup', 'route')},
+            'user_cache':  {'ttl': user_cache.ttl, 'max_entries': user_cache.max_entries},
+            'routes':      rows,
+        }, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(document)
+        else:
+            with open(options['output'], 'w') as fh:
+                fh.write(document + '\n')
+            self.stderr.write(f"Results written to {options['output']}")
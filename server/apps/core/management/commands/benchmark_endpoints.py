@@ -0,0 +1,69 @@
+# apps/core/management/commands/benchmark_endpoints.py
+
+import json
+import re
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core.benchmark import Runner, benchmark_user, discover_routes, report, unrouted
+from apps.core.seeding import Seeder
+from .seed_hatchery import add_volume_arguments, parse_volumes
+from config.urls import router
+
+
+class Command(BaseCommand):
+    help = ("Seed hatchery volumes into SQLite and time every API route: p50/p95/p99 latency, "
+            "peak memory and query count, written as JSON. Run with --settings=config.settings.testing; "
+            "set DATABASE_URL=sqlite:////path/bench.sqlite3 to keep the seeded data between runs.")
+
+    def add_arguments(self, parser):
+        add_volume_arguments(parser)
+        parser.add_argument('--requests', type=int, default=50, help="Timed requests per route.")
+        parser.add_argument('--warmup', type=int, default=3, help="Untimed requests per route.")
+        parser.add_argument('--route', help="Only routes whose name matches this regex.")
+        parser.add_argument('--output', default='benchmark.json', help="JSON results file ('-' for stdout).")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("The benchmark seeds data; it only runs against SQLite.")
+
+        volumes = parse_volumes(options['scale'], options['volume'])
+
+        if not connection.introspection.table_names():
+            call_command('migrate', run_syncdb=True, verbosity=0)   # fresh in-memory database
+
+        started = time.perf_counter()
+        user    = benchmark_user()
+        if Seeder.is_empty():
+            Seeder(volumes, seed=options['seed'], user=user).run(log=self.stderr.write)
+        else:
+            self.stderr.write("Hatchery tables already hold data: benchmarking it as is.")
+        seed_seconds = time.perf_counter() - started
+
+        routes = discover_routes(router, user)
+        if options['route']:
+            routes = [r for r in routes if re.search(options['route'], r.name)]
+        missing = unrouted(routes) if not options['route'] else []
+        if missing:
+            raise CommandError(f"No request spec for: {', '.join(missing)} (add it to apps.core.benchmark).")
+
+        runner  = Runner(user, requests=options['requests'], warmup=options['warmup'])
+        results = []
+        self.stderr.write(f"{'route':<36} {'status':>6} {'queries':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'peak KiB':>9}")
+        for route in routes:
+            result = runner.run(route)
+            results.append(result)
+            self.stderr.write(f'{result.name:<36} {result.status:>6} {result.queries:>7} {result.p50_ms:>9.2f} '
+                              f'{result.p95_ms:>9.2f} {result.p99_ms:>9.2f} {result.peak_memory_kb:>9.1f}')
+
+        run_options = {k: options[k] for k in ('scale', 'volume', 'seed', 'requests', 'warmup', 'route')}
+        document    = json.dumps(report(results, volumes, run_options, seed_seconds), indent=2)
+        if options['output'] == '-':
+            self.stdout.write(document)
+        else:
+            with open(options['output'], 'w') as fh:
+                fh.write(document + '\n')
+            self.stderr.write(f"Results written to {options['output']}")
@@ -0,0 +1,146 @@
+# apps/core/management/commands/benchmark_reports.py
+
+import asyncio
+import json
+import time
+
+import numpy as np
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.benchmark import benchmark_user, environment
+from apps.core.seeding import Seeder
+from apps.reports_analytics.async_views import gather_aggregates
+from apps.reports_analytics.views import DashboardReportView, HatchRateReportView
+from .seed_hatchery import add_volume_arguments, parse_volumes
+
+# (sync route, async route, query parameters)
+PAIRS = [
+    ('report-hatch-rate', 'report-hatch-rate-async', {}),
+    ('report-hatch-rate-analytics', 'report-hatch-rate-analytics-async', {'group_by': 'incubator,month'}),
+    ('report-sales', 'report-sales-async', {}),
+    ('report-production', 'report-production-async', {}),
+    ('report-dashboard', 'report-dashboard-async', {}),
+]
+
+
+def summary(samples):
+    p50, p95 = np.percentile(samples, [50, 95])
+    return {'p50_ms': round(float(p50), 3), 'p95_ms': round(float(p95), 3),
+            'mean_ms': round(float(np.mean(samples)), 3)}
+
+
+class Command(BaseCommand):
+    help = ("Time each report through its sync view (WSGI handler) and its async variant (ASGI "
+            "handler) with the report cache cleared before every request, and time the aggregate "
+            "reports' queries run in turn, through aaggregate() under gather() and through "
+            "gather_aggregates(). The async views open a connection per worker thread, so point "
+            "DATABASE_URL at a SQLite file: DATABASE_URL=sqlite:///bench.sqlite3 "
+            "python manage.py benchmark_reports --settings=config.settings.testing")
+
+    def add_arguments(self, parser):
+        add_volume_arguments(parser)
+        parser.add_argument('--requests', type=int, default=30, help="Timed requests per route.")
+        parser.add_argument('--warmup', type=int, default=3, help="Untimed requests per route.")
+        parser.add_argument('--output', default='benchmark-reports.json', help="JSON results file ('-' for stdout).")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("The benchmark seeds data; it only runs against SQLite.")
+        if connection.settings_dict['NAME'] == ':memory:':
+            raise CommandError("An in-memory database is private to one connection; "
+                               "set DATABASE_URL to a SQLite file.")
+
+        if not connection.introspection.table_names():
+            call_command('migrate', run_syncdb=True, verbosity=0)
+
+        user = benchmark_user()
+        if Seeder.is_empty():
+            volumes = parse_volumes(options['scale'], options['volume'])
+            Seeder(volumes, seed=options['seed'], user=user).run(log=self.stderr.write)
+
+        token  = f'Bearer {RefreshToken.for_user(user).access_token}'
+        timing = {'requests': options['requests'], 'warmup': options['warmup']}
+        rows   = []
+        self.stderr.write(f"{'report':<30} {'sync p50 ms':>12} {'async p50 ms':>13}")
+        for sync_name, async_name, params in PAIRS:
+            sync_ms  = self.time_sync(reverse(sync_name), params, token, **timing)
+            async_ms = asyncio.run(self.time_async(reverse(async_name), params, token, **timing))
+            rows.append({'sync': sync_name, 'async': async_name,
+                         'sync_ms': summary(sync_ms), 'async_ms': summary(async_ms)})
+            self.stderr.write(f"{sync_name:<30} {rows[-1]['sync_ms']['p50_ms']:>12.3f} "
+                              f"{rows[-1]['async_ms']['p50_ms']:>13.3f}")
+
+        aggregates = {}
+        for view in (HatchRateReportView, DashboardReportView):
+            aggregates[view.__name__] = {
+                mode: summary(asyncio.run(self.time_aggregates(view.aggregates, mode, **timing)))
+                for mode in ('sequential', 'aaggregate', 'gather_aggregates')
+            }
+            self.stderr.write(f'{view.__name__} aggregates p50 ms: ' + ', '.join(
+                f"{mode} {result['p50_ms']:.3f}" for mode, result in aggregates[view.__name__].items()))
+
+        document = json.dumps({
+            'environment': environment(),
+            'options':     {k: options[k] for k in ('scale', 'volume', 'seed', 'requests', 'warmup')},
+            'reports':     rows,
+            'aggregates':  aggregates,
+        }, indent=2)
+        if options['output'] == '-':
+            self.stdout.write(document)
+        else:
+            with open(options['output'], 'w') as fh:
+                fh.write(document + '\n')
+            self.stderr.write(f"Results written to {options['output']}")
+
+    @staticmethod
+    def time_sync(path, params, token, requests, warmup):
+        client, samples = Client(), []
+        for i in range(warmup + requests):
+            caches['reports'].clear()
+            start    = time.perf_counter()
+            response = client.get(path, params, headers={'Authorization': token})
+            elapsed  = (time.perf_counter() - start) * 1000
+            if response.status_code != 200:
+                raise CommandError(f'{path}: HTTP {response.status_code}')
+            if i >= warmup:
+                samples.append(elapsed)
+        return samples
+
+    @staticmethod
+    async def time_async(path, params, token, requests, warmup):
+        client, samples = AsyncClient(), []
+        for i in range(warmup + requests):
+            await caches['reports'].aclear()
+            start    = time.perf_counter()
+            response = await client.get(path, params, headers={'Authorization': token})
+            elapsed  = (time.perf_counter() - start) * 1000
+            if response.status_code != 200:
+                raise CommandError(f'{path}: HTTP {response.status_code}')
+            if i >= warmup:
+                samples.append(elapsed)
+        return samples
+
+    @staticmethod
+    async def time_aggregates(aggregates, mode, requests, warmup):
+        async def sequential():
+            return {section: await qs.aaggregate(**exprs) for section, (qs, exprs) in aggregates.items()}
+
+        async def aaggregate():
+            results = await asyncio.gather(*(qs.aaggregate(**exprs) for qs, exprs in aggregates.values()))
+            return dict(zip(aggregates, results))
+
+        run = {'sequential': sequential, 'aaggregate': aaggregate,
+               'gather_aggregates': lambda: gather_aggregates(aggregates)}[mode]
+        samples = []
+        for i in range(warmup + requests):
+            start = time.perf_counter()
+            await run()
+            if i >= warmup:
+                samples.append((time.perf_counter() - start) * 1000)
+        return samples
@@ -0,0 +1,32 @@
+# apps/core/management/commands/sync_replica.py
+
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.core.routers import REPLICA
+
+
+class Command(BaseCommand):
+    help = ("Copy the primary SQLite database over the replica file, for trying the read-replica "
+            "setup locally. Real replicas are fed by the database server's own replication.")
+
+    def handle(self, *args, **options):
+        if REPLICA not in connections.settings:
+            raise CommandError("No 'replica' database configured; set DATABASE_REPLICA_URL.")
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[REPLICA]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError("sync_replica only copies SQLite files.")
+
+        replica.close()
+        source = sqlite3.connect(primary.settings_dict['NAME'])
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+        self.stdout.write(self.style.SUCCESS(
+            f"Copied {primary.settings_dict['NAME']} to {replica.settings_dict['NAME']}."
+        ))
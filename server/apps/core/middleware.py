@@ -0,0 +1,61 @@
+# apps/core/middleware.py
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('apps.queries')
+
+
+class QueryStats:
+    """``execute_wrapper`` hook that counts queries and sums their time."""
+
+    def __init__(self):
+        self.count    = 0
+        self.duration = 0.0     # seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count    += 1
+
+
+class QueryCountMiddleware:
+    """
+    Records how many queries each request runs, on every database alias,
+    and how long they took. Reported as ``X-DB-Queries`` and a
+    ``Server-Timing: db`` entry (visible in the browser's network tab);
+    requests over QUERY_COUNT_WARN queries are logged to ``apps.queries``.
+
+    Streaming responses run their queries after this returns, so only
+    the work done before the first byte is counted for them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = request.query_stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        millis = stats.duration * 1000
+        response['X-DB-Queries'] = str(stats.count)
+        timing = f'db;dur={millis:.1f};desc="{stats.count} queries"'
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+        warn_at = getattr(settings, 'QUERY_COUNT_WARN', None)
+        if warn_at is not None and stats.count > warn_at:
+            logger.warning('%s %s ran %d queries in %.1f ms',
+                           request.method, request.path, stats.count, millis)
+        return response
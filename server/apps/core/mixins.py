@@ -0,0 +1,152 @@
+# apps/core/mixins.py
+
+from functools import partial
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+from .pagination import get_view_ordering
+from .serializers import ValuesPlan
+from .signals import bulk_created, pre_bulk_create
+
+
+class BulkCreateMixin:
+    """
+    Lets a ModelViewSet's create action accept a JSON array.
+
+    The whole array is validated first; if any item fails, nothing is written
+    and the response lists the errors by index. Otherwise the rows go in with
+    bulk_create (plus one bulk insert per many-to-many table) in a single
+    transaction.
+    """
+    bulk_max_items  = 10000
+    bulk_batch_size = 1000
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        if len(request.data) > self.bulk_max_items:
+            return Response(
+                {'detail': f'At most {self.bulk_max_items} items per request.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        prefetch_related_pks(serializer.child, request.data)
+        if not serializer.is_valid():
+            return Response(
+                {'errors': bulk_errors(serializer.errors)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        instances = self.perform_bulk_create(serializer)
+        data = self.get_serializer(instances, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, serializer):
+        model = serializer.child.Meta.model
+        m2m_fields = [f for f in model._meta.many_to_many if f.name in serializer.child.fields]
+
+        rows, related = [], []
+        for attrs in serializer.validated_data:
+            attrs = dict(attrs)
+            related.append({f.name: attrs.pop(f.name, []) for f in m2m_fields})
+            rows.append(model(**attrs))
+
+        with transaction.atomic():
+            pre_bulk_create.send(sender=model, instances=rows)
+            instances = model.objects.bulk_create(rows, batch_size=self.bulk_batch_size)
+            for field in m2m_fields:
+                through  = field.remote_field.through
+                src, dst = field.m2m_field_name(), field.m2m_reverse_field_name()
+                through.objects.bulk_create(
+                    [
+                        through(**{f'{src}_id': obj.pk, f'{dst}_id': target.pk})
+                        for obj, values in zip(instances, related)
+                        for target in values[field.name]
+                    ],
+                    batch_size=self.bulk_batch_size,
+                )
+            bulk_created.send(sender=model, instances=instances)
+
+        # Seed the many-to-many caches so serializing the response does not
+        # issue one query per created row.
+        for field in m2m_fields:
+            for obj, values in zip(instances, related):
+                qs = getattr(obj, field.name).all()
+                qs._result_cache, qs._prefetch_done = list(values[field.name]), True
+                obj.__dict__.setdefault('_prefetched_objects_cache', {})[field.name] = qs
+        return instances
+
+
+class FastListMixin:
+    """
+    Serves a ModelViewSet's list action straight from ``values()`` rows:
+    no model instances, no per-field serializer dispatch. The response is
+    the same as the serializer's; viewsets whose serializer has fields the
+    fast path can't reproduce (method fields, nested serializers, ...)
+    fall back to the normal list.
+    """
+    fast_list = True
+
+    def list(self, request, *args, **kwargs):
+        plan = ValuesPlan.for_serializer(self.get_serializer()) if self.fast_list else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        opts     = queryset.model._meta
+        # The keyset paginator reads its cursor off the ordering columns.
+        ordering = [opts.get_field(name.lstrip('-')).attname for name in get_view_ordering(self)]
+        rows     = plan.values(queryset, extra=ordering)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
+
+
+def bulk_errors(errors):
+    """ListSerializer errors -> [{'index': i, 'errors': {...}}] for failing items."""
+    if isinstance(errors, list):
+        return [{'index': i, 'errors': e} for i, e in enumerate(errors) if e]
+    # Newer DRF reports only the failing items, keyed by position.
+    if errors and all(str(key).isdigit() for key in errors):
+        return [{'index': int(i), 'errors': e} for i, e in sorted(errors.items(), key=lambda kv: int(kv[0]))]
+    return [{'index': None, 'errors': errors}]
+
+
+def prefetch_related_pks(child, items):
+    """
+    Resolve every integer pk referenced by the payload with one in_bulk()
+    per relation, instead of one SELECT per item during validation.
+    Anything not prefetched falls back to the field's normal lookup.
+    """
+    for name, field in child.fields.items():
+        many     = isinstance(field, ManyRelatedField)
+        relation = field.child_relation if many else field
+        if field.read_only or not isinstance(relation, PrimaryKeyRelatedField):
+            continue
+        if relation.pk_field is not None:
+            continue
+
+        pks = set()
+        for item in items:
+            value = item.get(name) if isinstance(item, dict) else None
+            for pk in (value if many and isinstance(value, list) else [value]):
+                if isinstance(pk, int) and not isinstance(pk, bool):
+                    pks.add(pk)
+        if not pks:
+            continue
+
+        found = relation.get_queryset().in_bulk(pks)
+        relation.to_internal_value = partial(_prefetched_lookup, found, relation.to_internal_value)
+
+
+def _prefetched_lookup(found, fallback, data):
+    if isinstance(data, int) and not isinstance(data, bool) and data in found:
+        return found[data]
+    return fallback(data)
@@ -0,0 +1,220 @@
+# apps/core/pagination.py
+
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def get_view_ordering(view, default=('-id',)):
+    """
+    Ordering declared on the viewset (``ordering = ('-date', '-id')``).
+    Always ends on a unique column so pages are stable.
+    """
+    ordering = tuple(getattr(view, 'ordering', None) or default)
+    if ordering[-1].lstrip('-') != 'id':
+        ordering += ('-id' if ordering[-1].startswith('-') else 'id',)
+    return ordering
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek-method pagination over the full (date, id) key.
+
+    The cursor stores the key of the last row served, and the next page is
+    ``WHERE (date, id) < (:date, :id) ORDER BY date DESC, id DESC LIMIT n``,
+    so a page costs the same on the first screen and the ten-thousandth.
+    """
+    cursor_query_param    = 'cursor'
+    page_size             = api_settings.PAGE_SIZE or 50
+    page_size_query_param = 'page_size'
+    max_page_size         = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request   = request
+        self.base_url  = request.build_absolute_uri()
+        self.model     = queryset.model
+        self.ordering  = get_view_ordering(view)
+        self.page_size = self.get_page_size(request)
+
+        reverse, position = self.decode_cursor(request, queryset.model)
+        ordering = self._invert(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(ordering, position))
+
+        results  = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results  = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        # Moving backwards, "more" lies before the page; forwards, after it.
+        self.has_next     = (position is not None) if reverse else has_more
+        self.has_previous = has_more if reverse else (position is not None)
+        self.next_position     = self._key(results[-1]) if results else position
+        self.previous_position = self._key(results[0]) if results else position
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next',     self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results',  data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next':     {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results':  schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(False, self.next_position)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(True, self.previous_position)
+
+    # -- cursor encoding -------------------------------------------------
+
+    def encode_cursor(self, reverse, position):
+        payload = json.dumps({'r': int(reverse), 'p': position}, cls=DjangoJSONEncoder)
+        token   = b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return False, None
+        try:
+            payload  = json.loads(b64decode(token.encode('ascii')).decode('utf-8'))
+            position = payload['p']
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, position)
+            ]
+            return bool(payload.get('r')), position
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    # -- keyset helpers --------------------------------------------------
+
+    def _key(self, row):
+        opts = self.model._meta
+        attnames = [opts.get_field(name.lstrip('-')).attname for name in self.ordering]
+        if isinstance(row, dict):           # values() rows from FastListMixin
+            return [row[attname] for attname in attnames]
+        return [getattr(row, attname) for attname in attnames]
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(f[1:] if f.startswith('-') else f'-{f}' for f in ordering)
+
+    @staticmethod
+    def _seek(ordering, position):
+        """(a, b) > (x, y)  ==  a > x  OR  (a = x AND b > y), per-column direction."""
+        clauses = []
+        for i, name in enumerate(ordering):
+            field  = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            prefix = {ordering[j].lstrip('-'): position[j] for j in range(i)}
+            clauses.append(Q(**prefix, **{f'{field}__{lookup}': position[i]}))
+        return reduce(or_, clauses)
+
+
+class OffsetPagination(LimitOffsetPagination):
+    """
+    Classic ``?limit=&offset=`` pages with a total count, for admin-style
+    tables that jump to arbitrary pages. Cost grows with the offset.
+    """
+    default_limit = api_settings.PAGE_SIZE or 50
+    max_limit     = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = queryset.order_by(*get_view_ordering(view))
+        return super().paginate_queryset(queryset, request, view)
+
+
+class HatcheryPagination(BasePagination):
+    """
+    Default paginator for the router viewsets: keyset cursors unless the
+    client opts into offsets with ``?paginate=offset``.
+    """
+    mode_query_param = 'paginate'
+    keyset_class     = KeysetPagination
+    offset_class     = OffsetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = request.query_params.get(self.mode_query_param)
+        self.delegate = self.offset_class() if mode == 'offset' else self.keyset_class()
+        # Offset links are built from the request URL, so ?paginate=offset
+        # carries over to next/previous on its own.
+        return self.delegate.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.keyset_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            self.keyset_class().get_schema_operation_parameters(view)
+            + self.offset_class().get_schema_operation_parameters(view)
+            + [{
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "offset" for limit/offset pages.',
+                'schema': {'type': 'string', 'enum': ['cursor', 'offset']},
+            }]
+        )
@@ -0,0 +1,55 @@
+# apps/core/routers.py
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+
+# Apps whose tables are only ever read for reporting.
+REPLICA_APPS = {'reports_analytics'}
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_alias():
+    """The alias for reporting reads: the replica if one is configured."""
+    return REPLICA if REPLICA in connections.settings else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def replica_reads():
+    """Send every read in the block to the replica (writes still go to the primary)."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Reads of REPLICA_APPS tables, and any read inside ``replica_reads()``,
+    go to the ``replica`` alias when DATABASES has one; everything else,
+    and every write, goes to the primary.
+
+    The replica lags the primary, so only reporting reads that tolerate
+    a slightly stale view belong on it; see CachedReportMixin and
+    ExportMixin.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() or model._meta.app_label in REPLICA_APPS:
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True     # both aliases hold the same data
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication (or sync_replica).
+        return db != REPLICA
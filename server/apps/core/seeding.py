@@ -0,0 +1,353 @@
+# apps/core/seeding.py
+
+import os
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+
+from apps.alerts.models import Alert, AlertRule
+from apps.batches.lineage import normalize
+from apps.batches.models import Batch
+from apps.core.signals import queryset_updated
+from apps.egg_candling.models import ClearEggCandling, FertileEggCandling
+from apps.egg_collections.models import EggCollection
+from apps.egg_settings.models import EggSetting
+from apps.final_packaging.models import PackagingBatch
+from apps.hatching.models import HatchingRecord
+from apps.incubation.models import IncubationBatch, Incubator
+from apps.jobs.models import Job
+from apps.jobs.tasks import REPORTS
+from apps.jobs.worker import claim, execute
+from apps.lockdown.models import HATCH_DAY, TRANSFER_DAY, LockdownBatch
+from apps.notifications.models import Notification, NotificationCounter
+from apps.sales.models import SaleRecord
+
+# Rows for a full-size run; ``scale`` shrinks them together. Every batch
+# gets one row in each stage table (setting, incubation, both candlings,
+# lockdown, hatching, packaging), so those follow ``batches.Batch``.
+DEFAULT_VOLUMES = {
+    'incubation.Incubator':                 24,
+    'batches.Batch':                    20_000,
+    'egg_collections.EggCollection': 1_000_000,
+    'sales.SaleRecord':                200_000,
+    'alerts.AlertRule':                     72,
+    'alerts.Alert':                  5_000_000,
+    'notifications.Notification':       50_000,
+    'jobs.Job':                             20,
+}
+STAGE_MODELS = (EggSetting, IncubationBatch, FertileEggCandling, ClearEggCandling,
+                LockdownBatch, HatchingRecord, PackagingBatch)
+SEEDED_MODELS = (Incubator, Batch, EggCollection, *STAGE_MODELS, SaleRecord, AlertRule, Alert, Notification, Job)
+
+BATCH_CHUNK = 500           # batches generated, with all their rows, per transaction
+ROW_CHUNK   = 5000          # rows per INSERT for the flat tables
+EPOCH       = date(2023, 1, 1)       # fixed, so a seed always yields the same rows
+SPAN_DAYS   = 730
+TRAY_EGGS   = 30
+SETTER_EGGS = 102
+BOX_TYPES   = (('small', 50), ('medium', 100), ('large', 200), ('export', 150))
+BREEDS      = ('broiler', 'layer', 'kuroiler', 'sasso')
+METRICS     = {'temperature': (37.2, 38.0, '°C'), 'humidity': (55.0, 70.0, '%'), 'co2': (None, 5000.0, 'ppm')}
+CUSTOMERS   = tuple(f'Customer {i:03d}' for i in range(1, 301))
+FARMERS     = tuple(f'Farmer {i:03d}' for i in range(1, 501))
+
+
+def scaled(volumes, scale):
+    return {label: max(1, int(count * scale)) for label, count in volumes.items()}
+
+
+def dependent_models():
+    """
+    Models outside SEEDED_MODELS with a foreign key into them, directly or
+    through one another (telemetry, many-to-many through tables),
+    dependents before what they reference.
+    """
+    found, referenced = [], set(SEEDED_MODELS)
+    while True:
+        layer = [
+            model for model in apps.get_models(include_auto_created=True)
+            if model not in referenced and any(
+                field.related_model in referenced
+                for field in model._meta.concrete_fields if field.many_to_one or field.one_to_one
+            )
+        ]
+        if not layer:
+            return found[::-1]
+        found += layer
+        referenced.update(layer)
+
+
+def split(total, parts, rng):
+    """``parts`` positive integers summing to ``total`` (fewer if total is small)."""
+    parts = max(1, min(parts, total))
+    cuts  = sorted(rng.sample(range(1, total), parts - 1)) if parts > 1 else []
+    return [b - a for a, b in zip([0, *cuts], [*cuts, total])]
+
+
+class Seeder:
+    """
+    Generates a consistent hatchery from a seed: each batch's egg setting
+    sets exactly the good eggs of its collections (linked through
+    collection_ids), candling splits the set eggs into fertile and clear,
+    hatching accounts for every fertile egg, packaging boxes every
+    saleable chick and the batch's sales sell exactly those.
+
+    Rows go in with bulk_create in chunks, the many-to-many through table
+    included, so memory stays flat at any volume. Bulk inserts skip the
+    model signals; lineage is written directly, and the rollups, table
+    versions and change log are brought up to date once at the end.
+    """
+
+    def __init__(self, volumes, seed=0, user=None):
+        self.volumes = volumes
+        self.rng     = random.Random(seed)
+        self.user    = user
+
+    @staticmethod
+    def is_empty():
+        return not any(model.objects.exists() for model in SEEDED_MODELS)
+
+    @staticmethod
+    def flush():
+        """
+        Delete everything the seeder writes, and every row referencing
+        it, children first, with one DELETE per table: QuerySet.delete()
+        would load every row to send post_delete. Table-wide signals go
+        out as for a seed.
+        """
+        tables = [model._meta.db_table for model in (*dependent_models(), *reversed(SEEDED_MODELS))]
+        for path in Job.objects.exclude(result_path='').values_list('result_path', flat=True):
+            path = Job(result_path=path).result_file
+            if os.path.exists(path):
+                os.remove(path)
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(table)}')
+            NotificationCounter.objects.all().delete()                 # rebuilt on next read
+            Seeder.announce()
+
+    @staticmethod
+    def announce():
+        """Rows changed behind the signals: tell versions, change log and rollups."""
+        for model in SEEDED_MODELS:
+            queryset_updated.send(sender=model)
+        call_command('rebuild_rollups', stdout=StringIO())
+
+    def run(self, log=None):
+        """Seed an empty database; returns rows created per model label."""
+        if not self.is_empty():
+            raise ValueError('Hatchery tables already hold data; flush them first.')
+        log = log or (lambda message: None)
+        self.user = self.user or User.objects.get_or_create(username='seed', defaults={'is_staff': True})[0]
+        self.created = dict.fromkeys((model._meta.label for model in SEEDED_MODELS), 0)
+
+        self.incubators = self.insert(Incubator, [self.build_incubator(i) for i in range(self.volumes['incubation.Incubator'])])
+        self.rules      = self.insert(AlertRule, [self.build_alertrule(i) for i in range(self.volumes['alerts.AlertRule'])])
+
+        batches = self.volumes['batches.Batch']
+        self.collections_per_batch = self.spread(self.volumes['egg_collections.EggCollection'], batches)
+        self.sales_per_batch       = self.spread(self.volumes['sales.SaleRecord'], batches)
+        self.cumulative_rejects    = 0
+        for start in range(0, batches, BATCH_CHUNK):
+            with transaction.atomic():
+                self.seed_batches(range(start, min(start + BATCH_CHUNK, batches)))
+            log(f'batches: {min(start + BATCH_CHUNK, batches)}/{batches}')
+
+        self.insert_flat(Alert, self.volumes['alerts.Alert'], self.build_alert, log)
+        self.insert_flat(Notification, self.volumes['notifications.Notification'], self.build_notification, log)
+
+        self.announce()
+        NotificationCounter.objects.filter(user=self.user).delete()    # rebuilt on next read
+        self.seed_jobs(self.volumes['jobs.Job'], log)
+        return self.created
+
+    def seed_jobs(self, count, log):
+        """Report jobs, run here to completion: they read the seeded tables."""
+        reports = list(REPORTS)
+        self.insert(Job, [Job(kind='report', params={'report': reports[i % len(reports)], 'params': {}},
+                              created_by=self.user) for i in range(count)])
+        worker = f'seed:{os.getpid()}'
+        while (pk := claim(worker)) is not None:
+            execute(pk, worker)
+        log(f'jobs.Job: {count}')
+
+    # -- writing ---------------------------------------------------------
+
+    def insert(self, model, rows):
+        rows = model.objects.bulk_create(rows, batch_size=ROW_CHUNK)
+        self.created[model._meta.label] += len(rows)
+        return rows
+
+    def insert_flat(self, model, count, build, log):
+        for start in range(0, count, ROW_CHUNK):
+            with transaction.atomic():
+                self.insert(model, [build(i) for i in range(start, min(start + ROW_CHUNK, count))])
+        log(f'{model._meta.label}: {count}')
+
+    def seed_batches(self, numbers):
+        """All stage rows for a run of batches: one INSERT per table."""
+        plans   = [self.plan_batch(n) for n in numbers]
+        lineage = self.insert(Batch, [Batch(key=normalize(p['code']), code=p['code']) for p in plans])
+        for plan, batch in zip(plans, lineage):
+            for obj in plan['stages'].values():
+                obj.lineage_id = batch.pk
+            for sale in plan['sales']:
+                sale.lineage_id = batch.pk
+
+        collections = self.insert(EggCollection, [c for p in plans for c in p['collections']])
+        for model in STAGE_MODELS:
+            if model is PackagingBatch:             # FK to the hatch rows just inserted
+                for plan in plans:
+                    plan['stages'][PackagingBatch].hatch_batch_id = plan['stages'][HatchingRecord].pk
+            self.insert(model, [p['stages'][model] for p in plans])
+        self.insert(SaleRecord, [s for p in plans for s in p['sales']])
+
+        through, offset = EggSetting.collection_ids.through, 0
+        links = []
+        for plan in plans:
+            setting = plan['stages'][EggSetting]
+            for collection in collections[offset:offset + len(plan['collections'])]:
+                links.append(through(eggsetting_id=setting.pk, eggcollection_id=collection.pk))
+            offset += len(plan['collections'])
+        through.objects.bulk_create(links, batch_size=ROW_CHUNK)
+
+    # -- one batch, end to end ---------------------------------------------
+
+    def plan_batch(self, n):
+        rng   = self.rng
+        code  = f'B-{n:06d}'
+        start = EPOCH + timedelta(days=n * SPAN_DAYS // max(self.volumes['batches.Batch'], 1))
+        breed = rng.choice(BREEDS)
+        incubator = self.incubators[n % len(self.incubators)]
+
+        collections = [self.build_collection(start - timedelta(days=rng.randint(1, 7)), breed)
+                       for _ in range(self.collections_per_batch[n])]
+        received = sum(c.full_trays * TRAY_EGGS + c.unfull_tray_count - c.damaged_eggs for c in collections)
+        dirty    = rng.randint(0, received // 100)
+        damaged  = rng.randint(0, received // 200)
+        eggs_set = received - dirty - damaged
+        self.cumulative_rejects += dirty + damaged
+
+        fertile  = round(eggs_set * rng.uniform(0.82, 0.95))
+        hatched  = round(fertile * rng.uniform(0.80, 0.95))
+        cull     = rng.randint(0, hatched // 100)
+        dead     = rng.randint(0, hatched // 100)
+        packed   = hatched - cull - dead
+        box_type, per_box = rng.choice(BOX_TYPES)
+
+        stages = {
+            EggSetting: EggSetting(
+                batch_id=code, setting_date=start, type_of_eggs=breed,
+                full_setters=eggs_set // SETTER_EGGS, unfull_setters=int(eggs_set % SETTER_EGGS > 0),
+                unfull_setter_eggs=eggs_set % SETTER_EGGS, eggs_set=eggs_set, dirty_eggs=dirty,
+                damaged_eggs=damaged, reject_eggs=dirty + damaged,
+                cumulative_reject_eggs=self.cumulative_rejects,
+            ),
+            IncubationBatch: IncubationBatch(
+                batch_id=code, incubator=incubator, start_date=start,
+                expected_hatch_date=start + timedelta(days=HATCH_DAY), quantity=eggs_set,
+                breed=breed, location=incubator.location, progress=Decimal('100.00'), status='completed',
+            ),
+            FertileEggCandling: FertileEggCandling(
+                batch_id=code, candling_date=start + timedelta(days=10), count=fertile,
+            ),
+            ClearEggCandling: ClearEggCandling(
+                batch_id=code, candling_date=start + timedelta(days=10), count=eggs_set - fertile,
+            ),
+            LockdownBatch: LockdownBatch(
+                batch_id=code, label=f'L-{n:06d}', start_date=start,
+                lockdown_date=start + timedelta(days=TRANSFER_DAY), quantity=fertile,
+                incubator_id=str(incubator.pk), transferred_to=f'Hatcher {n % 8 + 1}',
+                humidity=Decimal(rng.randint(6000, 7000)) / 100,
+                temperature=Decimal(rng.randint(3700, 3760)) / 100,
+                notification_sent=True, day=HATCH_DAY,
+            ),
+            HatchingRecord: HatchingRecord(
+                batch_id=code, label=f'H-{n:06d}', hatch_date=start + timedelta(days=HATCH_DAY),
+                quantity=fertile, hatched_eggs=hatched, unhatched_eggs=fertile - hatched,
+                cull_chicks=cull, dead_chicks=dead, status='completed',
+            ),
+            PackagingBatch: PackagingBatch(
+                batch_id=code, label=f'P-{n:06d}',
+                packaging_date=start + timedelta(days=HATCH_DAY + 1), type_of_chicks=breed,
+                box_type=box_type, full_boxes=packed // per_box, unfull_boxes=int(packed % per_box > 0),
+                unfull_box_count=packed % per_box, chicks_packed=packed, status='completed',
+            ),
+        }
+        sold_from = start + timedelta(days=HATCH_DAY + 1)
+        sales = [self.build_sale(code, sold_from + timedelta(days=rng.randint(0, 3)), quantity, breed)
+                 for quantity in split(packed, self.sales_per_batch[n], rng)] if packed else []
+        return {'code': code, 'collections': collections, 'stages': stages, 'sales': sales}
+
+    # -- row builders --------------------------------------------------------
+
+    @staticmethod
+    def spread(total, buckets):
+        """``total`` spread as evenly as possible over ``buckets`` slots."""
+        base, extra = divmod(total, max(buckets, 1))
+        return [base + (i < extra) for i in range(buckets)]
+
+    def build_incubator(self, i):
+        return Incubator(
+            name=f'{"Hatcher" if i % 3 == 0 else "Setter"} {i + 1}', location=f'Hall {i // 8 + 1}',
+            capacity=self.rng.choice((19200, 57600, 115200)),
+        )
+
+    def build_alertrule(self, i):
+        metric = tuple(METRICS)[i % len(METRICS)]
+        low, high, _ = METRICS[metric]
+        return AlertRule(
+            name=f'{metric} bounds', incubator=self.incubators[i // len(METRICS) % len(self.incubators)],
+            metric=metric, severity=self.rng.choice(('medium', 'high')), min_value=low, max_value=high,
+        )
+
+    def build_collection(self, day, breed):
+        rng  = self.rng
+        full = rng.randint(1, 12)
+        return EggCollection(
+            farmer_name=rng.choice(FARMERS), label=f'C-{rng.randrange(16 ** 6):06x}', animal_type='chicken',
+            type_of_eggs=breed, full_trays=full, unfull_trays=1, unfull_tray_count=rng.randint(1, TRAY_EGGS - 1),
+            damaged_eggs=rng.randint(0, full), date=day,
+        )
+
+    def build_sale(self, code, day, quantity, breed):
+        rng   = self.rng
+        price = Decimal(rng.randint(80, 150)) / 100
+        total = price * quantity
+        paid  = total if rng.random() < 0.8 else (total / 2).quantize(Decimal('0.01'))
+        return SaleRecord(
+            batch_id=code, date=day, customer=rng.choice(CUSTOMERS), product_type=f'{breed} chicks',
+            quantity=quantity, unit_price=price, total_amount=total, paid=paid, balance=total - paid,
+            payment_method=rng.choice(('Cash', 'Mobile Money', 'Bank Transfer')),
+            status='completed' if paid == total else 'pending',
+        )
+
+    def build_alert(self, i):
+        rng  = self.rng
+        rule = rng.choice(self.rules)
+        low, high, unit = METRICS[rule.metric]
+        value = round(high + rng.uniform(0.1, 2.0), 2) if low is None or rng.random() < 0.5 \
+            else round(low - rng.uniform(0.1, 2.0), 2)
+        bound = high if value > high else low
+        stamp = datetime.combine(EPOCH, time(), timezone.utc) \
+            + timedelta(seconds=i * SPAN_DAYS * 86400 // max(self.volumes['alerts.Alert'], 1))
+        return Alert(
+            type=rule.metric, severity=rule.severity, source=rule.incubator.name,
+            value=f'{value}{unit}', threshold=f'{">" if value > high else "<"} {bound}{unit}',
+            timestamp=stamp, message=f'{rule.incubator.name} {rule.metric} out of bounds',
+            status='resolved' if rng.random() < 0.98 else 'active', duration=f'{rng.randint(1, 90)}m',
+            rule=rule, incubator=rule.incubator, metric=rule.metric, numeric_value=value,
+            numeric_threshold=bound,
+        )
+
+    def build_notification(self, i):
+        return Notification(
+            user=self.user, title=f'Batch B-{i % max(self.volumes["batches.Batch"], 1):06d} ready',
+            message='Transfer to hatcher.', is_read=self.rng.random() < 0.9,
+        )
@@ -0,0 +1,155 @@
+# apps/core/serializers.py
+
+from datetime import date
+from decimal import Decimal
+
+from rest_framework import ISO_8601
+from rest_framework import fields as drf_fields
+from rest_framework import relations
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=a,b`` keeps only those fields in GET responses and
+    ``?exclude=notes`` drops some. Unknown names are a 400.
+    Writes always use the full serializer.
+    """
+    fields_query_param  = 'fields'
+    exclude_query_param = 'exclude'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return
+        only    = split_names(request.query_params.get(self.fields_query_param))
+        exclude = split_names(request.query_params.get(self.exclude_query_param))
+        if not (only or exclude):
+            return
+
+        unknown = (only | exclude) - set(self.fields)
+        if unknown:
+            raise ValidationError({'fields': f'Unknown field(s): {", ".join(sorted(unknown))}.'})
+        for name in list(self.fields):
+            if (only and name not in only) or name in exclude:
+                self.fields.pop(name)
+
+
+def split_names(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+# Serializer fields whose to_representation() returns database values as
+# they come out of values(): no call needed on the fast path.
+PASSTHROUGH_FIELDS = (
+    drf_fields.CharField, drf_fields.IntegerField, drf_fields.BooleanField,
+    drf_fields.ChoiceField, drf_fields.FloatField,
+)
+CONVERTED_FIELDS = (
+    drf_fields.DecimalField, drf_fields.DateField, drf_fields.DateTimeField,
+    drf_fields.TimeField, drf_fields.DurationField, drf_fields.UUIDField,
+    drf_fields.JSONField,
+)
+
+
+def fast_representation(field, model_field):
+    """
+    ``field.to_representation`` or a cheaper equivalent for the common
+    cases: ISO dates, and decimals that already come back from the
+    database at the serializer's scale.
+    """
+    if isinstance(field, drf_fields.DateField) and not isinstance(field, drf_fields.DateTimeField):
+        if getattr(field, 'format', api_settings.DATE_FORMAT) == ISO_8601:
+            return date.isoformat
+    if (isinstance(field, drf_fields.DecimalField)
+            and getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+            and not (field.localize or field.normalize_output or field.rounding)
+            and field.decimal_places is not None
+            and field.decimal_places == getattr(model_field, 'decimal_places', None)):
+        exponent = Decimal(1).scaleb(-field.decimal_places)
+        return lambda value: format(value.quantize(exponent), 'f')
+    return field.to_representation
+
+
+class ValuesPlan:
+    """
+    How to render a ModelSerializer's output from ``values()`` rows instead
+    of model instances: which columns to select, which values need the
+    field's own formatting, and which many-to-many id lists to fetch.
+    ``for_serializer`` returns None when a field can't be served this way.
+    """
+
+    def __init__(self, model, columns, converters, many_to_many):
+        self.model        = model
+        self.columns      = columns          # [(output name, attname)]
+        self.converters   = converters       # {output name: to_representation}
+        self.many_to_many = many_to_many     # [(output name, model field)]
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        if model is None:
+            return None
+        columns, converters, many_to_many = [], {}, []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except Exception:
+                return None                  # method fields, dotted sources, ...
+            if isinstance(field, relations.ManyRelatedField):
+                if not isinstance(field.child_relation, relations.PrimaryKeyRelatedField):
+                    return None
+                many_to_many.append((name, model_field))
+            elif isinstance(field, relations.PrimaryKeyRelatedField):
+                if field.pk_field is not None or not model_field.many_to_one:
+                    return None
+                columns.append((name, model_field.attname))
+            elif isinstance(field, CONVERTED_FIELDS):
+                columns.append((name, model_field.attname))
+                converters[name] = fast_representation(field, model_field)
+            elif isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, relations.RelatedField):
+                if model_field.is_relation:
+                    return None
+                columns.append((name, model_field.attname))
+            else:
+                return None
+        return cls(model, columns, converters, many_to_many)
+
+    def values(self, queryset, extra=()):
+        """``queryset.values()`` with the plan's columns plus ``extra`` attnames."""
+        names = [attname for _, attname in self.columns]
+        names += [name for name in ('pk', *extra) if name not in names]
+        return queryset.prefetch_related(None).values(*names)
+
+    def render(self, rows):
+        rows       = list(rows)
+        columns    = self.columns
+        converters = list(self.converters.items())
+        related    = [(name, self._related_ids(field, rows)) for name, field in self.many_to_many]
+        data = []
+        for row in rows:
+            item = {name: row[attname] for name, attname in columns}
+            for name, convert in converters:
+                value = item[name]
+                if value is not None:
+                    item[name] = convert(value)
+            for name, ids in related:
+                item[name] = ids.get(row['pk'], [])
+            data.append(item)
+        return data
+
+    @staticmethod
+    def _related_ids(field, rows):
+        """One query per many-to-many field for the whole page."""
+        through  = field.remote_field.through
+        src, dst = field.m2m_field_name(), field.m2m_reverse_field_name()
+        ids = {}
+        pairs = (through.objects.filter(**{f'{src}__in': [row['pk'] for row in rows]})
+                 .order_by('pk').values_list(f'{src}_id', f'{dst}_id'))
+        for owner, target in pairs:
+            ids.setdefault(owner, []).append(target)
+        return ids
@@ -0,0 +1,23 @@
+# apps/core/signals.py
+
+from django.dispatch import Signal
+
+# Sent before QuerySet.bulk_create() with the unsaved ``instances``, so
+# handlers can fill in derived columns as pre_save handlers would.
+pre_bulk_create = Signal()
+
+# Sent after QuerySet.bulk_create() writes that skip post_save, with
+# ``sender`` = model class and ``instances`` = the created objects (pks set).
+bulk_created = Signal()
+
+# Sent after QuerySet.bulk_update() writes, with ``instances`` and the
+# list of updated ``fields``.
+bulk_updated = Signal()
+
+# Sent after QuerySet.update() writes, which bypass post_save; ``sender``
+# is the model whose rows changed and ``pks`` the rows touched, or None
+# for a table-wide rewrite. On per-user tables (changes.versions.
+# SCOPED_MODELS) ``scope`` may name the rows' owner; with ``pks=None``
+# the rewrite then only covers that owner's rows. ``fields``, when the
+# sender knows it, lists the columns the UPDATE set.
+queryset_updated = Signal()
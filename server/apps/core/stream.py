@@ -0,0 +1,67 @@
+# apps/core/stream.py
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .events import get_broker
+
+ALERTS_CHANNEL = 'alerts'
+
+
+def notifications_channel(user_id):
+    return f'notifications.{user_id}'
+
+
+def authenticate_stream(request):
+    """
+    JWT from the Authorization header, or ``?token=`` since browsers'
+    EventSource cannot set headers.
+    """
+    auth   = JWTAuthentication()
+    header = auth.get_header(request)
+    raw    = auth.get_raw_token(header) if header else None
+    raw    = raw or request.GET.get('token')
+    if not raw:
+        return None
+    try:
+        user = auth.get_user(auth.get_validated_token(raw))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return user if user.is_active else None
+
+
+async def event_stream(request):
+    """
+    ``GET /api/stream/`` – server-sent events for the alert feed and the
+    caller's notifications. Needs the ASGI application: under WSGI each
+    open stream would hold a worker thread.
+    """
+    user = await sync_to_async(authenticate_stream)(request)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'},
+                            status=401)
+
+    subscription = get_broker().subscribe([ALERTS_CHANNEL, notifications_channel(user.pk)])
+    response = StreamingHttpResponse(_frames(subscription), content_type='text/event-stream')
+    response['Cache-Control']     = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'      # nginx: flush every frame
+    return response
+
+
+async def _frames(subscription):
+    heartbeat = settings.EVENT_STREAM_HEARTBEAT
+    try:
+        # Reconnect quickly, and get the headers out straight away.
+        yield b'retry: 1000\n\n'
+        while True:
+            try:
+                yield await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield b': keepalive\n\n'
+    finally:
+        subscription.close()
@@ -0,0 +1,566 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from base64 import b64encode
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection, connections, models
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.reports_analytics.cache import report_cache
+from apps.reports_analytics.models import DailySalesRollup
+from apps.sales.models import SaleRecord
+from config.urls import router
+from .authentication import CachedJWTAuthentication, UserCache, check_stamps_shared, user_cache
+from .routers import REPLICA, ReplicaRouter
+from .serializers import ValuesPlan
+from .signals import queryset_updated
+
+# Queries per request on top of the main SELECT, by router basename.
+# Authentication is forced, so none are spent on the user.
+QUERY_BUDGETS = {
+    'egg-setting': 1,       # collection_ids prefetch
+}
+ROW_COUNTS = (1, 100, 10000)
+
+
+class RowFactory:
+    """Fills any model's required columns with placeholder values, in bulk."""
+
+    def __init__(self, user):
+        self.user    = user
+        self.related = {User: user}
+        self.serial  = 0
+
+    def create(self, model, count):
+        rows = []
+        for _ in range(count):
+            self.serial += 1
+            rows.append(model(**{
+                field.attname: self.value(field)
+                for field in model._meta.concrete_fields
+                if not (field.primary_key or field.null or field.has_default()
+                        or getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False))
+            }))
+        rows = model.objects.bulk_create(rows, batch_size=2000)
+        for field in model._meta.many_to_many:
+            through  = field.remote_field.through
+            targets  = [self.instance(field.related_model), self.instance(field.related_model, fresh=True)]
+            src, dst = field.m2m_field_name(), field.m2m_reverse_field_name()
+            through.objects.bulk_create(
+                [through(**{f'{src}_id': row.pk, f'{dst}_id': t.pk}) for row in rows for t in targets],
+                batch_size=2000,
+            )
+        return rows
+
+    def instance(self, model, fresh=False):
+        if fresh or model not in self.related:
+            obj = self.create(model, 1)[0]
+            if not fresh:
+                self.related[model] = obj
+            return obj
+        return self.related[model]
+
+    def value(self, field):
+        if field.is_relation:
+            return self.instance(field.related_model).pk
+        if field.unique:
+            return f'U{self.serial}'
+        if isinstance(field, models.DateTimeField):
+            return datetime(2025, 1, 1, tzinfo=timezone.utc)
+        if isinstance(field, models.DateField):
+            return date(2025, 1, 1)
+        if isinstance(field, models.DecimalField):
+            return Decimal('1')
+        if isinstance(field, models.FloatField):
+            return 1.0
+        if isinstance(field, models.BooleanField):
+            return False
+        if isinstance(field, (models.IntegerField, models.PositiveIntegerField)):
+            return 1
+        return 'x'
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Every router endpoint, list and detail, must run the same number of
+    queries at 1, 100 and 10,000 rows, and no more than its budget.
+    """
+
+    def setUp(self):
+        self.user   = User.objects.create_superuser('qa', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def test_router_endpoints(self):
+        for prefix, viewset, basename in router.registry:
+            with self.subTest(endpoint=prefix):
+                model   = viewset.queryset.model
+                factory = RowFactory(self.user)
+                lookup  = getattr(viewset, 'lookup_field', 'pk')
+                # table versions for the ETag + the page itself
+                budget  = 2 + QUERY_BUDGETS.get(basename, 0)
+                created = 0
+                for rows in ROW_COUNTS:
+                    factory.create(model, rows - created)
+                    created = rows
+                    obj = model.objects.order_by('-pk').first()
+                    self.assertEqual(self.count_queries(reverse(f'{basename}-list')), budget,
+                                     f'{prefix} list at {rows} rows')
+                    detail = reverse(f'{basename}-detail', args=[getattr(obj, lookup)])
+                    self.assertEqual(self.count_queries(detail), budget,
+                                     f'{prefix} detail at {rows} rows')
+
+    def test_admin_changelists(self):
+        self.client.force_login(self.user)
+        for prefix, viewset, basename in router.registry:
+            model = viewset.queryset.model
+            if model not in admin.site._registry:
+                continue
+            with self.subTest(model=model.__name__):
+                factory = RowFactory(self.user)
+                url     = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+                factory.create(model, 1)
+                counts  = [self.count_queries(url)]
+                factory.create(model, 99)
+                counts.append(self.count_queries(url))
+                self.assertEqual(counts[0], counts[1], f'{model.__name__} changelist grows with rows')
+
+
+class QueryCountMiddlewareTests(TestCase):
+
+    def test_reports_queries_per_request(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('qa', password='pw'))
+        response = client.get('/api/egg-settings/')
+        # table versions + page
+        self.assertEqual(response['X-DB-Queries'], '2')
+        self.assertRegex(response['Server-Timing'], r'^db;dur=\d+\.\d;desc="2 queries"$')
+
+    def test_logs_requests_over_the_limit(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('qa', password='pw'))
+        with self.settings(QUERY_COUNT_WARN=0):
+            with self.assertLogs('apps.queries', 'WARNING') as logs:
+                client.get('/api/egg-settings/')
+        self.assertIn('GET /api/egg-settings/ ran 2 queries', logs.output[0])
+
+
+class FastListTests(TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_superuser('qa', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_values_path_matches_the_serializer(self):
+        for prefix, viewset, basename in router.registry:
+            with self.subTest(endpoint=prefix):
+                RowFactory(self.user).create(viewset.queryset.model, 3)
+                url  = reverse(f'{basename}-list')
+                fast = self.client.get(url).json()
+                with mock.patch.object(viewset, 'fast_list', False):
+                    slow = self.client.get(url).json()
+                self.assertEqual(fast, slow)
+                self.assertTrue(fast['results'])
+
+    def test_plan_covers_every_router_serializer(self):
+        for prefix, viewset, basename in router.registry:
+            with self.subTest(endpoint=prefix):
+                self.assertIsNotNone(ValuesPlan.for_serializer(viewset.serializer_class()))
+
+    def test_cursor_pages_on_values_rows(self):
+        RowFactory(self.user).create(SaleRecord, 5)
+        page = self.client.get('/api/sales/?page_size=2').json()
+        seen = [row['id'] for row in page['results']]
+        while page['next']:
+            page = self.client.get(page['next']).json()
+            seen += [row['id'] for row in page['results']]
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(seen), 5)
+
+
+class SparseFieldsetTests(TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_superuser('qa', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.sale   = RowFactory(self.user).create(SaleRecord, 1)[0]
+
+    def test_fields(self):
+        rows = self.client.get('/api/sales/?fields=id,batch_id').json()['results']
+        self.assertEqual(rows, [{'id': self.sale.pk, 'batch_id': self.sale.batch_id}])
+        detail = self.client.get(f'/api/sales/{self.sale.pk}/?fields=id,total_amount').json()
+        self.assertEqual(detail, {'id': self.sale.pk, 'total_amount': '1.00'})
+
+    def test_exclude(self):
+        row = self.client.get('/api/sales/?exclude=notes,customer').json()['results'][0]
+        self.assertNotIn('notes', row)
+        self.assertNotIn('customer', row)
+        self.assertIn('total_amount', row)
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/sales/?fields=id,nope')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('nope', response.json()['fields'])
+
+    def test_writes_ignore_the_params(self):
+        response = self.client.post('/api/egg-candling/fertile/?fields=id',
+                                    {'batch_id': 'B-1', 'candling_date': '2025-01-08', 'count': 5},
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('count', response.json())
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user   = User.objects.create_superuser('qa', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Three rows share each date, so pages split inside runs of equal keys.
+        self.sales = RowFactory(self.user).create(SaleRecord, 6)
+        for i, sale in enumerate(self.sales):
+            sale.date = date(2025, 1, 1 + i // 3)
+        SaleRecord.objects.bulk_update(self.sales, ['date'])
+        # -date, -id
+        self.expected = [s.pk for s in sorted(self.sales, key=lambda s: (s.date, s.pk), reverse=True)]
+
+    def ids(self, url):
+        page = self.client.get(url).json()
+        return [row['id'] for row in page['results']], page
+
+    def test_cursor_round_trip(self):
+        first, page = self.ids('/api/sales/?page_size=2')
+        self.assertIsNone(page['previous'])
+        second, page = self.ids(page['next'])
+        self.assertEqual(first + second, self.expected[:4])
+        back, page = self.ids(page['previous'])
+        self.assertEqual(back, first)
+        self.assertIsNone(page['previous'])
+
+    def test_ties_on_the_sort_key_break_on_id(self):
+        seen, page = self.ids('/api/sales/?page_size=2')
+        while page['next']:
+            ids, page = self.ids(page['next'])
+            seen += ids
+        self.assertEqual(seen, self.expected)
+
+    def test_offset_mode(self):
+        ids, page = self.ids('/api/sales/?paginate=offset&limit=2&offset=2')
+        self.assertEqual(ids, self.expected[2:4])
+        self.assertEqual(page['count'], 6)
+        self.assertIn('paginate=offset', page['next'])
+        self.assertIn('offset=4', page['next'])
+
+    def test_malformed_cursor_is_rejected(self):
+        short = b64encode(json.dumps({'r': 0, 'p': ['2025-01-02']}).encode()).decode()
+        for cursor in ('not-a-cursor', short):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/sales/', {'cursor': cursor}).status_code, 404)
+
+
+class BenchmarkCommandTests(TestCase):
+
+    def test_times_every_route(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        call_command('benchmark_endpoints', scale=0.0001, requests=2, warmup=0, output=path,
+                     stderr=StringIO())
+        with open(path) as fh:
+            result = json.load(fh)
+
+        routes = {route['name']: route for route in result['routes']}
+        for prefix, viewset, basename in router.registry:
+            self.assertIn(f'{basename}-list', routes)
+            self.assertIn(f'{basename}-detail', routes)
+        for name in ('report-hatch-rate', 'report-sales', 'report-production',
+                     'token_obtain_pair', 'token_refresh'):
+            self.assertIn(name, routes)
+        for route in routes.values():
+            self.assertIn(route['status'], (200, 201), route)
+            self.assertLessEqual(route['p50_ms'], route['p99_ms'])
+            self.assertGreater(route['peak_memory_kb'], 0)
+        self.assertEqual(result['volumes']['alerts.Alert'], 500)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.user   = User.objects.create_user('clerk', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def queries(self, url='/api/egg-settings/'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return int(response['X-DB-Queries'])
+
+    def test_user_is_loaded_once(self):
+        self.assertEqual(self.queries(), 3)         # user + table versions + page
+        self.assertEqual(self.queries(), 2)
+        self.assertEqual(user_cache.stats(), {'entries': 1, 'hits': 1, 'misses': 1})
+
+    def test_deactivation_evicts(self):
+        self.queries()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/egg-settings/').status_code, 401)
+
+    def test_password_change_evicts(self):
+        self.queries()
+        self.user.set_password('new')
+        self.user.save()
+        self.assertEqual(user_cache.stats()['entries'], 0)
+        self.assertEqual(self.queries(), 3)
+
+    def test_entries_expire(self):
+        self.queries()
+        with mock.patch('apps.core.authentication.time.monotonic', return_value=10 ** 9):
+            self.assertEqual(self.queries(), 3)
+
+    def test_revocations_reach_other_processes(self):
+        other_process = UserCache(ttl=60, stamps='auth')     # shares the stamps backend
+        other_process.set('1', 'user', other_process.stamp('1'))
+        user_cache.invalidate('1')
+        self.assertIsNone(other_process.get('1'))
+
+    def test_users_reloaded_before_commit_are_revoked_at_commit(self):
+        user_id = str(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            # A concurrent request that still sees the committed, active row.
+            stale = User.objects.get(pk=self.user.pk)
+            stale.is_active = True
+            user_cache.set(user_id, stale, user_cache.stamp(user_id))
+            self.assertIs(user_cache.get(user_id), stale)
+        self.assertIsNone(user_cache.get(user_id))
+
+    def test_per_process_stamps_are_flagged(self):
+        locmem = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        self.assertEqual(check_stamps_shared(), [])
+        with self.settings(CACHES={**settings.CACHES, 'auth': locmem}):
+            self.assertEqual([w.id for w in check_stamps_shared()], ['core.W001'])
+
+    def test_queryset_updates_evict(self):
+        self.queries()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        queryset_updated.send(sender=User, pks=[self.user.pk])
+        self.assertEqual(self.client.get('/api/egg-settings/').status_code, 401)
+
+    def test_requests_get_their_own_user(self):
+        token = RefreshToken.for_user(self.user).access_token
+        first, second = (CachedJWTAuthentication().get_user(token) for _ in range(2))
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def test_least_recently_used_is_dropped(self):
+        cache = UserCache(max_entries=2, ttl=60)
+        for key in ('a', 'b'):
+            cache.set(key, key, cache.stamp(key))
+        cache.get('a')
+        cache.set('c', 'c', cache.stamp('c'))
+        self.assertEqual([cache.get(k) for k in ('a', 'b', 'c')], ['a', None, 'c'])
+
+
+class BenchmarkAuthCommandTests(TestCase):
+
+    def test_reports_the_saved_user_query(self):
+        self.addCleanup(user_cache.clear)
+        out = StringIO()
+        call_command('benchmark_auth', scale=0.0001, requests=2, warmup=0, route='^sale-list$',
+                     output='-', stdout=out, stderr=StringIO())
+        [route] = json.loads(out.getvalue())['routes']
+        self.assertEqual(route['uncached']['queries'] - route['cached']['queries'], 1)
+
+
+class ReplicaRoutingTests(TestCase):
+    """
+    A second SQLite file as the replica: a copy of the test database plus
+    rows only it has, so the tests can tell which alias served a read.
+    The alias is added at class setup, so the test runner never sets up
+    a test database for it.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        path = os.path.join(cls.tmpdir, 'replica.sqlite3')
+        connection.ensure_connection()
+        replica = sqlite3.connect(path)
+        connection.connection.backup(replica)
+        replica.execute("INSERT INTO reports_analytics_dailysalesrollup (date, total_amount, total_qty, row_count) "
+                        "VALUES ('2025-01-01', 99, 9, 1)")
+        replica.execute("INSERT INTO sales_salerecord (batch_id, date, customer, product_type, quantity, unit_price, "
+                        "total_amount, paid, balance, payment_method, status, notes) VALUES "
+                        "('R-1', '2025-01-01', 'Replica', 'chicks', 9, 11, 99, 99, 0, 'Cash', 'completed', '')")
+        replica.commit()
+        replica.close()
+        connections.settings[REPLICA] = {
+            **connection.settings_dict, 'NAME': path, 'OPTIONS': {'init_command': 'PRAGMA query_only = ON;'},
+        }
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        shutil.rmtree(cls.tmpdir)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('clerk', password='pw'))
+        caches['reports'].clear()
+
+    def test_reports_read_the_replica(self):
+        self.assertEqual(self.client.get('/api/reports/sales/').json(),
+                         [{'date': '2025-01-01', 'total_amount': 99.0, 'total_qty': 9}])
+
+    def test_reports_from_a_lagging_replica_are_not_cached(self):
+        self.assertIn('ETag', self.client.get('/api/reports/sales/'))
+        with self.captureOnCommitCallbacks(execute=True):
+            SaleRecord.objects.create(
+                batch_id='B-1', date=date(2025, 2, 1), customer='Acme', product_type='chicks', quantity=1,
+                unit_price=1, total_amount=1, paid=1, balance=0, payment_method='Cash', status='completed',
+            )
+        report_cache.reset_stats()
+        for _ in range(2):
+            response = self.client.get('/api/reports/sales/')
+            self.assertNotIn('ETag', response)
+            self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertEqual(report_cache.stats()['misses'], 2)
+
+    def test_exports_read_the_replica(self):
+        response = self.client.get('/api/sales/export/', {'output': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['customer'] for row in rows], ['Replica'])
+
+    def test_operational_reads_and_writes_use_the_primary(self):
+        self.assertEqual(self.client.get('/api/sales/').json()['results'], [])
+        response = self.client.post('/api/sales/', {
+            'batch_id': 'B-1', 'date': '2025-02-01', 'customer': 'Acme', 'product_type': 'chicks',
+            'quantity': 1, 'unit_price': '1.00', 'total_amount': '1.00', 'paid': '1.00',
+            'balance': '0', 'payment_method': 'Cash', 'status': 'completed',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)     # the replica is read-only
+        self.assertEqual([row['customer'] for row in self.client.get('/api/sales/').json()['results']], ['Acme'])
+        self.assertEqual(SaleRecord.objects.using(REPLICA).get().customer, 'Replica')
+
+    def test_writes_fold_into_the_primarys_rollups(self):
+        response = self.client.post('/api/sales/', {
+            'batch_id': 'B-1', 'date': '2025-02-01', 'customer': 'Acme', 'product_type': 'chicks',
+            'quantity': 3, 'unit_price': '2.00', 'total_amount': '6.00', 'paid': '6.00',
+            'balance': '0', 'payment_method': 'Cash', 'status': 'completed',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        rollup = DailySalesRollup.objects.using('default').get(date=date(2025, 2, 1))
+        self.assertEqual((rollup.total_amount, rollup.total_qty, rollup.row_count), (Decimal('6.00'), 3, 1))
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(DailySalesRollup), REPLICA)
+        self.assertIsNone(router.db_for_read(SaleRecord))
+        self.assertEqual(router.db_for_write(DailySalesRollup), 'default')
+        self.assertFalse(router.allow_migrate(REPLICA, 'sales'))
+
+
+class SeedHatcheryTests(TestCase):
+    SCALE = 0.0005          # 10 batches, 500 collections, 100 sales
+
+    def seed(self, **options):
+        call_command('seed_hatchery', scale=self.SCALE, stdout=StringIO(), **options)
+
+    def fingerprint(self):
+        return list(SaleRecord.objects.order_by('pk').values_list('batch_id', 'customer', 'quantity', 'total_amount'))
+
+    def test_stages_add_up(self):
+        from apps.batches.models import Batch
+        self.seed()
+        self.assertEqual(Batch.objects.count(), 10)
+        for batch in Batch.objects.prefetch_related(
+            'egg_settings__collection_ids', 'fertile_candlings', 'clear_candlings', 'lockdowns',
+            'hatchings', 'packaging_batches', 'sales',
+        ):
+            setting  = batch.egg_settings.get()
+            received = sum(c.full_trays * 30 + c.unfull_tray_count - c.damaged_eggs
+                           for c in setting.collection_ids.all())
+            self.assertEqual(setting.eggs_set, received - setting.reject_eggs)
+            self.assertEqual(setting.full_setters * 102 + setting.unfull_setter_eggs, setting.eggs_set)
+
+            fertile = batch.fertile_candlings.get().count
+            self.assertEqual(fertile + batch.clear_candlings.get().count, setting.eggs_set)
+            self.assertEqual(batch.lockdowns.get().quantity, fertile)
+
+            hatch = batch.hatchings.get()
+            self.assertEqual(hatch.quantity, fertile)
+            self.assertEqual(hatch.hatched_eggs + hatch.unhatched_eggs, hatch.quantity)
+
+            packed = batch.packaging_batches.get()
+            self.assertEqual(packed.hatch_batch_id, hatch.pk)
+            self.assertEqual(packed.chicks_packed, hatch.hatched_eggs - hatch.cull_chicks - hatch.dead_chicks)
+
+            sales = list(batch.sales.all())
+            self.assertEqual(sum(s.quantity for s in sales), packed.chicks_packed)
+            for sale in sales:
+                self.assertEqual(sale.total_amount, sale.quantity * sale.unit_price)
+                self.assertEqual(sale.paid + sale.balance, sale.total_amount)
+
+    def test_same_seed_same_rows(self):
+        self.seed(seed=7)
+        first = self.fingerprint()
+        self.seed(seed=7, flush=True)
+        self.assertEqual(self.fingerprint(), first)
+        self.seed(seed=8, flush=True)
+        self.assertNotEqual(self.fingerprint(), first)
+
+    def test_flush_clears_rows_referencing_seeded_ones(self):
+        from apps.incubation.models import Incubator
+        from apps.telemetry.ingest import ingest
+        from apps.telemetry.models import TelemetryBucket, TelemetryRollup
+        self.seed()
+        incubator = Incubator.objects.first()
+        ingest([(incubator.pk, 'temperature', datetime(2025, 1, 1, tzinfo=timezone.utc), 37.5)])
+        self.seed(flush=True)
+        connection.check_constraints()
+        self.assertFalse(TelemetryBucket.objects.exists())
+        self.assertFalse(TelemetryRollup.objects.exists())
+
+    def test_refuses_to_mix_with_existing_data(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+
+    def test_inserts_are_chunked(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.seed()
+        inserts = [q for q in queries if q['sql'].startswith('INSERT')]
+        # a few statements per table, not one per row (600+ rows)
+        self.assertLess(len(inserts), 120)
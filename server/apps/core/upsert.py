@@ -0,0 +1,61 @@
+# apps/core/upsert.py
+
+from django.db import router, transaction
+from django.db.models import F
+
+
+def add_deltas(model, key_field, deltas, count_field, defaults=None):
+    """
+    Add ``deltas`` (``{key: {field: delta}}``) to the rows of ``model``
+    looked up by its unique ``key_field``, in at most four statements
+    however many keys: create missing rows, lock them and read their
+    pks, one bulk UPDATE of ``F(field) + delta``, drop rows whose ``count_field``
+    fell to zero.
+
+    Rows are created empty (plus ``defaults``) only for keys whose count
+    goes up, skipping any a concurrent writer created first. The rows are
+    then locked, in key order, until the transaction ends, so a writer
+    can't drop a row that fell to zero while another still has an
+    increment for it pending; a row dropped between the insert and the
+    lock is created again. A key with no row and no count to add is left
+    alone: there is nothing to subtract from, and the table's rebuild
+    command resyncs it.
+
+    Every statement, reads included, runs on the primary: rows the
+    router would read from a lagging replica may not be there yet.
+    """
+    deltas = {key: {field: delta for field, delta in fields.items() if delta} for key, fields in deltas.items()}
+    deltas = {key: fields for key, fields in deltas.items() if fields}
+    if not deltas:
+        return
+    fields = sorted({field for changes in deltas.values() for field in changes})
+
+    db      = router.db_for_write(model)
+    objects = model._default_manager.db_manager(db)
+
+    def create(keys):
+        objects.bulk_create([model(**{key_field: key}, **(defaults or {})) for key in keys],
+                            batch_size=500, ignore_conflicts=True)
+
+    def lock(keys):
+        return list(objects.select_for_update().filter(**{f'{key_field}__in': keys})
+                    .order_by(key_field).only('pk', key_field))
+
+    with transaction.atomic(using=db):
+        new = [key for key, changes in deltas.items() if changes.get(count_field, 0) > 0]
+        if new:
+            create(new)
+        rows = lock(list(deltas))
+        # Emptied and deleted by another writer after our insert: again.
+        while missing := sorted(set(new) - {getattr(row, key_field) for row in rows}):
+            create(missing)
+            rows += lock(missing)
+        for row in rows:
+            changes = deltas[getattr(row, key_field)]
+            for field in fields:
+                setattr(row, field, F(field) + changes.get(field, 0))
+        objects.bulk_update(rows, fields, batch_size=500)
+
+        emptied = [key for key, changes in deltas.items() if changes.get(count_field, 0) < 0]
+        if emptied:
+            objects.filter(**{f'{key_field}__in': emptied, count_field: 0}).delete()
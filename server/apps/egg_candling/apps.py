@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class EggCandlingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'egg_candling'
+    name = 'apps.egg_candling'
@@ -7,6 +7,18 @@ class FertileEggCandling(models.Model):
     candling_date= models.DateField()
     count        = models.PositiveIntegerField()
     notes        = models.TextField(blank=True)
+    lineage      = models.ForeignKey(
+                     'batches.Batch',
+                     on_delete=models.SET_NULL,
+                     null=True, blank=True, editable=False,
+                     related_name='fertile_candlings'
+                   )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'candling_date'], name='fertile_batch_date_idx'),
+            models.Index(fields=['candling_date', 'id'],       name='fertile_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"Fertile – {self.batch_id} on {self.candling_date}"
@@ -16,6 +28,18 @@ class ClearEggCandling(models.Model):
     candling_date= models.DateField()
     count        = models.PositiveIntegerField()
     notes        = models.TextField(blank=True)
+    lineage      = models.ForeignKey(
+                     'batches.Batch',
+                     on_delete=models.SET_NULL,
+                     null=True, blank=True, editable=False,
+                     related_name='clear_candlings'
+                   )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'candling_date'], name='clear_batch_date_idx'),
+            models.Index(fields=['candling_date', 'id'],       name='clear_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"Clear – {self.batch_id} on {self.candling_date}"
@@ -1,14 +1,15 @@
 # apps/egg_candling/serializers.py
 
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import FertileEggCandling, ClearEggCandling
 
-class FertileEggCandlingSerializer(serializers.ModelSerializer):
+class FertileEggCandlingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = FertileEggCandling
         fields = '__all__'
 
-class ClearEggCandlingSerializer(serializers.ModelSerializer):
+class ClearEggCandlingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = ClearEggCandling
         fields = '__all__'
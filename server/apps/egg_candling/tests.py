@@ -1,3 +1,44 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.assertions import QueryPlanAssertionsMixin
+from .models import FertileEggCandling, ClearEggCandling
+
+
+class FertileEggCandlingQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = FertileEggCandling.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'fertile_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = FertileEggCandling.objects.filter(batch_id='B-001').order_by('candling_date')
+        self.assertIndexSearch(qs, 'fertile_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = FertileEggCandling.objects.filter(candling_date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = FertileEggCandling.objects.order_by('-candling_date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
+
+
+class ClearEggCandlingQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = ClearEggCandling.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'clear_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = ClearEggCandling.objects.filter(batch_id='B-001').order_by('candling_date')
+        self.assertIndexSearch(qs, 'clear_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = ClearEggCandling.objects.filter(candling_date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = ClearEggCandling.objects.order_by('-candling_date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
@@ -2,15 +2,19 @@
 
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
 from .models      import FertileEggCandling, ClearEggCandling
 from .serializers import FertileEggCandlingSerializer, ClearEggCandlingSerializer
 
-class FertileEggCandlingViewSet(viewsets.ModelViewSet):
+class FertileEggCandlingViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     queryset           = FertileEggCandling.objects.all()
     serializer_class   = FertileEggCandlingSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-candling_date', '-id')
 
-class ClearEggCandlingViewSet(viewsets.ModelViewSet):
+class ClearEggCandlingViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     queryset           = ClearEggCandling.objects.all()
     serializer_class   = ClearEggCandlingSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-candling_date', '-id')
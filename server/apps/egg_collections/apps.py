@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class EggCollectionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'egg_collections'
+    name = 'apps.egg_collections'
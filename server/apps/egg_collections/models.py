@@ -11,5 +11,10 @@ class EggCollection(models.Model):
     damaged_eggs      = models.PositiveIntegerField()
     date              = models.DateField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'id'], name='eggcoll_date_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.farmer_name} — {self.label}"
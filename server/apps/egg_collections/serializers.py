@@ -1,9 +1,10 @@
 # apps/egg_collections/serializers.py
 
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import EggCollection
 
-class EggCollectionSerializer(serializers.ModelSerializer):
+class EggCollectionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = EggCollection
         fields = '__all__'
@@ -1,3 +1,61 @@
+from datetime import date
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.assertions import QueryPlanAssertionsMixin
+from .models import EggCollection
+
+
+class EggCollectionQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_date_range(self):
+        qs = EggCollection.objects.filter(date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs, 'eggcoll_date_id_idx')
+
+    def test_list_page(self):
+        qs = EggCollection.objects.order_by('-date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
+
+
+def collection_payload(i, **overrides):
+    payload = {
+        'farmer_name': f'Farmer {i}', 'label': f'L{i}', 'animal_type': 'chicken',
+        'type_of_eggs': 'broiler', 'full_trays': 10, 'unfull_trays': 1,
+        'unfull_tray_count': 12, 'damaged_eggs': 0, 'date': '2025-03-01',
+    }
+    payload.update(overrides)
+    return payload
+
+
+class EggCollectionBulkCreateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('clerk', password='pw'))
+
+    def test_array_is_inserted_in_bulk(self):
+        payload = [collection_payload(i) for i in range(100)]
+        # savepoint, one multi-row INSERT, table version bump, change log
+        # INSERT, release
+        with self.assertNumQueries(5):
+            response = self.client.post('/api/egg-collections/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()), 100)
+        self.assertEqual(EggCollection.objects.count(), 100)
+        self.assertTrue(all(row['id'] for row in response.json()))
+
+    def test_invalid_item_rejects_whole_array(self):
+        payload = [collection_payload(0), collection_payload(1, full_trays=-1), collection_payload(2, date='')]
+        response = self.client.post('/api/egg-collections/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual([e['index'] for e in errors], [1, 2])
+        self.assertIn('full_trays', errors[0]['errors'])
+        self.assertFalse(EggCollection.objects.exists())
 
-# Create your tests here.
+    def test_single_object_still_supported(self):
+        response = self.client.post('/api/egg-collections/', collection_payload(0), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['farmer_name'], 'Farmer 0')
@@ -2,10 +2,13 @@
 
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
 from .models import EggCollection
 from .serializers import EggCollectionSerializer
 
-class EggCollectionViewSet(viewsets.ModelViewSet):
+class EggCollectionViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     queryset = EggCollection.objects.all()
     serializer_class = EggCollectionSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ('-date', '-id')
@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class EggSettingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'egg_settings'
+    name = 'apps.egg_settings'
@@ -20,6 +20,18 @@ class EggSetting(models.Model):
     reject_eggs            = models.PositiveIntegerField()
     cumulative_reject_eggs = models.PositiveIntegerField()
     notes                  = models.TextField(blank=True)
+    lineage                = models.ForeignKey(
+                               'batches.Batch',
+                               on_delete=models.SET_NULL,
+                               null=True, blank=True, editable=False,
+                               related_name='egg_settings'
+                             )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'setting_date'], name='eggset_batch_date_idx'),
+            models.Index(fields=['setting_date', 'id'],       name='eggset_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.batch_id} — {self.setting_date}"
@@ -1,9 +1,10 @@
 # apps/egg_settings/serializers.py
 
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import EggSetting
 
-class EggSettingSerializer(serializers.ModelSerializer):
+class EggSettingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = EggSetting
         fields = '__all__'
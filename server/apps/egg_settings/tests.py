@@ -1,3 +1,72 @@
+from datetime import date
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.assertions import QueryPlanAssertionsMixin
+from apps.egg_collections.models import EggCollection
+from .models import EggSetting
+
+
+class EggSettingQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = EggSetting.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'eggset_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = EggSetting.objects.filter(batch_id='B-001').order_by('setting_date')
+        self.assertIndexSearch(qs, 'eggset_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = EggSetting.objects.filter(setting_date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = EggSetting.objects.order_by('-setting_date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
+
+
+class EggSettingBulkCreateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('clerk', password='pw'))
+        self.collections = EggCollection.objects.bulk_create([
+            EggCollection(farmer_name=f'F{i}', label='L', animal_type='chicken', type_of_eggs='broiler',
+                          full_trays=1, unfull_trays=0, unfull_tray_count=0, damaged_eggs=0,
+                          date=date(2025, 3, 1))
+            for i in range(3)
+        ])
+
+    def payload(self, batch_id, collection_ids):
+        return {
+            'batch_id': batch_id, 'setting_date': '2025-03-02', 'collection_ids': collection_ids,
+            'type_of_eggs': 'broiler', 'full_setters': 1, 'unfull_setters': 0,
+            'unfull_setter_eggs': 0, 'eggs_set': 90, 'dirty_eggs': 0, 'damaged_eggs': 0,
+            'reject_eggs': 0, 'cumulative_reject_eggs': 0,
+        }
+
+    def test_many_to_many_links_are_bulk_inserted(self):
+        ids = [c.pk for c in self.collections]
+        payload = [self.payload(f'B-{i}', ids[:i + 1]) for i in range(3)]
+        # in_bulk lookup, savepoint, lineage lookup + insert + re-read of the
+        # three new batch codes, settings INSERT, through-table INSERT, a
+        # version bump and change log INSERT each for batches and settings,
+        # release
+        with self.assertNumQueries(12):
+            response = self.client.post('/api/egg-settings/', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(
+            [sorted(row['collection_ids']) for row in response.json()],
+            [ids[:1], ids[:2], ids[:3]],
+        )
+        self.assertEqual(EggSetting.collection_ids.through.objects.count(), 6)
 
-# Create your tests here.
+    def test_unknown_collection_is_reported_per_item(self):
+        payload = [self.payload('B-1', [self.collections[0].pk]), self.payload('B-2', [999999])]
+        response = self.client.post('/api/egg-settings/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['index'], 1)
+        self.assertFalse(EggSetting.objects.exists())
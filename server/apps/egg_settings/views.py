@@ -2,14 +2,17 @@
 
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
 from .models import EggSetting
 from .serializers import EggSettingSerializer
 
-class EggSettingViewSet(viewsets.ModelViewSet):
+class EggSettingViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """
     Provides list, create, retrieve, update, and destroy actions
     for EggSetting instances.
     """
-    queryset           = EggSetting.objects.all()
+    queryset           = EggSetting.objects.prefetch_related('collection_ids')
     serializer_class   = EggSettingSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-setting_date', '-id')
@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class FinalPackagingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'final_packaging'
+    name = 'apps.final_packaging'
@@ -19,6 +19,18 @@ class PackagingBatch(models.Model):
     status           = models.CharField(max_length=20,
                          choices=[('pending','Pending'),('completed','Completed')])
     notes            = models.TextField(blank=True)
+    lineage          = models.ForeignKey(
+                         'batches.Batch',
+                         on_delete=models.SET_NULL,
+                         null=True, blank=True, editable=False,
+                         related_name='packaging_batches'
+                       )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'packaging_date'], name='packaging_batch_date_idx'),
+            models.Index(fields=['packaging_date', 'id'],       name='packaging_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.batch_id} — {self.status}"
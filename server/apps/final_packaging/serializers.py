@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import PackagingBatch
 
-class PackagingBatchSerializer(serializers.ModelSerializer):
+class PackagingBatchSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = PackagingBatch
         fields = '__all__'
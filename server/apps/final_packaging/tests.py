@@ -1,3 +1,25 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.assertions import QueryPlanAssertionsMixin
+from .models import PackagingBatch
+
+
+class PackagingBatchQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = PackagingBatch.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'packaging_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = PackagingBatch.objects.filter(batch_id='B-001').order_by('packaging_date')
+        self.assertIndexSearch(qs, 'packaging_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = PackagingBatch.objects.filter(packaging_date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = PackagingBatch.objects.order_by('-packaging_date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
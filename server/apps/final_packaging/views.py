@@ -1,12 +1,15 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
 from .models       import PackagingBatch
 from .serializers  import PackagingBatchSerializer
 
-class PackagingBatchViewSet(viewsets.ModelViewSet):
+class PackagingBatchViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """
     List, create, retrieve, update, and destroy PackagingBatch entries.
     """
     queryset           = PackagingBatch.objects.all()
     serializer_class   = PackagingBatchSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-packaging_date', '-id')
@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class HatchingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'hatching'
+    name = 'apps.hatching'
@@ -13,6 +13,18 @@ class HatchingRecord(models.Model):
     dead_chicks     = models.PositiveIntegerField()
     status          = models.CharField(max_length=20)
     notes           = models.TextField(blank=True)
+    lineage         = models.ForeignKey(
+                        'batches.Batch',
+                        on_delete=models.SET_NULL,
+                        null=True, blank=True, editable=False,
+                        related_name='hatchings'
+                      )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'hatch_date'], name='hatching_batch_date_idx'),
+            models.Index(fields=['hatch_date', 'id'],       name='hatching_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.batch_id} ({self.status})"
@@ -1,9 +1,10 @@
 # apps/hatching/serializers.py
 
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import HatchingRecord
 
-class HatchingRecordSerializer(serializers.ModelSerializer):
+class HatchingRecordSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = HatchingRecord
         fields = '__all__'
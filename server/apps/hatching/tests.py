@@ -1,3 +1,25 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.assertions import QueryPlanAssertionsMixin
+from .models import HatchingRecord
+
+
+class HatchingRecordQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = HatchingRecord.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'hatching_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = HatchingRecord.objects.filter(batch_id='B-001').order_by('hatch_date')
+        self.assertIndexSearch(qs, 'hatching_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = HatchingRecord.objects.filter(hatch_date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = HatchingRecord.objects.order_by('-hatch_date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
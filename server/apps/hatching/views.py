@@ -2,13 +2,18 @@
 
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.exports import ExportMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
 from .models       import HatchingRecord
 from .serializers  import HatchingRecordSerializer
 
-class HatchingRecordViewSet(viewsets.ModelViewSet):
+class HatchingRecordViewSet(ExportMixin, ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """
     CRUD API for all HatchingRecord instances.
     """
     queryset           = HatchingRecord.objects.all()
     serializer_class   = HatchingRecordSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-hatch_date', '-id')
+    export_date_field  = 'hatch_date'
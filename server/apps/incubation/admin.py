@@ -11,5 +11,6 @@ class IncubatorAdmin(admin.ModelAdmin):
 @admin.register(IncubationBatch)
 class IncubationBatchAdmin(admin.ModelAdmin):
     list_display  = ('batch_id', 'incubator', 'start_date', 'expected_hatch_date', 'status')
+    list_select_related = ('incubator',)
     list_filter   = ('incubator', 'status')
     search_fields = ('batch_id', 'breed')
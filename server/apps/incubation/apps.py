@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class IncubationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'incubation'
+    name = 'apps.incubation'
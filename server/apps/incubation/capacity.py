@@ -0,0 +1,144 @@
+# apps/incubation/capacity.py
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db import connections
+from django.db.models import F
+
+from apps.changes.versions import current
+from .models import IncubationBatch, Incubator
+
+# A batch occupies its incubator from start_date up to, not including,
+# expected_hatch_date: the day it hatches the space is free for the next
+# setting. Windows asked about follow the same convention.
+
+
+class OccupancyIndex:
+    """
+    One incubator's egg count over time as a step function: the dates
+    where it changes, the count from each date to the next, and a sparse
+    table over those counts. The peak over any window is two bisections
+    and one table lookup.
+    """
+
+    def __init__(self, intervals):
+        deltas = defaultdict(int)
+        for start, end, quantity in intervals:
+            if start < end and quantity:
+                deltas[start] += quantity
+                deltas[end]   -= quantity
+
+        self.dates, self.levels = [], []
+        level = 0
+        for day in sorted(deltas):
+            if deltas[day]:
+                level += deltas[day]
+                self.dates.append(day)
+                self.levels.append(level)
+
+        # table[k][i] = max(levels[i:i + 2**k])
+        self.table = [self.levels]
+        width = 1
+        while 2 * width <= len(self.levels):
+            row = self.table[-1]
+            self.table.append([max(row[i], row[i + width]) for i in range(len(row) - width)])
+            width *= 2
+
+    def peak(self, start, end):
+        """Most eggs in the incubator on any day of [start, end)."""
+        if start >= end:
+            return 0
+        lo = bisect_right(self.dates, start) - 1    # the step ``start`` falls in
+        hi = bisect_left(self.dates, end) - 1       # the last step beginning before ``end``
+        if hi < 0:
+            return 0
+        lo = max(lo, 0)     # before the first date the incubator is empty
+        k  = (hi - lo + 1).bit_length() - 1
+        return max(self.table[k][lo], self.table[k][hi - (1 << k) + 1])
+
+
+@dataclass(frozen=True)
+class IncubatorLoad:
+    id:       int
+    name:     str
+    capacity: int
+    index:    OccupancyIndex
+
+    def peak(self, start, end):
+        return self.index.peak(start, end)
+
+
+def build():
+    """Every incubator's OccupancyIndex, ordered like the incubator list."""
+    intervals = defaultdict(list)
+    for incubator_id, *interval in (IncubationBatch.objects
+                                    .filter(expected_hatch_date__gt=F('start_date'))
+                                    .values_list('incubator_id', 'start_date', 'expected_hatch_date', 'quantity')
+                                    .iterator(chunk_size=2000)):
+        intervals[incubator_id].append(interval)
+    return [
+        IncubatorLoad(pk, name, capacity, OccupancyIndex(intervals[pk]))
+        for pk, name, capacity in Incubator.objects.order_by('name', 'id').values_list('id', 'name', 'capacity')
+    ]
+
+
+class CapacityIndex:
+    """
+    The OccupancyIndex of every incubator, per process, keyed to the
+    table versions of incubators and batches: a lookup costs one version
+    query, and any write to either table, from this process or another,
+    rebuilds it on the next lookup.
+
+    An index built inside a transaction is used but not kept; it may
+    include writes that are later rolled back.
+    """
+
+    def __init__(self):
+        self._versions = None
+        self._loads    = None
+        self._lock     = threading.Lock()
+        self.builds    = 0
+
+    def loads(self):
+        versions = current((Incubator, IncubationBatch))[0]
+        if versions == self._versions:
+            return self._loads
+        with self._lock:
+            if versions == self._versions:
+                return self._loads
+            loads = build()
+            self.builds += 1
+            if not any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+                self._versions, self._loads = versions, loads
+            return loads
+
+    def clear(self):
+        with self._lock:
+            self._versions = self._loads = None
+
+
+capacity_index = CapacityIndex()
+
+
+def utilization(start, end):
+    """Peak occupancy of each incubator over [start, end)."""
+    rows = []
+    for load in capacity_index.loads():
+        peak = load.peak(start, end)
+        rows.append({
+            'id':          load.id,
+            'name':        load.name,
+            'capacity':    load.capacity,
+            'peak':        peak,
+            'free':        max(load.capacity - peak, 0),
+            'utilization': round(100 * peak / load.capacity, 1) if load.capacity else None,
+        })
+    return rows
+
+
+def availability(start, end, eggs):
+    """The incubators with room for ``eggs`` more on every day of [start, end)."""
+    return [row for row in utilization(start, end) if row['free'] >= eggs]
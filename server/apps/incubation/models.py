@@ -25,6 +25,19 @@ class IncubationBatch(models.Model):
     location           = models.CharField(max_length=100, blank=True)
     progress           = models.DecimalField(max_digits=5, decimal_places=2)
     status             = models.CharField(max_length=50)
+    lineage            = models.ForeignKey(
+                           'batches.Batch',
+                           on_delete=models.SET_NULL,
+                           null=True, blank=True, editable=False,
+                           related_name='incubations'
+                         )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'start_date'], name='incub_batch_date_idx'),
+            models.Index(fields=['start_date', 'id'],       name='incub_date_id_idx'),
+            models.Index(fields=['breed'],                  name='incub_breed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.batch_id} in {self.incubator.name}"
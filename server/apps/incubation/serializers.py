@@ -1,14 +1,15 @@
 # apps/incubation/serializers.py
 
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import Incubator, IncubationBatch
 
-class IncubatorSerializer(serializers.ModelSerializer):
+class IncubatorSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = Incubator
         fields = '__all__'
 
-class IncubationBatchSerializer(serializers.ModelSerializer):
+class IncubationBatchSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = IncubationBatch
         fields = '__all__'
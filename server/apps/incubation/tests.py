@@ -1,3 +1,135 @@
-from django.test import TestCase
+import random
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from apps.core.assertions import QueryPlanAssertionsMixin
+from .capacity import OccupancyIndex, capacity_index
+from .models import IncubationBatch, Incubator
+
+
+class IncubationBatchQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = IncubationBatch.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'incub_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = IncubationBatch.objects.filter(batch_id='B-001').order_by('start_date')
+        self.assertIndexSearch(qs, 'incub_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = IncubationBatch.objects.filter(start_date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = IncubationBatch.objects.order_by('-start_date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
+
+
+def make_batch(incubator, start, days, quantity):
+    return IncubationBatch.objects.create(
+        batch_id=f'B-{start:%m%d}', incubator=incubator, start_date=start,
+        expected_hatch_date=start + timedelta(days=days), quantity=quantity,
+        breed='Ross 308', progress=0, status='incubating',
+    )
+
+
+class OccupancyIndexTests(TestCase):
+
+    def test_peak_matches_a_day_by_day_count(self):
+        rng   = random.Random(25)
+        first = date(2025, 1, 1)
+        intervals = []
+        for _ in range(200):
+            start = first + timedelta(days=rng.randrange(120))
+            intervals.append((start, start + timedelta(days=rng.randrange(0, 25)), rng.randrange(0, 5000)))
+        index = OccupancyIndex(intervals)
+
+        def count(day):
+            return sum(q for s, e, q in intervals if s <= day < e)
+
+        daily = {first + timedelta(days=d): count(first + timedelta(days=d)) for d in range(-10, 160)}
+        for _ in range(500):
+            start = first + timedelta(days=rng.randrange(-10, 150))
+            end   = start + timedelta(days=rng.randrange(1, 10))
+            expected = max(daily[start + timedelta(days=d)] for d in range((end - start).days))
+            self.assertEqual(index.peak(start, end), expected, (start, end))
+
+    def test_empty(self):
+        self.assertEqual(OccupancyIndex([]).peak(date(2025, 1, 1), date(2025, 2, 1)), 0)
+
+
+class CapacityApiTests(TestCase):
+
+    def setUp(self):
+        capacity_index.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('planner', password='pw'))
+        self.small = Incubator.objects.create(name='Setter A', capacity=20000)
+        self.large = Incubator.objects.create(name='Setter B', capacity=60000)
+        make_batch(self.small, date(2025, 3, 1), 21, 15000)
+        make_batch(self.large, date(2025, 3, 1), 21, 30000)
+        make_batch(self.large, date(2025, 3, 10), 21, 25000)
+
+    def available(self, **params):
+        response = self.client.get('/api/incubators/availability/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [(row['name'], row['free']) for row in response.json()['results']]
+
+    def test_availability(self):
+        window = {'from': '2025-03-12', 'to': '2025-04-02'}
+        self.assertEqual(self.available(eggs=5000, **window), [('Setter A', 5000), ('Setter B', 5000)])
+        self.assertEqual(self.available(eggs=12000, **window), [])
+        # The first settings hatch on 22 March and the space is free that day.
+        self.assertEqual(self.available(eggs=12000, **{'from': '2025-03-22', 'to': '2025-04-12'}),
+                         [('Setter A', 20000), ('Setter B', 35000)])
+
+    def test_utilization(self):
+        response = self.client.get('/api/incubators/utilization/', {'from': '2025-03-05', 'to': '2025-03-12'})
+        rows = {row['name']: row for row in response.json()['results']}
+        self.assertEqual((rows['Setter B']['peak'], rows['Setter B']['utilization']), (55000, 91.7))
+        self.assertEqual((rows['Setter A']['peak'], rows['Setter A']['free']), (15000, 5000))
+
+    def test_writes_are_seen(self):
+        window = {'from': '2025-03-12', 'to': '2025-04-02', 'eggs': 5000}
+        self.assertEqual(len(self.available(**window)), 2)
+        make_batch(self.small, date(2025, 3, 20), 21, 1000)
+        self.assertEqual(self.available(**window), [('Setter B', 5000)])
+        self.small.capacity = 30000
+        self.small.save()
+        self.assertEqual(self.available(**window), [('Setter A', 14000), ('Setter B', 5000)])
+
+    def test_defaults_to_one_incubation_from_today(self):
+        body = self.client.get('/api/incubators/availability/').json()
+        self.assertEqual(date.fromisoformat(body['to']) - date.fromisoformat(body['from']), timedelta(days=21))
+        self.assertEqual(body['eggs'], 0)
+        self.assertEqual(len(body['results']), 2)
+
+    def test_bad_parameters_are_a_400(self):
+        for params in ({'from': '2025-03-32'}, {'from': '2025-03-10', 'to': '2025-03-10'}, {'eggs': '-5'}):
+            response = self.client.get('/api/incubators/availability/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(len(response.json()), 1)
+
+
+class CapacityIndexCacheTests(TransactionTestCase):
+    """Indexes built inside a transaction are not kept, so these run outside one."""
+
+    def setUp(self):
+        capacity_index.clear()
+        self.incubator = Incubator.objects.create(name='Setter A', capacity=20000)
+        make_batch(self.incubator, date(2025, 3, 1), 21, 15000)
+
+    def test_lookups_reuse_the_index_until_a_write(self):
+        window = (date(2025, 3, 1), date(2025, 3, 22))
+        capacity_index.loads()
+        with self.assertNumQueries(1):          # table versions
+            self.assertEqual(capacity_index.loads()[0].peak(*window), 15000)
+        builds = capacity_index.builds
+
+        make_batch(self.incubator, date(2025, 3, 5), 21, 2000)
+        self.assertEqual(capacity_index.loads()[0].peak(*window), 17000)
+        self.assertEqual(capacity_index.builds, builds + 1)
@@ -1,16 +1,57 @@
 # apps/incubation/views.py
 
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.exports import parse_day
+from apps.core.mixins import BulkCreateMixin, FastListMixin
+from apps.lockdown.models import HATCH_DAY
+from .capacity import availability, utilization
 from .models import Incubator, IncubationBatch
 from .serializers import IncubatorSerializer, IncubationBatchSerializer
 
-class IncubatorViewSet(viewsets.ModelViewSet):
+class IncubatorViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     queryset           = Incubator.objects.all()
     serializer_class   = IncubatorSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('name', 'id')
+
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """
+        GET ?from=&to=&eggs= -- the incubators with room for ``eggs`` more
+        on every day from ``from`` up to ``to`` (the day they would hatch).
+        """
+        start, end = self._window(request.query_params)
+        eggs = request.query_params.get('eggs', '0')
+        if not eggs.isdigit():
+            raise ValidationError({'eggs': 'A whole number of eggs.'})
+        return Response({'from': start, 'to': end, 'eggs': int(eggs),
+                         'results': availability(start, end, int(eggs))})
+
+    @action(detail=False, methods=['get'])
+    def utilization(self, request):
+        """GET ?from=&to= -- each incubator's peak occupancy over the window."""
+        start, end = self._window(request.query_params)
+        return Response({'from': start, 'to': end, 'results': utilization(start, end)})
+
+    @staticmethod
+    def _window(params):
+        # Defaults to a setting made today: one incubation period.
+        start = parse_day(params, 'from') or timezone.localdate()
+        end   = parse_day(params, 'to') or start + timedelta(days=HATCH_DAY)
+        if start >= end:
+            raise ValidationError({'from': 'Must be before "to".'})
+        return start, end
 
-class IncubationBatchViewSet(viewsets.ModelViewSet):
-    queryset           = IncubationBatch.objects.all()
+class IncubationBatchViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
+    queryset           = IncubationBatch.objects.select_related('incubator')   # __str__
     serializer_class   = IncubationBatchSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-start_date', '-id')
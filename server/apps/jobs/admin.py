@@ -0,0 +1,12 @@
+# apps/jobs/admin.py
+
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display    = ('id', 'kind', 'status', 'created_by', 'created_at', 'finished_at', 'attempts')
+    list_select_related = ('created_by',)
+    list_filter     = ('status', 'kind')
+    readonly_fields = ('started_at', 'finished_at', 'heartbeat_at', 'worker', 'attempts', 'error',
+                       'result_path', 'result_name', 'result_content_type', 'result_size')
@@ -0,0 +1,40 @@
+# apps/jobs/management/commands/run_jobs.py
+
+import signal
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.worker import POOLS, Worker
+
+
+class Command(BaseCommand):
+    help = ("Run queued background jobs (exports, reports, rebuilds) on a thread or process pool. "
+            "Start as many workers as you like, on one host or several; they share the queue "
+            "through the database. SIGTERM or Ctrl-C stops claiming jobs and waits for the running ones.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help="Jobs run at once.")
+        parser.add_argument('--pool', choices=POOLS, default='thread',
+                            help="thread (jobs waiting on the database) or process (CPU-bound jobs).")
+        parser.add_argument('--poll', type=float, default=1.0, help="Seconds between polls of an idle queue.")
+        parser.add_argument('--stale-after', type=float, default=300.0,
+                            help="Requeue running jobs whose worker has not heartbeaten for this many seconds.")
+        parser.add_argument('--max-attempts', type=int, default=3, help="Tries before a stale job is failed.")
+        parser.add_argument('--purge-days', type=float, default=7.0,
+                            help="Delete finished jobs and their results after this many days (0 keeps them).")
+        parser.add_argument('--once', action='store_true', help="Exit when the queue is empty.")
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            concurrency=options['concurrency'], pool=options['pool'], poll_interval=options['poll'],
+            stale_after=options['stale_after'], max_attempts=options['max_attempts'],
+            purge_after=options['purge_days'] * 86400 if options['purge_days'] else None,
+            log=self.stdout.write,
+        )
+        signal.signal(signal.SIGTERM, worker.stop)
+        self.stdout.write(f"Worker {worker.name}: up to {options['concurrency']} jobs at once on a {options['pool']} pool")
+        try:
+            worker.run(once=options['once'])
+        except KeyboardInterrupt:
+            worker.stop()
+        self.stdout.write("Worker stopped.")
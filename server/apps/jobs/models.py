@@ -0,0 +1,56 @@
+# apps/jobs/models.py
+
+import os
+
+from django.conf import settings
+from django.db import models
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+class Job(models.Model):
+    """
+    One unit of background work: a task from tasks.TASKS with its
+    parameters, run by ``manage.py run_jobs``. The table is the queue;
+    see worker.py for how jobs are claimed.
+    """
+    QUEUED    = 'queued'
+    RUNNING   = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED    = 'failed'
+    CANCELLED = 'cancelled'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (SUCCEEDED, 'Succeeded'),
+                      (FAILED, 'Failed'), (CANCELLED, 'Cancelled')]
+
+    kind         = models.CharField(max_length=50)                  # key of tasks.TASKS
+    params       = models.JSONField(default=dict, blank=True)
+    status       = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    created_by   = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
+    created_at   = models.DateTimeField(default=timezone.now)
+    started_at   = models.DateTimeField(null=True, blank=True)
+    finished_at  = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)     # refreshed while running
+    worker       = models.CharField(max_length=100, blank=True)     # host:pid of the claiming worker
+    attempts     = models.PositiveIntegerField(default=0)
+    error        = models.TextField(blank=True)
+
+    # The result file, under JOBS_RESULT_ROOT
+    result_path         = models.CharField(max_length=255, blank=True)
+    result_name         = models.CharField(max_length=255, blank=True)      # download filename
+    result_content_type = models.CharField(max_length=100, blank=True)
+    result_size         = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Claiming the oldest queued job; finding stale running ones.
+            models.Index(fields=['status', 'id'], name='job_status_id_idx'),
+            # A user's jobs, newest first.
+            models.Index(fields=['created_by', 'id'], name='job_created_by_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def result_file(self):
+        """Absolute path of the result file, or None."""
+        return os.path.join(settings.JOBS_RESULT_ROOT, self.result_path) if self.result_path else None
@@ -0,0 +1,29 @@
+# apps/jobs/serializers.py
+
+from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
+from .models import Job
+from .tasks import TASKS
+
+class JobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """A job as its submitter sees it; only ``kind`` and ``params`` are writable."""
+    class Meta:
+        model  = Job
+        fields = ('id', 'kind', 'params', 'status', 'created_by', 'created_at', 'started_at',
+                  'finished_at', 'attempts', 'error', 'result_name', 'result_content_type', 'result_size')
+        read_only_fields = [name for name in fields if name not in ('kind', 'params')]
+
+    def validate(self, attrs):
+        task = TASKS.get(attrs['kind'])
+        if task is None:
+            raise serializers.ValidationError({'kind': f'One of: {", ".join(TASKS)}.'})
+        user = self.context['request'].user
+        if task.staff_only and not user.is_staff:
+            raise serializers.ValidationError({'kind': 'Only staff can run this job.'})
+        if not isinstance(attrs.get('params', {}), dict):
+            raise serializers.ValidationError({'params': 'An object.'})
+        try:
+            attrs['params'] = task.clean(attrs.get('params', {}))
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({'params': exc.detail})
+        return attrs
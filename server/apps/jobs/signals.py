@@ -0,0 +1,17 @@
+# apps/jobs/signals.py
+
+import os
+
+from django.db.models.signals import post_delete
+
+from .models import Job
+
+
+def remove_result(sender, instance, **kwargs):
+    path = instance.result_file
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def connect():
+    post_delete.connect(remove_result, sender=Job, dispatch_uid='jobs.result_file')
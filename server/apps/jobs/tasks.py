@@ -0,0 +1,125 @@
+# apps/jobs/tasks.py
+
+from dataclasses import dataclass
+
+from django.core.management import call_command
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from apps.alerts.views import AlertViewSet
+from apps.core.exports import ExportMixin, export_queryset, export_stream, parse_day
+from apps.core.routers import replica_reads
+from apps.hatching.views import HatchingRecordViewSet
+from apps.reports_analytics.views import (
+    DashboardReportView,
+    HatchRateAnalyticsView,
+    HatchRateReportView,
+    ProductionSummaryReportView,
+    SalesSummaryReportView,
+)
+from apps.sales.views import SaleRecordViewSet
+
+# What a job can run. Each task writes its result to ``out`` (a text
+# file) and returns the download's filename and content type; ``clean``
+# validates the parameters at submission, so bad input is a 400 rather
+# than a failed job.
+
+
+@dataclass(frozen=True)
+class Task:
+    run:        object      # (params, out) -> (filename, content type)
+    clean:      object      # params -> cleaned params, or ValidationError
+    staff_only: bool = False
+
+
+TASKS = {}
+
+
+def task(name, clean, staff_only=False):
+    def register(run):
+        TASKS[name] = Task(run, clean, staff_only)
+        return run
+    return register
+
+
+def _choice(params, name, choices, default=None):
+    value = params.get(name, default)
+    if value not in choices:
+        raise ValidationError({name: f'One of: {", ".join(choices)}.'})
+    return value
+
+
+# -- exports -------------------------------------------------------------
+
+# Router basename -> viewset; the same rows as its /export/ action.
+EXPORTS = {
+    'sale':     SaleRecordViewSet,
+    'hatching': HatchingRecordViewSet,
+    'alert':    AlertViewSet,
+}
+
+
+def clean_export(params):
+    cleaned = {
+        'resource': _choice(params, 'resource', EXPORTS),
+        'output':   _choice(params, 'output', ExportMixin.export_formats, default='csv'),
+    }
+    for name in ('from', 'to'):
+        if parse_day(params, name):
+            cleaned[name] = params[name]
+    return cleaned
+
+
+@task('export', clean_export)
+def run_export(params, out):
+    viewset  = EXPORTS[params['resource']]
+    queryset = export_queryset(viewset.queryset.all(), viewset.export_date_field,
+                               parse_day(params, 'from'), parse_day(params, 'to'))
+    for chunk in export_stream(queryset, params['output'], viewset.export_chunk_size):
+        out.write(chunk)
+    return f"{params['resource']}-export.{params['output']}", viewset.export_formats[params['output']]
+
+
+# -- reports -------------------------------------------------------------
+
+REPORTS = {
+    'hatch-rate':           HatchRateReportView,
+    'hatch-rate-analytics': HatchRateAnalyticsView,
+    'sales':                SalesSummaryReportView,
+    'production':           ProductionSummaryReportView,
+    'dashboard':            DashboardReportView,
+}
+
+
+def clean_report(params):
+    report = _choice(params, 'report', REPORTS)
+    query  = params.get('params', {})
+    if not isinstance(query, dict) or not all(isinstance(v, str) for v in query.values()):
+        raise ValidationError({'params': 'An object of query parameters, as strings.'})
+    view = REPORTS[report]()
+    if not view.aggregates:
+        view.report_queryset(query)     # lazy: validates without querying
+    return {'report': report, 'params': query}
+
+
+@task('report', clean_report)
+def run_report(params, out):
+    with replica_reads():
+        data = REPORTS[params['report']]().report_data(params['params'])
+    out.write(JSONRenderer().render(data).decode())
+    return f"{params['report']}-report.json", 'application/json'
+
+
+# -- maintenance commands ------------------------------------------------
+
+COMMANDS = ('rebuild_rollups', 'rebuild_ledger', 'rebuild_lineage', 'refresh_batch_schedule', 'prune_changes')
+
+
+def clean_command(params):
+    return {'command': _choice(params, 'command', COMMANDS)}
+
+
+@task('command', clean_command, staff_only=True)
+def run_management_command(params, out):
+    call_command(params['command'], stdout=out, no_color=True)
+    return f"{params['command']}.txt", 'text/plain; charset=utf-8'
@@ -0,0 +1,210 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.sales.models import SaleRecord
+from .models import Job
+from .worker import LOST, claim, execute, requeue_stale
+
+
+def make_sale(day, amount):
+    return SaleRecord.objects.create(
+        batch_id='B-1', date=date(2025, 3, day), customer='Acme', product_type='chicks',
+        quantity=10, unit_price=Decimal('1.00'), total_amount=Decimal(amount),
+        paid=Decimal(amount), balance=Decimal('0'), payment_method='Cash', status='completed',
+    )
+
+
+class ResultRootMixin:
+
+    def setUp(self):
+        super().setUp()
+        self.result_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.result_root, ignore_errors=True)
+        override = override_settings(JOBS_RESULT_ROOT=self.result_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class JobApiTests(ResultRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        caches['reports'].clear()       # report generations only move on commit
+        self.user   = User.objects.create_user('clerk', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        make_sale(1, '100.00')
+        make_sale(2, '50.00')
+
+    def submit(self, kind, params, expect=202):
+        response = self.client.post('/api/jobs/', {'kind': kind, 'params': params}, format='json')
+        self.assertEqual(response.status_code, expect, response.content)
+        return response
+
+    def run_next(self):
+        pk = claim('test')
+        self.assertIsNotNone(pk)
+        return execute(pk, 'test')
+
+    def download(self, job_id):
+        response = self.client.get(f'/api/jobs/{job_id}/download/')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_report_job_matches_the_report_endpoint(self):
+        response = self.submit('report', {'report': 'sales'})
+        job = response.json()
+        self.assertEqual(job['status'], Job.QUEUED)
+        self.assertTrue(response['Location'].endswith(f"/api/jobs/{job['id']}/"))
+
+        self.assertEqual(self.run_next(), Job.SUCCEEDED)
+        job = self.client.get(f"/api/jobs/{job['id']}/").json()
+        self.assertEqual(job['status'], Job.SUCCEEDED)
+        self.assertEqual(job['result_name'], 'sales-report.json')
+        self.assertEqual(json.loads(self.download(job['id'])), self.client.get('/api/reports/sales/').json())
+
+    def test_export_job_matches_the_export_endpoint(self):
+        job = self.submit('export', {'resource': 'sale', 'from': '2025-03-02'}).json()
+        self.run_next()
+        rows = list(csv.reader(io.StringIO(self.download(job['id']))))
+        self.assertEqual(len(rows), 2)          # header + the 2 March sale
+        expected = b''.join(self.client.get('/api/sales/export/', {'from': '2025-03-02'}).streaming_content)
+        self.assertEqual(self.download(job['id']), expected.decode())
+
+    def test_bad_submissions_are_a_400(self):
+        self.submit('mine-bitcoin', {}, expect=400)
+        for params in ({'resource': 'egg-collection'}, {'resource': 'sale', 'output': 'xlsx'},
+                       {'resource': 'sale', 'from': '2025-13-01'}):
+            self.assertIn('params', self.submit('export', params, expect=400).json())
+        response = self.submit('report', {'report': 'hatch-rate-analytics', 'params': {'group_by': 'colour'}},
+                               expect=400)
+        self.assertIn('group_by', response.json()['params'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_maintenance_commands_are_staff_only(self):
+        self.submit('command', {'command': 'rebuild_ledger'}, expect=400)
+        self.user.is_staff = True
+        self.user.save()
+        self.submit('command', {'command': 'migrate'}, expect=400)
+        job = self.submit('command', {'command': 'rebuild_ledger'}).json()
+        self.run_next()
+        self.assertIn('ledger', self.download(job['id']).lower())
+
+    def test_jobs_are_private(self):
+        job = self.submit('report', {'report': 'dashboard'}).json()
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user('other', password='pw'))
+        self.assertEqual(other.get(f"/api/jobs/{job['id']}/").status_code, 404)
+        self.assertEqual(other.get('/api/jobs/').json()['results'], [])
+
+    def test_download_waits_for_success(self):
+        job = self.submit('report', {'report': 'dashboard'}).json()
+        self.assertEqual(self.client.get(f"/api/jobs/{job['id']}/download/").status_code, 409)
+
+    def test_unchanged_job_polls_are_304(self):
+        job  = self.submit('report', {'report': 'dashboard'}).json()
+        url  = f"/api/jobs/{job['id']}/"
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.run_next()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], Job.SUCCEEDED)
+
+    def test_cancel_only_queued_jobs(self):
+        first  = self.submit('report', {'report': 'dashboard'}).json()
+        second = self.submit('report', {'report': 'sales'}).json()
+        response = self.client.post(f"/api/jobs/{first['id']}/cancel/")
+        self.assertEqual(response.json()['status'], Job.CANCELLED)
+        self.assertEqual(claim('test'), second['id'])
+        self.assertEqual(self.client.post(f"/api/jobs/{second['id']}/cancel/").status_code, 409)
+        self.assertIsNone(claim('test'))
+
+    def test_failure_is_recorded(self):
+        job = Job.objects.create(kind='retired-task', created_by=self.user)
+        with self.assertLogs('apps.jobs', 'ERROR'):
+            self.assertEqual(self.run_next(), Job.FAILED)
+        job.refresh_from_db()
+        self.assertIn('retired-task', job.error)
+        self.assertEqual(job.result_path, '')
+        self.assertEqual(os.listdir(self.result_root), [])      # no partial file left
+
+    def test_deleting_a_job_removes_its_result(self):
+        self.submit('report', {'report': 'dashboard'})
+        self.run_next()
+        job = Job.objects.get()
+        self.assertTrue(os.path.exists(job.result_file))
+        job.delete()
+        self.assertFalse(os.path.exists(job.result_file))
+
+
+class ClaimTests(ResultRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('clerk', password='pw')
+
+    def test_a_job_is_claimed_once(self):
+        job = Job.objects.create(kind='report', created_by=self.user)
+        self.assertEqual(claim('a'), job.pk)
+        self.assertIsNone(claim('b'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker, job.attempts), (Job.RUNNING, 'a', 1))
+
+    def test_stale_jobs_are_requeued_then_failed(self):
+        job = Job.objects.create(kind='report', created_by=self.user)
+        for attempt in (1, 2):
+            self.assertEqual(claim('lost'), job.pk)
+            Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=10))
+            self.assertEqual(requeue_stale(stale_after=300, max_attempts=2), 1)
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.QUEUED if attempt == 1 else Job.FAILED)
+
+    def test_a_requeued_job_is_not_finished_by_its_old_worker(self):
+        job = Job.objects.create(kind='report', params={'report': 'dashboard', 'params': {}},
+                                 created_by=self.user)
+        claim('lost')
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=10))
+        requeue_stale(stale_after=300, max_attempts=3)
+        claim('new')
+        with self.assertLogs('apps.jobs', 'WARNING'):
+            self.assertEqual(execute(job.pk, 'lost'), LOST)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), (Job.RUNNING, 'new'))
+        self.assertEqual(os.listdir(self.result_root), [])
+
+
+class RunJobsCommandTests(ResultRootMixin, TransactionTestCase):
+    """
+    Thread-pool workers use their own connections, outside any TestCase
+    transaction. The in-memory test database fails overlapping writers
+    at once instead of waiting on them, so one job runs at a time and
+    the poll outlasts it.
+    """
+
+    def test_drains_the_queue(self):
+        user = User.objects.create_user('clerk', password='pw')
+        make_sale(1, '100.00')
+        for report in ('hatch-rate', 'sales', 'production', 'dashboard'):
+            Job.objects.create(kind='report', params={'report': report, 'params': {}}, created_by=user)
+
+        call_command('run_jobs', once=True, concurrency=1, poll=30, stdout=StringIO())
+
+        self.assertEqual(set(Job.objects.values_list('status', flat=True)), {Job.SUCCEEDED})
+        self.assertEqual(len(set(Job.objects.values_list('worker', flat=True))), 1)
+        for job in Job.objects.all():
+            self.assertTrue(os.path.exists(job.result_file))
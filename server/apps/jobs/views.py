@@ -0,0 +1,65 @@
+# apps/jobs/views.py
+
+from django.http import FileResponse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.mixins import FastListMixin
+from apps.core.signals import queryset_updated
+from .models      import Job
+from .serializers import JobSerializer
+
+class JobViewSet(ConditionalGetMixin, FastListMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                 mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Background jobs: POST ``{"kind": ..., "params": {...}}`` queues one
+    (202) for ``manage.py run_jobs``; poll the job until its status is
+    succeeded or failed, then GET ``download/``. Polls of an unchanged
+    job are answered 304 from the table version.
+
+    Every user only sees their own jobs.
+    """
+    queryset           = Job.objects.all()
+    serializer_class   = JobSerializer
+    permission_classes = [IsAuthenticated]
+    ordering           = ('-id',)
+
+    def get_queryset(self):
+        return Job.objects.filter(created_by=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        response['Location'] = reverse('job-detail', args=[response.data['id']], request=request)
+        return response
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != Job.SUCCEEDED:
+            return Response({'detail': f'The job is {job.status}; there is nothing to download.'},
+                            status=status.HTTP_409_CONFLICT)
+        try:
+            result = open(job.result_file, 'rb')
+        except FileNotFoundError:
+            return Response({'detail': 'The result has been removed.'}, status=status.HTTP_410_GONE)
+        return FileResponse(result, as_attachment=True, filename=job.result_name,
+                            content_type=job.result_content_type)
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Cancel a job that has not started yet."""
+        job = self.get_object()
+        if not Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(status=Job.CANCELLED):
+            job.refresh_from_db(fields=['status'])
+            return Response({'detail': f'The job is {job.status}; only queued jobs can be cancelled.'},
+                            status=status.HTTP_409_CONFLICT)
+        queryset_updated.send(sender=Job, pks=[job.pk], scope=request.user.pk)
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
@@ -0,0 +1,233 @@
+# apps/jobs/worker.py
+
+import logging
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core.signals import queryset_updated
+from .models import Job
+from .tasks import TASKS
+
+logger = logging.getLogger('apps.jobs')
+
+POOLS = ('thread', 'process')
+
+# execute()'s outcome when the job was requeued and claimed again while
+# it ran: nothing was recorded, the new claim's run counts.
+LOST = 'lost'
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _transition(queryset, **values):
+    """UPDATE the jobs in ``queryset``; the change log and ETags hear of it."""
+    pks = list(queryset.values_list('pk', flat=True))
+    if pks and Job.objects.filter(pk__in=pks).update(**values):
+        queryset_updated.send(sender=Job, pks=pks)
+    return len(pks)
+
+
+def claim(worker):
+    """
+    Move the oldest queued job to running for ``worker``; its id, or None
+    when nothing is queued.
+
+    The conditional UPDATE is the lock: of several workers that picked
+    the same id, exactly one changes the row, and the others move on to
+    the next. No SELECT ... FOR UPDATE, so SQLite works too.
+    """
+    while True:
+        pk = Job.objects.filter(status=Job.QUEUED).order_by('id').values_list('pk', flat=True).first()
+        if pk is None:
+            return None
+        now = timezone.now()
+        if Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, worker=worker, started_at=now, heartbeat_at=now, attempts=F('attempts') + 1,
+        ):
+            queryset_updated.send(sender=Job, pks=[pk])
+            return pk
+
+
+def heartbeat(pks):
+    # heartbeat_at is not in the API, so no change is recorded.
+    if pks:
+        Job.objects.filter(pk__in=pks, status=Job.RUNNING).update(heartbeat_at=timezone.now())
+
+
+def requeue_stale(stale_after, max_attempts):
+    """
+    Running jobs whose worker stopped heartbeating ``stale_after``
+    seconds ago: queued again, or failed once they have been tried
+    ``max_attempts`` times.
+    """
+    now   = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=now - timedelta(seconds=stale_after))
+    return (
+        _transition(stale.filter(attempts__lt=max_attempts),
+                    status=Job.QUEUED, worker='', heartbeat_at=None)
+        + _transition(stale.filter(attempts__gte=max_attempts),
+                      status=Job.FAILED, finished_at=now, error='The worker running this job stopped responding.')
+    )
+
+
+def purge(older_than):
+    """Delete finished jobs (and their result files) ``older_than`` seconds old."""
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    return Job.objects.filter(finished_at__lt=cutoff).exclude(status=Job.RUNNING).delete()[0]
+
+
+def _finish(job, worker, **values):
+    # Only the claim that ran the job may finish it; a requeued job has
+    # moved on to another attempt.
+    updated = Job.objects.filter(pk=job.pk, status=Job.RUNNING, worker=worker, attempts=job.attempts).update(
+        finished_at=timezone.now(), **values,
+    )
+    if updated:
+        queryset_updated.send(sender=Job, pks=[job.pk])
+    return bool(updated)
+
+
+def execute(pk, worker):
+    """
+    Run one claimed job on this thread or process and record the outcome:
+    the result file on success, the error on failure. Returns the status
+    recorded, or LOST if the claim was lost meanwhile.
+    """
+    close_old_connections()
+    try:
+        job  = Job.objects.get(pk=pk)
+        root = settings.JOBS_RESULT_ROOT
+        os.makedirs(root, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=root, prefix=f'job-{pk}-')
+        try:
+            with open(fd, 'w', encoding='utf-8', newline='') as out:
+                if job.kind not in TASKS:
+                    raise LookupError(f'No task named {job.kind!r}.')
+                filename, content_type = TASKS[job.kind].run(job.params, out)
+        except Exception as exc:
+            logger.exception('Job %s (%s) failed', pk, job.kind)
+            os.remove(path)
+            status   = Job.FAILED
+            finished = _finish(job, worker, status=status, error=f'{type(exc).__name__}: {exc}')
+        else:
+            status   = Job.SUCCEEDED
+            finished = _finish(job, worker, status=status, result_path=os.path.basename(path),
+                               result_name=filename, result_content_type=content_type,
+                               result_size=os.path.getsize(path))
+            if not finished:
+                os.remove(path)
+        if not finished:
+            logger.warning('Job %s (%s) was claimed again while %s ran it; its outcome was dropped',
+                           pk, job.kind, worker)
+            return LOST
+        return status
+    finally:
+        close_old_connections()
+
+
+def make_executor(pool, workers):
+    if pool == 'process':
+        # Spawned rather than forked: a fork would share the parent's
+        # open database connections.
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=django.setup)
+    return ThreadPoolExecutor(workers, thread_name_prefix='job')
+
+
+class Worker:
+    """
+    Polls the job table and runs up to ``concurrency`` jobs at a time on
+    a thread or process pool. Threads suit jobs that wait on the database
+    (exports, reports); processes suit CPU-bound ones.
+
+    Each poll also refreshes the heartbeat of the jobs it is running and
+    requeues jobs whose worker died (see requeue_stale), so several
+    workers, on one host or many, can share the queue.
+    """
+
+    def __init__(self, concurrency=2, pool='thread', poll_interval=1.0, stale_after=300,
+                 max_attempts=3, purge_after=None, name=None, log=None):
+        self.concurrency   = concurrency
+        self.pool          = pool
+        self.poll_interval = poll_interval
+        self.stale_after   = stale_after
+        self.max_attempts  = max_attempts
+        self.purge_after   = purge_after
+        self.name          = name or worker_name()
+        self.log           = log or (lambda message: None)
+        self.stopping      = False
+
+    def stop(self, *args):
+        """Claim nothing more; return once the running jobs finish."""
+        self.stopping = True
+
+    def run(self, once=False):
+        """Work until stop(), or with ``once`` until the queue is empty."""
+        executor   = make_executor(self.pool, self.concurrency)
+        running    = {}        # future -> job id
+        next_purge = 0.0
+        try:
+            while not self.stopping:
+                broken = False
+                for future in [f for f in running if f.done()]:
+                    broken |= self._collect(running.pop(future), future)
+                if broken:
+                    executor.shutdown(wait=False)
+                    executor = make_executor(self.pool, self.concurrency)
+
+                heartbeat(list(running.values()))
+                requeued = requeue_stale(self.stale_after, self.max_attempts)
+                if requeued:
+                    self.log(f'{requeued} stale job(s) requeued or failed')
+                if self.purge_after is not None and time.monotonic() >= next_purge:
+                    purged     = purge(self.purge_after)
+                    next_purge = time.monotonic() + 3600
+                    if purged:
+                        self.log(f'{purged} old job(s) purged')
+
+                while len(running) < self.concurrency:
+                    pk = claim(self.name)
+                    if pk is None:
+                        break
+                    self.log(f'job {pk} started')
+                    running[executor.submit(execute, pk, self.name)] = pk
+
+                if not running:
+                    if once:
+                        break
+                    time.sleep(self.poll_interval)
+                else:
+                    wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+        finally:
+            executor.shutdown(wait=True)
+            for future, pk in running.items():
+                self._collect(pk, future)
+            close_old_connections()
+
+    def _collect(self, pk, future):
+        """Log a finished job; True if the process pool broke and needs replacing."""
+        try:
+            self.log(f'job {pk} {future.result()}')
+            return False
+        except Exception as exc:
+            # The job never got to record its outcome (a crashed process,
+            # a lost database connection).
+            logger.exception('Job %s did not finish', pk)
+            _transition(Job.objects.filter(pk=pk, status=Job.RUNNING, worker=self.name),
+                        status=Job.FAILED, finished_at=timezone.now(), error=f'{type(exc).__name__}: {exc}')
+            self.log(f'job {pk} {Job.FAILED}')
+            return isinstance(exc, BrokenProcessPool)
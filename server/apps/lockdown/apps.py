@@ -3,4 +3,4 @@ from django.apps import AppConfig
 
 class LockdownConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'lockdown'
+    name = 'apps.lockdown'
@@ -2,6 +2,9 @@
 
 from django.db import models
 
+TRANSFER_DAY = 18   # eggs move to the hatcher from this day...
+HATCH_DAY    = 21   # ...until they hatch
+
 class LockdownBatch(models.Model):
     batch_id          = models.CharField(max_length=50)
     label             = models.CharField(max_length=100)
@@ -15,6 +18,21 @@ class LockdownBatch(models.Model):
     notification_sent = models.BooleanField(default=False)
     notes             = models.TextField(blank=True)
     day               = models.PositiveIntegerField()
+    transfer_due      = models.BooleanField(default=False)   # kept by refresh_batch_schedule
+    lineage           = models.ForeignKey(
+                          'batches.Batch',
+                          on_delete=models.SET_NULL,
+                          null=True, blank=True, editable=False,
+                          related_name='lockdowns'
+                        )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'lockdown_date'], name='lockdown_batch_date_idx'),
+            models.Index(fields=['lockdown_date', 'id'],       name='lockdown_date_id_idx'),
+            models.Index(fields=['lockdown_date', 'id'],       name='lockdown_due_idx',
+                         condition=models.Q(transfer_due=True)),
+        ]
 
     def __str__(self):
         return f"{self.batch_id} @ Day {self.day}"
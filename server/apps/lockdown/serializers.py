@@ -1,9 +1,10 @@
 # apps/lockdown/serializers.py
 
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import LockdownBatch
 
-class LockdownBatchSerializer(serializers.ModelSerializer):
+class LockdownBatchSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = LockdownBatch
         fields = '__all__'
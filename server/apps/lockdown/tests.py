@@ -1,3 +1,50 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.assertions import QueryPlanAssertionsMixin
+from .models import LockdownBatch
+
+
+class LockdownBatchQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = LockdownBatch.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'lockdown_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = LockdownBatch.objects.filter(batch_id='B-001').order_by('lockdown_date')
+        self.assertIndexSearch(qs, 'lockdown_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = LockdownBatch.objects.filter(lockdown_date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = LockdownBatch.objects.order_by('-lockdown_date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
+
+    def test_due_for_transfer(self):
+        qs = LockdownBatch.objects.filter(transfer_due=True).order_by('-lockdown_date', '-id')[:51]
+        # A walk of the partial index only touches flagged rows.
+        self.assertNoSequentialScan(qs)
+        self.assertIn('USING INDEX lockdown_due_idx', self.get_query_plan(qs))
+
+
+class DueForTransferTests(TestCase):
 
-# Create your tests here.
+    def test_lists_flagged_batches_only(self):
+        for i, due in enumerate((True, False, True)):
+            LockdownBatch.objects.create(
+                batch_id=f'B-{i}', label='L', start_date=date(2025, 1, 1) + timedelta(days=i),
+                lockdown_date=date(2025, 1, 19) + timedelta(days=i), quantity=280, incubator_id='1',
+                transferred_to='H1', humidity=Decimal('65'), temperature=Decimal('37.2'), day=18,
+                transfer_due=due,
+            )
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('qa', password='pw'))
+        response = client.get('/api/lockdown-batches/due-for-transfer/')
+        self.assertEqual([row['batch_id'] for row in response.data['results']], ['B-2', 'B-0'])
@@ -1,11 +1,14 @@
 # apps/lockdown/views.py
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
 from .models      import LockdownBatch
 from .serializers import LockdownBatchSerializer
 
-class LockdownBatchViewSet(viewsets.ModelViewSet):
+class LockdownBatchViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """
     Provides list, create, retrieve, update, and destroy actions
     for LockdownBatch instances.
@@ -13,3 +16,10 @@ class LockdownBatchViewSet(viewsets.ModelViewSet):
     queryset           = LockdownBatch.objects.all()
     serializer_class   = LockdownBatchSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-lockdown_date', '-id')
+
+    @action(detail=False, methods=['get'], url_path='due-for-transfer')
+    def due_for_transfer(self, request):
+        """Batches between day 18 and hatch, read off the partial transfer_due index."""
+        page = self.paginate_queryset(self.get_queryset().filter(transfer_due=True))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
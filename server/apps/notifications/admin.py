@@ -1,10 +1,18 @@
 # apps/notifications/admin.py
 
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationCounter
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
     list_display  = ('user', 'title', 'is_read', 'created_at')
+    list_select_related = ('user',)
     list_filter   = ('is_read', 'created_at')
     search_fields = ('user__username', 'title', 'message')
+
+
+@admin.register(NotificationCounter)
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display  = ('user', 'unread')
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
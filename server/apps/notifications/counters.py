@@ -0,0 +1,48 @@
+# apps/notifications/counters.py
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Notification, NotificationCounter
+
+
+def adjust(deltas):
+    """
+    Apply ``{user_id: +n/-n}`` unread deltas with one UPDATE per user.
+
+    Counters only exist once a user has asked for their count, so a
+    missing row is left alone here and built from a COUNT on first read.
+    """
+    for user_id, delta in deltas.items():
+        if delta:
+            NotificationCounter.objects.filter(user_id=user_id).update(unread=F('unread') + delta)
+
+
+def unread_deltas(rows, sign=1):
+    """``rows`` are ``(user_id, is_read)`` pairs; unread rows count ``sign``."""
+    deltas = Counter()
+    for user_id, is_read in rows:
+        if not is_read:
+            deltas[user_id] += sign
+    return deltas
+
+
+def recount(user_id):
+    """
+    Rebuild the user's counter from a COUNT, holding the counter row's
+    lock throughout: a concurrent adjust() waits and lands on top of the
+    recount instead of being overwritten by it.
+    """
+    with transaction.atomic():
+        counter, _ = NotificationCounter.objects.select_for_update().get_or_create(user_id=user_id)
+        counter.unread = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        counter.save(update_fields=['unread'])
+    return counter.unread
+
+
+def unread_count(user_id):
+    unread = (NotificationCounter.objects.filter(user_id=user_id)
+              .values_list('unread', flat=True).first())
+    return recount(user_id) if unread is None else unread
@@ -11,5 +11,23 @@ class Notification(models.Model):
     created_at  = models.DateTimeField(auto_now_add=True)
     updated_at  = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Unread filter and badge recounts.
+            models.Index(fields=['user', 'is_read', 'created_at'], name='notif_user_read_created_idx'),
+            # The inbox page: one user's notifications, newest first.
+            models.Index(fields=['user', 'created_at', 'id'], name='notif_user_created_idx'),
+        ]
+
     def __str__(self):
         return f"Notification for {self.user.username}: {self.title}"
+
+
+class NotificationCounter(models.Model):
+    """Unread total per user, kept in step with Notification writes."""
+    user        = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True,
+                                       related_name='notification_counter')
+    unread      = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
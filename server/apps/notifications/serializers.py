@@ -1,9 +1,11 @@
 # apps/notifications/serializers.py
 
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import Notification
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = Notification
         fields = '__all__'
+        read_only_fields = ('user',)      # always the requesting user; see the viewset
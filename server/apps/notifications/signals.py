@@ -0,0 +1,84 @@
+# apps/notifications/signals.py
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from apps.core.events import publish_on_commit
+from apps.core.signals import bulk_created, bulk_updated
+from apps.core.stream import notifications_channel
+
+from . import counters
+from .models import Notification
+from .serializers import NotificationSerializer
+
+
+def capture_old_state(sender, instance, raw=False, **kwargs):
+    """Remember whose unread total the row counted towards before the save."""
+    instance._unread_old = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._unread_old = (
+        sender.objects.filter(pk=instance.pk).values_list('user_id', 'is_read').first()
+    )
+
+
+def count_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old    = getattr(instance, '_unread_old', None)
+    deltas = counters.unread_deltas([(instance.user_id, instance.is_read)])
+    if old:
+        deltas.update(counters.unread_deltas([old], sign=-1))
+    counters.adjust(deltas)
+    instance._unread_old = None
+
+
+def count_deleted(sender, instance, **kwargs):
+    counters.adjust(counters.unread_deltas([(instance.user_id, instance.is_read)], sign=-1))
+
+
+def count_bulk_created(sender, instances, **kwargs):
+    counters.adjust(counters.unread_deltas((obj.user_id, obj.is_read) for obj in instances))
+
+
+def recount_bulk_updated(sender, instances, fields, **kwargs):
+    # bulk_update() gives no old values, so recount whoever was touched.
+    if {'user', 'user_id', 'is_read'} & set(fields):
+        for user_id in {obj.user_id for obj in instances}:
+            counters.recount(user_id)
+
+
+def push_saved(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        event = 'notification.created' if created else 'notification.changed'
+        publish_on_commit(notifications_channel(instance.user_id), event,
+                          NotificationSerializer(instance).data)
+
+
+def push_deleted(sender, instance, **kwargs):
+    publish_on_commit(notifications_channel(instance.user_id), 'notification.deleted', {'id': instance.pk})
+
+
+def push_bulk(event):
+    def handler(sender, instances, **kwargs):
+        for obj, data in zip(instances, NotificationSerializer(instances, many=True).data):
+            publish_on_commit(notifications_channel(obj.user_id), event, data)
+    return handler
+
+
+push_bulk_created = push_bulk('notification.created')
+push_bulk_updated = push_bulk('notification.changed')
+
+
+def connect():
+    uid = 'notifications.counters'
+    pre_save.connect(capture_old_state, sender=Notification, dispatch_uid=uid)
+    post_save.connect(count_saved, sender=Notification, dispatch_uid=uid)
+    post_delete.connect(count_deleted, sender=Notification, dispatch_uid=uid)
+    bulk_created.connect(count_bulk_created, sender=Notification, dispatch_uid=uid)
+    bulk_updated.connect(recount_bulk_updated, sender=Notification, dispatch_uid=uid)
+
+    uid = 'notifications.push'
+    post_save.connect(push_saved, sender=Notification, dispatch_uid=uid)
+    post_delete.connect(push_deleted, sender=Notification, dispatch_uid=uid)
+    bulk_created.connect(push_bulk_created, sender=Notification, dispatch_uid=uid)
+    bulk_updated.connect(push_bulk_updated, sender=Notification, dispatch_uid=uid)
@@ -1,3 +1,155 @@
+import asyncio
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.assertions import EventStreamAssertionsMixin, QueryPlanAssertionsMixin, parse_event
+from apps.core.events import get_broker
+from apps.core.stream import notifications_channel
+from .models import Notification, NotificationCounter
+from .serializers import NotificationSerializer
+
+
+class NotificationInboxTests(TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', password='pw')
+        self.bob   = User.objects.create_user('bob', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        for i in range(3):
+            Notification.objects.create(user=self.alice, title=f'alice {i}')
+        Notification.objects.create(user=self.bob, title='bob 0')
+
+    def unread(self):
+        return self.client.get('/api/notifications/unread-count/').data['unread']
+
+    def test_list_is_scoped_to_request_user(self):
+        response = self.client.get('/api/notifications/')
+        self.assertEqual([n['title'] for n in response.data['results']], ['alice 2', 'alice 1', 'alice 0'])
+        other = Notification.objects.get(user=self.bob)
+        self.assertEqual(self.client.get(f'/api/notifications/{other.pk}/').status_code, 404)
+
+    def test_unread_count_reads_the_counter(self):
+        self.assertEqual(self.unread(), 3)          # first read builds the counter
+        with self.assertNumQueries(1):
+            self.assertEqual(self.unread(), 3)
+
+    def test_counter_follows_writes(self):
+        self.unread()
+        first = Notification.objects.filter(user=self.alice).first()
+        first.is_read = True
+        first.save()
+        self.assertEqual(self.unread(), 2)
+        Notification.objects.filter(user=self.alice, is_read=False).first().delete()
+        self.assertEqual(self.unread(), 1)
+        self.client.post('/api/notifications/', [
+            {'user': self.alice.pk, 'title': 'bulk 1'},
+            {'user': self.alice.pk, 'title': 'bulk 2', 'is_read': True},
+        ], format='json')
+        self.assertEqual(self.unread(), 2)
+        first.user = self.alice
+        first.is_read = False
+        first.save()
+        self.assertEqual(self.unread(), 3)
+        self.assertEqual(NotificationCounter.objects.get(user=self.alice).unread,
+                         Notification.objects.filter(user=self.alice, is_read=False).count())
+
+    def test_mark_read_is_one_update(self):
+        self.unread()
+        ids = list(Notification.objects.filter(user=self.alice).values_list('pk', flat=True)[:2])
+        ids.append(Notification.objects.get(user=self.bob).pk)      # not ours: ignored
+        # savepoint, UPDATE notifications, UPDATE counter, table version
+        # bump, change log INSERT, release, read counter
+        with self.assertNumQueries(7):
+            response = self.client.post('/api/notifications/mark-read/', {'ids': ids}, format='json')
+        self.assertEqual(response.data, {'updated': 2, 'unread': 1})
+        self.assertFalse(Notification.objects.get(user=self.bob).is_read)
+
+    def test_notifications_are_created_for_the_requesting_user(self):
+        response = self.client.post('/api/notifications/', {'user': self.bob.pk, 'title': 'spoofed'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.client.post('/api/notifications/', [{'user': self.bob.pk, 'title': 'bulk spoofed'}], format='json')
+        self.assertEqual(set(Notification.objects.filter(title__contains='spoofed').values_list('user', flat=True)),
+                         {self.alice.pk})
+        mine = Notification.objects.filter(user=self.alice).first()
+        self.client.patch(f'/api/notifications/{mine.pk}/', {'user': self.bob.pk}, format='json')
+        mine.refresh_from_db()
+        self.assertEqual(mine.user, self.alice)
+
+    def test_mark_all_read(self):
+        response = self.client.post('/api/notifications/mark-all-read/')
+        self.assertEqual(response.data, {'updated': 3, 'unread': 0})
+        self.assertEqual(self.client.post('/api/notifications/mark-all-read/').data['updated'], 0)
+
+    def test_mark_read_requires_ids(self):
+        response = self.client.post('/api/notifications/mark-read/', {'ids': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class NotificationQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_unread_recount(self):
+        qs = Notification.objects.filter(user_id=1, is_read=False).values('pk')
+        self.assertIndexSearch(qs, 'notif_user_read_created_idx')
+
+    def test_inbox_page(self):
+        qs = Notification.objects.filter(user_id=1).order_by('-created_at', '-id')[:51]
+        self.assertIndexSearch(qs)
+
+
+class NotificationPushTests(EventStreamAssertionsMixin, TestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', password='pw')
+        self.bob   = User.objects.create_user('bob', password='pw')
+
+    def test_changes_reach_the_owners_channel_only(self):
+        alice_events = self.listen(notifications_channel(self.alice.pk))
+        bob_events   = self.listen(notifications_channel(self.bob.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            note = Notification.objects.create(user=self.alice, title='Lockdown due')
+        self.assertEqual(alice_events(), ('notification.created', NotificationSerializer(note).data))
+
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post('/api/notifications/mark-all-read/')
+        self.assertEqual(alice_events(), ('notification.read', {'ids': None, 'updated': 1, 'unread': 0}))
+        with self.assertRaises(TimeoutError):
+            bob_events(timeout=0.05)
+
+    def test_slow_consumer_gets_resync(self):
+        events = self.listen('alerts')
+        broker = get_broker()
+        for i in range(broker.queue_size + 5):
+            broker.publish('alerts', 'alert.changed', {'id': i})
+        self.assertEqual(events(), ('resync', {}))
+        broker.publish('alerts', 'alert.changed', {'id': 'next'})
+        self.assertEqual(events(), ('alert.changed', {'id': 'next'}))
+
+
+class EventStreamViewTests(TestCase):
+
+    def setUp(self):
+        self.user  = User.objects.create_user('alice', password='pw')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    async def test_requires_a_valid_token(self):
+        response = await self.async_client.get('/api/stream/')
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api/stream/?token=nope')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_streams_published_events(self):
+        response = await self.async_client.get('/api/stream/', headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        frames = aiter(response.streaming_content)
+        self.assertEqual(await anext(frames), b'retry: 1000\n\n')
 
-# Create your tests here.
+        get_broker().publish(notifications_channel(self.user.pk), 'notification.created', {'id': 1})
+        self.assertEqual(parse_event(await asyncio.wait_for(anext(frames), 1)),
+                         ('notification.created', {'id': 1}))
+        await frames.aclose()
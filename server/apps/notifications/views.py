@@ -1,14 +1,73 @@
 # apps/notifications/views.py
 
-from rest_framework import viewsets
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.events import publish_on_commit
+from apps.core.mixins import BulkCreateMixin, FastListMixin
+from apps.core.signals import queryset_updated
+from apps.core.stream import notifications_channel
+from . import counters
 from .models       import Notification
 from .serializers  import NotificationSerializer
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """
     CRUD API for Notification instances tied to authenticated users.
+
+    Every user only sees their own inbox. ``unread-count`` reads a counter
+    maintained on write, and the mark-read actions are one UPDATE each.
     """
     queryset           = Notification.objects.all()
     serializer_class   = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-created_at', '-id')
+
+    def get_queryset(self):
+        return Notification.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def perform_bulk_create(self, serializer):
+        for attrs in serializer.validated_data:
+            attrs['user'] = self.request.user
+        return super().perform_bulk_create(serializer)
+
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        return Response({'unread': counters.unread_count(request.user.pk)})
+
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=10000)
+        ids = ids.run_validation(request.data.get('ids'))
+        return self._mark_read(request, self.get_queryset().filter(pk__in=ids), ids)
+
+    @action(detail=False, methods=['post'], url_path='mark-all-read')
+    def mark_all_read(self, request):
+        return self._mark_read(request, self.get_queryset(), None)
+
+    def _mark_read(self, request, queryset, ids):
+        with transaction.atomic():
+            # However many rows: one UPDATE. .update() skips auto_now, so
+            # updated_at is stamped by hand.
+            updated = queryset.filter(is_read=False).update(is_read=True, updated_at=timezone.now())
+            # The change rows name the requested ids rather than re-reading
+            # which ones were unread; ids outside the inbox only ever reach
+            # this user's feed, as deletes of rows it never had. Without
+            # ids, one change row tells the user's feeds to reload.
+            pks = None if ids is None else sorted(set(ids))
+            counters.adjust({request.user.pk: -updated})
+            if updated:
+                queryset_updated.send(sender=Notification, pks=pks, scope=request.user.pk)
+        result = {'updated': updated, 'unread': counters.unread_count(request.user.pk)}
+        if updated:
+            # ids=None means "everything up to now" to the live stream.
+            publish_on_commit(notifications_channel(request.user.pk), 'notification.read',
+                              {'ids': ids, **result})
+        return Response(result)
@@ -0,0 +1,85 @@
+# apps/reports_analytics/analytics.py
+
+from django.db.models import Count, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, NullIf, Round, TruncDay, TruncMonth, TruncWeek, TruncYear
+
+from apps.egg_candling.models import FertileEggCandling
+from apps.hatching.models import HatchingRecord
+from apps.incubation.models import IncubationBatch
+
+# ?group_by= keys -> the IncubationBatch columns each one groups on.
+GROUPINGS = {
+    'batch':     ('batch_id',),
+    'incubator': ('incubator_id', 'incubator__name'),
+    'breed':     ('breed',),
+    'day':       ('day',),
+    'week':      ('week',),
+    'month':     ('month',),
+    'year':      ('year',),
+}
+
+# Date buckets over the setting date, annotated before grouping.
+BUCKETS = {
+    'day':   TruncDay('start_date'),
+    'week':  TruncWeek('start_date'),
+    'month': TruncMonth('start_date'),
+    'year':  TruncYear('start_date'),
+}
+
+
+def _stage_total(model, column):
+    """Per-batch SUM(column) of a later stage, correlated on the lineage."""
+    return Subquery(
+        model.objects.filter(lineage=OuterRef('lineage'))
+        .order_by().values('lineage').annotate(total=Sum(column)).values('total')
+    )
+
+
+def _percent(part, whole):
+    return Round(Cast(part, FloatField()) * 100 / NullIf(whole, 0), 2)
+
+
+def hatch_rates(group_by, start=None, end=None, incubator=None, breed=None):
+    """
+    Hatch-rate analytics over incubation batches set in [start, end],
+    grouped by any of GROUPINGS, as one SQL statement.
+
+    Each batch is joined to its fertile-candling and hatching totals by
+    lineage (the normalised batch_id). The rates only use batches that
+    reached the stage, through conditional aggregation:
+
+    ``fertility_percent``         fertile / set, candled batches
+    ``hatch_of_fertile_percent``  hatched / fertile, candled and hatched batches
+    ``hatch_of_set_percent``      hatched / set, hatched batches
+    """
+    keys = [column for name in group_by for column in GROUPINGS[name]]
+
+    batches = IncubationBatch.objects.all()
+    if start:
+        batches = batches.filter(start_date__gte=start)
+    if end:
+        batches = batches.filter(start_date__lte=end)
+    if incubator:
+        batches = batches.filter(incubator_id=incubator)
+    if breed:
+        batches = batches.filter(breed=breed)
+
+    candled = Q(fertile__isnull=False)
+    hatched = Q(hatched__isnull=False)
+    both    = candled & hatched
+    return (batches
+            .annotate(fertile=_stage_total(FertileEggCandling, 'count'),
+                      hatched=_stage_total(HatchingRecord, 'hatched_eggs'),
+                      **{name: BUCKETS[name] for name in group_by if name in BUCKETS})
+            .values(*keys)
+            .annotate(
+                batches=Count('id'),
+                eggs_set=Sum('quantity'),
+                fertile_eggs=Sum('fertile'),
+                hatched_eggs=Sum('hatched'),
+                pending_batches=Count('id', filter=~hatched),
+                fertility_percent=_percent(Sum('fertile'), Sum('quantity', filter=candled)),
+                hatch_of_fertile_percent=_percent(Sum('hatched', filter=both), Sum('fertile', filter=both)),
+                hatch_of_set_percent=_percent(Sum('hatched'), Sum('quantity', filter=hatched)),
+            )
+            .order_by(*keys))
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class ReportsAnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'reports_analytics'
+    name = 'apps.reports_analytics'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,131 @@
+# apps/reports_analytics/async_views.py
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connections
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from apps.changes.versions import replica_behind
+from apps.core.authentication import CachedJWTAuthentication
+from apps.core.routers import replica_reads
+from .cache import Uncached, report_cache
+from .views import (
+    DashboardReportView,
+    HatchRateAnalyticsView,
+    HatchRateReportView,
+    ProductionSummaryReportView,
+    SalesSummaryReportView,
+)
+
+# Async variants of the report views, for the ASGI application. They run
+# the same queries as their sync views (``report_view``) and share their
+# cache dependencies; independent aggregates run concurrently.
+
+
+def _in_transaction():
+    return any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+
+
+def _on_own_connection(queryset, exprs):
+    close_old_connections()
+    try:
+        return queryset.aggregate(**exprs)
+    finally:
+        close_old_connections()
+
+
+async def gather_aggregates(aggregates):
+    """
+    Run ``{section: (queryset, {name: aggregate})}`` concurrently, each on
+    a worker thread with its own database connection.
+
+    QuerySet.aaggregate() would not overlap: Django runs every async ORM
+    call on the one thread-sensitive executor, one after another. Inside
+    a transaction (ATOMIC_REQUESTS, tests) other connections would not
+    see its writes, so the aggregates run in turn on its connection.
+    """
+    if await sync_to_async(_in_transaction)():
+        return {section: await queryset.aaggregate(**exprs)
+                for section, (queryset, exprs) in aggregates.items()}
+    sections = list(aggregates)
+    results  = await asyncio.gather(*(
+        sync_to_async(_on_own_connection, thread_sensitive=False)(*aggregates[section])
+        for section in sections
+    ))
+    return dict(zip(sections, results))
+
+
+def _authenticate(request):
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+def render_json(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+class AsyncReportView(View):
+    """
+    Serves ``report_view``'s report from an async view: JWT auth, the
+    shared report cache and replica reads as the sync view has them,
+    without conditional GET. Aggregates go through gather_aggregates();
+    row reports stream through ``async for``.
+    """
+    report_view = None
+
+    async def get(self, request, *args, **kwargs):
+        user = await sync_to_async(_authenticate)(request)
+        if user is None:
+            exc = NotAuthenticated()
+            response = render_json({'detail': exc.detail}, status=401)
+            response['WWW-Authenticate'] = CachedJWTAuthentication().authenticate_header(request)
+            return response
+
+        view     = self.report_view()
+        endpoint = request.resolver_match.url_name if request.resolver_match else type(self).__name__
+        key      = report_cache.make_key(endpoint, request.GET, view.cache_depends_on)
+        try:
+            data = await report_cache.aget_or_compute(
+                key, lambda: self.compute(view, request), timeout=view.cache_timeout,
+            )
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            return render_json(detail, status=exc.status_code)
+        return render_json(data.data if isinstance(data, Uncached) else data)
+
+    async def compute(self, view, request):
+        behind = await sync_to_async(replica_behind)(view.cache_depends_on)
+        with replica_reads():
+            if view.aggregates:
+                data = view.render(await gather_aggregates(view.aggregates))
+            else:
+                data = [row async for row in view.report_queryset(request.GET)]
+        return Uncached(data) if behind else data
+
+
+class AsyncHatchRateReportView(AsyncReportView):
+    report_view = HatchRateReportView
+
+
+class AsyncHatchRateAnalyticsView(AsyncReportView):
+    report_view = HatchRateAnalyticsView
+
+
+class AsyncSalesSummaryReportView(AsyncReportView):
+    report_view = SalesSummaryReportView
+
+
+class AsyncProductionSummaryReportView(AsyncReportView):
+    report_view = ProductionSummaryReportView
+
+
+class AsyncDashboardReportView(AsyncReportView):
+    report_view = DashboardReportView
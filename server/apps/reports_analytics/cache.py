@@ -0,0 +1,204 @@
+# apps/reports_analytics/cache.py
+
+import threading
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.http import urlencode
+from rest_framework.response import Response
+
+from apps.changes.conditional import conditional_response
+from apps.changes.versions import replica_behind
+from apps.core.routers import replica_reads
+from apps.core.signals import bulk_created, bulk_updated, queryset_updated
+
+CACHE_ALIAS = 'reports'
+
+
+class Uncached:
+    """A computed report that get_or_compute() hands back without storing."""
+
+    def __init__(self, data):
+        self.data = data
+
+
+class ReportCache:
+    """
+    Report responses keyed by endpoint, query string and the generation
+    token of every table the report reads.
+
+    A write to a table swaps that table's token, so exactly the reports
+    that depend on it miss on their next request; stale entries are never
+    looked up again and age out through the backend's LRU eviction.
+    """
+
+    def __init__(self, alias=CACHE_ALIAS):
+        self.alias  = alias
+        self._lock  = threading.Lock()
+        self.hits   = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    # -- table generations ---------------------------------------------
+
+    @staticmethod
+    def _generation_key(model):
+        return f'report-gen:{model._meta.label_lower}'
+
+    def generations(self, models):
+        keys   = [self._generation_key(m) for m in models]
+        tokens = self.backend.get_many(keys)
+        for key in keys:
+            if key not in tokens:
+                # Evicted or never set: start a fresh generation so entries
+                # cached under an earlier token can't be resurrected.
+                self.backend.add(key, uuid4().hex, timeout=None)
+                tokens[key] = self.backend.get(key)
+        return [tokens[k] for k in keys]
+
+    def invalidate(self, model):
+        self.backend.set(self._generation_key(model), uuid4().hex, timeout=None)
+
+    # -- lookups ---------------------------------------------------------
+
+    def make_key(self, endpoint, params, models):
+        query = urlencode(sorted((k, v) for k in params for v in params.getlist(k)))
+        gens  = '.'.join(self.generations(models))
+        return f'report:{endpoint}:{gens}:{query}'
+
+    def get_or_compute(self, key, compute, timeout=None):
+        sentinel = object()
+        data = self.backend.get(key, sentinel)
+        if data is not sentinel:
+            self._count(hit=True)
+            return data
+        self._count(hit=False)
+        data = compute()
+        if not isinstance(data, Uncached):
+            self.backend.set(key, data, timeout=timeout)
+        return data
+
+    async def aget_or_compute(self, key, compute, timeout=None):
+        """get_or_compute() for async views; ``compute`` returns an awaitable."""
+        sentinel = object()
+        data = await self.backend.aget(key, sentinel)
+        if data is not sentinel:
+            self._count(hit=True)
+            return data
+        self._count(hit=False)
+        data = await compute()
+        if not isinstance(data, Uncached):
+            await self.backend.aset(key, data, timeout=timeout)
+        return data
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits':     hits,
+            'misses':   misses,
+            'hit_rate': round(hits / total, 4) if total else 0,
+            'backend':  type(self.backend).__name__,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+report_cache = ReportCache()
+
+
+class CachedReportMixin:
+    """
+    APIView mixin: subclasses implement ``get_report(request)`` returning
+    plain data and list the models it reads in ``cache_depends_on``.
+    Those tables' versions also drive ETag / Last-Modified, so a client
+    that already has the current report gets a 304 without a cache read.
+
+    Instead of ``get_report`` a view can declare its queries, which the
+    async variants in async_views.py run too: ``report_queryset(params)``
+    for a list of rows, or ``aggregates`` (``{section: (queryset,
+    {name: aggregate})}``) and ``render(results)``. A subclass with
+    none of the three is rejected when it is defined.
+    """
+    cache_depends_on = ()
+    cache_timeout    = None    # generations handle freshness
+    aggregates       = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not (cls.aggregates
+                or cls.get_report is not CachedReportMixin.get_report
+                or cls.report_queryset is not CachedReportMixin.report_queryset):
+            raise ImproperlyConfigured(
+                f'{cls.__name__} must define get_report(), report_queryset() or aggregates.')
+
+    def get(self, request, *args, **kwargs):
+        return conditional_response(request, self.cache_depends_on, lambda: self.get_cached(request))
+
+    def get_cached(self, request):
+        endpoint = request.resolver_match.url_name if request.resolver_match else type(self).__name__
+        key = report_cache.make_key(endpoint, request.query_params, self.cache_depends_on)
+        data = report_cache.get_or_compute(key, lambda: self.compute(request), timeout=self.cache_timeout)
+        if isinstance(data, Uncached):
+            response = Response(data.data)
+            response.unversioned = True
+            return response
+        return Response(data)
+
+    def compute(self, request):
+        # Reports read from the replica when there is one, while the cache
+        # key and ETag follow the primary. Until the replica has caught up
+        # with the primary's versions, a report is served but not cached.
+        behind = replica_behind(self.cache_depends_on)
+        with replica_reads():
+            data = self.get_report(request)
+        return Uncached(data) if behind else data
+
+    def get_report(self, request):
+        return self.report_data(request.query_params)
+
+    def report_data(self, params):
+        """The declared report for ``params``, outside any request (jobs)."""
+        if self.aggregates:
+            return self.render({section: queryset.aggregate(**exprs)
+                                for section, (queryset, exprs) in self.aggregates.items()})
+        return list(self.report_queryset(params))
+
+    def report_queryset(self, params):
+        raise ImproperlyConfigured(
+            f'{type(self).__name__} builds its report in get_report(); it has no report_queryset().')
+
+    def render(self, results):
+        return results
+
+
+def invalidate_sender(sender, **kwargs):
+    # After commit, so a concurrent reader can't cache pre-commit data
+    # under the new generation.
+    transaction.on_commit(lambda: report_cache.invalidate(sender))
+
+
+def connect(models):
+    for model in models:
+        uid = f'report-cache.{model._meta.label}'
+        post_save.connect(invalidate_sender, sender=model, dispatch_uid=uid)
+        post_delete.connect(invalidate_sender, sender=model, dispatch_uid=uid)
+        bulk_created.connect(invalidate_sender, sender=model, dispatch_uid=uid)
+        bulk_updated.connect(invalidate_sender, sender=model, dispatch_uid=uid)
+        queryset_updated.connect(invalidate_sender, sender=model, dispatch_uid=uid)
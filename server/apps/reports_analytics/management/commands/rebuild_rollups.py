@@ -0,0 +1,25 @@
+# apps/reports_analytics/management/commands/rebuild_rollups.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.changes.versions import bump
+from apps.reports_analytics.cache import report_cache
+from apps.reports_analytics.rollups import ROLLUPS, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the report rollup tables from the sales, hatching and incubation tables."
+
+    def handle(self, *args, **options):
+        for spec in ROLLUPS:
+            with transaction.atomic():
+                rows = rebuild(spec)
+                # Reports' ETags follow the source table's version; the
+                # source rows themselves did not change, so no change log.
+                bump(spec.source)
+            report_cache.invalidate(spec.source)
+            self.stdout.write(
+                f"{spec.target.__name__}: {rows} rows from {spec.source.__name__}"
+            )
+        self.stdout.write(self.style.SUCCESS("Rollups rebuilt."))
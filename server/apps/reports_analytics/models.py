@@ -1,3 +1,31 @@
+# apps/reports_analytics/models.py
+
 from django.db import models
 
-# Create your models here.
+# Rollups are maintained incrementally by signals (see rollups.py) and can be
+# rebuilt from the source tables with `manage.py rebuild_rollups`.
+
+class DailySalesRollup(models.Model):
+    date         = models.DateField(unique=True)                    # SaleRecord.date
+    total_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_qty    = models.BigIntegerField(default=0)
+    row_count    = models.PositiveIntegerField(default=0)           # sales on this day
+
+    def __str__(self):
+        return f"Sales {self.date}: {self.total_amount}"
+
+class DailyHatchRollup(models.Model):
+    date         = models.DateField(unique=True)                    # HatchingRecord.hatch_date
+    hatched_eggs = models.BigIntegerField(default=0)
+    row_count    = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Hatched {self.date}: {self.hatched_eggs}"
+
+class BreedProductionRollup(models.Model):
+    breed        = models.CharField(max_length=100, unique=True)    # IncubationBatch.breed
+    batch_count  = models.PositiveIntegerField(default=0)
+    total_eggs   = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.breed}: {self.batch_count} batches"
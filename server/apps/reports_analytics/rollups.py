@@ -0,0 +1,123 @@
+# apps/reports_analytics/rollups.py
+
+from collections import defaultdict
+
+from django.db import router, transaction
+from django.db.models import Count, Sum
+
+from apps.core.upsert import add_deltas
+from apps.hatching.models import HatchingRecord
+from apps.incubation.models import IncubationBatch
+from apps.sales.models import SaleRecord
+from .models import BreedProductionRollup, DailyHatchRollup, DailySalesRollup
+
+
+class RollupSpec:
+    """
+    How one source table folds into one rollup table: rows are grouped by
+    ``key`` (source field -> rollup field), ``sums`` maps rollup fields to the
+    source fields they add up, and ``count`` is the rollup's row counter.
+    """
+
+    def __init__(self, source, target, key, sums, count):
+        self.source = source
+        self.target = target
+        self.key    = key
+        self.sums   = sums
+        self.count  = count
+
+    @property
+    def source_fields(self):
+        return [self.key[0], *self.sums.values()]
+
+    def contribution(self, values, sign=1):
+        """(key value, {rollup field: delta}) for one source row."""
+        deltas = {field: sign * (values[src] or 0) for field, src in self.sums.items()}
+        deltas[self.count] = sign
+        return values[self.key[0]], deltas
+
+
+ROLLUPS = [
+    RollupSpec(
+        SaleRecord, DailySalesRollup,
+        key=('date', 'date'),
+        sums={'total_amount': 'total_amount', 'total_qty': 'quantity'},
+        count='row_count',
+    ),
+    RollupSpec(
+        HatchingRecord, DailyHatchRollup,
+        key=('hatch_date', 'date'),
+        sums={'hatched_eggs': 'hatched_eggs'},
+        count='row_count',
+    ),
+    RollupSpec(
+        IncubationBatch, BreedProductionRollup,
+        key=('breed', 'breed'),
+        sums={'total_eggs': 'quantity'},
+        count='batch_count',
+    ),
+]
+
+
+def specs_for(model):
+    return [spec for spec in ROLLUPS if spec.source is model]
+
+
+def row_values(spec, instance):
+    return {name: getattr(instance, name) for name in spec.source_fields}
+
+
+def apply_delta(spec, key_value, deltas):
+    """Add ``deltas`` to the rollup row for ``key_value``."""
+    add_deltas(spec.target, spec.key[1], {key_value: deltas}, spec.count)
+
+
+def apply_contributions(spec, contributions):
+    """
+    Merge (key value, deltas) pairs per key and apply them all in a fixed
+    number of statements (see core.upsert.add_deltas); ``rebuild_rollups``
+    resyncs anything subtracted from a missing row.
+    """
+    merged = defaultdict(lambda: defaultdict(int))
+    for key_value, deltas in contributions:
+        for field, delta in deltas.items():
+            merged[key_value][field] += delta
+    add_deltas(spec.target, spec.key[1], merged, spec.count)
+
+
+def apply_rows(spec, rows, sign=1):
+    """Fold many source rows (dicts of ``spec.source_fields``) into the rollup; for bulk writes."""
+    apply_contributions(spec, (spec.contribution(values, sign) for values in rows))
+
+
+def move_row(spec, old, new):
+    """Replace an old contribution with a new one after an update."""
+    contributions = [spec.contribution(new)]
+    if old is not None:
+        contributions.append(spec.contribution(old, -1))
+    apply_contributions(spec, contributions)
+
+
+@transaction.atomic
+def rebuild(spec):
+    """Recompute a rollup table from its source table in two statements."""
+    spec.target.objects.all().delete()
+    grouped = (
+        spec.source._default_manager.db_manager(router.db_for_write(spec.source))
+        .values(spec.key[0])
+        .annotate(**{f'_{f}': Sum(src) for f, src in spec.sums.items()},
+                  _count=Count('pk'))
+        .order_by()
+    )
+    created = spec.target.objects.bulk_create(
+        [
+            spec.target(**{
+                spec.key[1]: row[spec.key[0]],
+                spec.count:  row['_count'],
+                **{f: row[f'_{f}'] or 0 for f in spec.sums},
+            })
+            for row in grouped.iterator()
+        ],
+        batch_size=1000,
+    )
+    return len(created)     # not a count(): reads of rollups may go to the replica
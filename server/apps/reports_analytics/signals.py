@@ -0,0 +1,57 @@
+# apps/reports_analytics/signals.py
+
+from django.db import router
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from apps.core.signals import bulk_created
+
+from . import cache
+from .rollups import ROLLUPS, apply_delta, apply_rows, move_row, row_values
+
+
+def capture_old_values(sender, instance, raw=False, **kwargs):
+    """Remember what the row contributed before it is overwritten."""
+    instance._rollup_old = {}
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    # From the primary: the row as it is now, not as a replica last saw it.
+    objects = sender._default_manager.db_manager(router.db_for_write(sender))
+    for spec in ROLLUPS:
+        if spec.source is sender:
+            instance._rollup_old[spec.target] = (
+                objects.filter(pk=instance.pk).values(*spec.source_fields).first()
+            )
+
+
+def fold_saved_row(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_values = getattr(instance, '_rollup_old', {})
+    for spec in ROLLUPS:
+        if spec.source is sender:
+            move_row(spec, old_values.get(spec.target), row_values(spec, instance))
+    instance._rollup_old = {}
+
+
+def unfold_deleted_row(sender, instance, **kwargs):
+    for spec in ROLLUPS:
+        if spec.source is sender:
+            apply_delta(spec, *spec.contribution(row_values(spec, instance), -1))
+
+
+def fold_bulk_created(sender, instances, **kwargs):
+    for spec in ROLLUPS:
+        if spec.source is sender:
+            apply_rows(spec, [row_values(spec, obj) for obj in instances])
+
+
+def connect():
+    for source in {spec.source for spec in ROLLUPS}:
+        uid = f'rollups.{source._meta.label}'
+        pre_save.connect(capture_old_values, sender=source, dispatch_uid=uid)
+        post_save.connect(fold_saved_row, sender=source, dispatch_uid=uid)
+        post_delete.connect(unfold_deleted_row, sender=source, dispatch_uid=uid)
+        bulk_created.connect(fold_bulk_created, sender=source, dispatch_uid=uid)
+
+    from .views import REPORT_VIEWS
+    cache.connect({model for view in REPORT_VIEWS for model in view.cache_depends_on})
@@ -1,3 +1,412 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, QuerySet, Sum
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.alerts.models import Alert
+from apps.core.cache import LRUFileBasedCache
+from apps.core.upsert import add_deltas
+
+from apps.egg_candling.models import FertileEggCandling
+from apps.hatching.models import HatchingRecord
+from apps.incubation.models import Incubator, IncubationBatch
+from apps.sales.models import SaleRecord
+from .analytics import hatch_rates
+from .async_views import gather_aggregates
+from .cache import CachedReportMixin, report_cache
+from .models import BreedProductionRollup, DailyHatchRollup, DailySalesRollup
+from .views import DashboardReportView
+
+
+def make_sale(day, amount, qty=10, **extra):
+    return SaleRecord.objects.create(
+        batch_id='B-1', date=date(2025, 3, day), customer='Acme', product_type='chicks',
+        quantity=qty, unit_price=Decimal('1.00'), total_amount=Decimal(amount),
+        paid=Decimal(amount), balance=Decimal('0'), payment_method='Cash',
+        status='completed', **extra,
+    )
+
+def make_batch(incubator, breed, qty):
+    return IncubationBatch.objects.create(
+        batch_id=f'B-{breed}', incubator=incubator, start_date=date(2025, 3, 1),
+        expected_hatch_date=date(2025, 3, 22), quantity=qty, breed=breed,
+        progress=Decimal('0'), status='incubating',
+    )
+
+def make_hatch(day, hatched):
+    return HatchingRecord.objects.create(
+        batch_id='B-1', label='L', hatch_date=date(2025, 3, day), quantity=hatched + 5,
+        hatched_eggs=hatched, unhatched_eggs=5, cull_chicks=0, dead_chicks=0, status='done',
+    )
+
+
+class RollupConsistencyTests(TestCase):
+    """Rollups must always equal the aggregates over the source tables."""
+
+    def assertRollupsMatchSource(self):
+        sales = list(SaleRecord.objects.values('date').annotate(
+            total_amount=Sum('total_amount'), total_qty=Sum('quantity'),
+        ).order_by('date'))
+        self.assertEqual(
+            sales,
+            list(DailySalesRollup.objects.values('date', 'total_amount', 'total_qty').order_by('date')),
+        )
+
+        production = list(IncubationBatch.objects.values('breed').annotate(
+            batch_count=Count('id'), total_eggs=Sum('quantity'),
+        ).order_by('breed'))
+        self.assertEqual(
+            production,
+            list(BreedProductionRollup.objects.values('breed', 'batch_count', 'total_eggs').order_by('breed')),
+        )
+
+        hatched = HatchingRecord.objects.aggregate(t=Sum('hatched_eggs'))['t'] or 0
+        self.assertEqual(hatched, DailyHatchRollup.objects.aggregate(t=Sum('hatched_eggs'))['t'] or 0)
+
+    def setUp(self):
+        self.incubator = Incubator.objects.create(name='Setter 1', capacity=50000)
+
+    def test_inserts(self):
+        make_sale(1, '100.50')
+        make_sale(1, '20.25', qty=3)
+        make_sale(2, '7.00')
+        make_batch(self.incubator, 'Kuroiler', 1000)
+        make_batch(self.incubator, 'Kuroiler', 500)
+        make_batch(self.incubator, 'Sasso', 800)
+        make_hatch(21, 900)
+        make_hatch(22, 400)
+        self.assertRollupsMatchSource()
+
+    def test_updates_move_contribution_between_keys(self):
+        sale  = make_sale(1, '10.00')
+        batch = make_batch(self.incubator, 'Kuroiler', 1000)
+        hatch = make_hatch(21, 900)
+
+        sale.date, sale.total_amount = date(2025, 3, 5), Decimal('12.00')
+        sale.save()
+        batch.breed, batch.quantity = 'Sasso', 1200
+        batch.save()
+        hatch.hatched_eggs = 950
+        hatch.save()
+
+        self.assertRollupsMatchSource()
+        self.assertFalse(DailySalesRollup.objects.filter(date=date(2025, 3, 1)).exists())
+        self.assertFalse(BreedProductionRollup.objects.filter(breed='Kuroiler').exists())
+
+    def test_deletes(self):
+        keep = make_sale(1, '10.00')
+        make_sale(1, '5.00').delete()
+        make_sale(2, '5.00').delete()
+        make_batch(self.incubator, 'Sasso', 10).delete()
+        make_hatch(21, 9).delete()
+
+        self.assertRollupsMatchSource()
+        self.assertEqual(DailySalesRollup.objects.get().row_count, 1)
+        self.assertEqual(DailySalesRollup.objects.get().date, keep.date)
+        self.assertFalse(BreedProductionRollup.objects.exists())
+
+    def test_bulk_created_rows_are_folded_in(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('clerk', password='pw'))
+        payload = [
+            {'batch_id': 'B-1', 'date': f'2025-03-0{1 + i % 3}', 'customer': 'Acme',
+             'product_type': 'chicks', 'quantity': 10, 'unit_price': '1.00',
+             'total_amount': '10.00', 'paid': '10.00', 'balance': '0.00',
+             'payment_method': 'Cash', 'status': 'completed'}
+            for i in range(7)
+        ]
+        response = client.post('/api/sales/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertRollupsMatchSource()
+
+    def test_bulk_write_cost_does_not_grow_with_distinct_keys(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('clerk', password='pw'))
+
+        def post(days, month):
+            payload = [
+                {'batch_id': 'B-1', 'date': f'2025-{month:02}-{day:02}', 'customer': f'C{day}',
+                 'product_type': 'chicks', 'quantity': 10, 'unit_price': '1.00',
+                 'total_amount': '10.00', 'paid': '10.00', 'balance': '0.00',
+                 'payment_method': 'Cash', 'status': 'completed'}
+                for day in range(1, days + 1)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(client.post('/api/sales/', payload, format='json').status_code, 201)
+            return len(queries)
+
+        post(1, month=3)                # creates the B-1 lineage batch
+        self.assertEqual(post(2, month=4), post(15, month=5))
+        self.assertRollupsMatchSource()
+
+    def test_rows_emptied_before_the_lock_are_created_again(self):
+        bulk_create = QuerySet.bulk_create
+
+        def then_a_concurrent_delete(queryset, objs, **kwargs):
+            created = bulk_create(queryset, objs, **kwargs)
+            if racing.call_count == 1:
+                DailySalesRollup.objects.filter(date=date(2025, 3, 1)).delete()
+            return created
+
+        with mock.patch.object(QuerySet, 'bulk_create', autospec=True,
+                               side_effect=then_a_concurrent_delete) as racing:
+            add_deltas(DailySalesRollup, 'date', {date(2025, 3, 1): {'row_count': 1, 'total_qty': 4}}, 'row_count')
+        self.assertEqual(racing.call_count, 2)
+        row = DailySalesRollup.objects.get(date=date(2025, 3, 1))
+        self.assertEqual((row.row_count, row.total_qty), (1, 4))
+
+    def test_rebuild_command_matches_source(self):
+        make_sale(1, '10.00')
+        make_sale(3, '4.40')
+        make_batch(self.incubator, 'Sasso', 10)
+        make_hatch(21, 9)
+        DailySalesRollup.objects.update(total_amount=0)
+        BreedProductionRollup.objects.all().delete()
+
+        call_command('rebuild_rollups', stdout=StringIO())
+        self.assertRollupsMatchSource()
+
+
+class ReportCacheTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('clerk', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.incubator = Incubator.objects.create(name='Setter 1', capacity=50000)
+        caches['reports'].clear()
+        report_cache.reset_stats()
+
+    def get(self, url):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(url).json()
+
+    def test_repeat_request_is_a_hit(self):
+        make_sale(1, '10.00')
+        first = self.get('/api/reports/sales/')
+        with self.assertNumQueries(1):      # table versions for the ETag
+            second = self.client.get('/api/reports/sales/').json()
+        self.assertEqual(first, second)
+        self.assertEqual(report_cache.stats()['hits'], 1)
+        self.assertEqual(report_cache.stats()['misses'], 1)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.get('/api/reports/sales/?from=2025-01-01')
+        self.get('/api/reports/sales/?from=2025-02-01')
+        self.assertEqual(report_cache.stats()['misses'], 2)
+
+    def test_write_invalidates_only_dependent_reports(self):
+        self.get('/api/reports/sales/')
+        self.get('/api/reports/production/')
+        with self.captureOnCommitCallbacks(execute=True):
+            make_sale(2, '5.00')
+
+        sales = self.get('/api/reports/sales/')
+        self.get('/api/reports/production/')
+        self.assertEqual(len(sales), 1)
+        self.assertEqual(report_cache.stats()['misses'], 3)   # sales twice, production once
+        self.assertEqual(report_cache.stats()['hits'], 1)
+
+    def test_rollup_rebuild_changes_the_etag(self):
+        make_sale(1, '10.00')
+        etag = self.client.get('/api/reports/sales/')['ETag']
+        DailySalesRollup.objects.update(total_amount=0)     # drifted
+        call_command('rebuild_rollups', stdout=StringIO())
+        response = self.client.get('/api/reports/sales/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['total_amount'], 10.0)
+
+    def test_delete_invalidates(self):
+        batch = make_batch(self.incubator, 'Sasso', 100)
+        self.assertEqual(len(self.get('/api/reports/production/')), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            batch.delete()
+        self.assertEqual(self.get('/api/reports/production/'), [])
+
+    def test_view_without_a_report_is_rejected_when_defined(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'EmptyReportView must define'):
+            type('EmptyReportView', (CachedReportMixin,), {'cache_depends_on': (SaleRecord,)})
+
+
+class HatchRateAnalyticsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('clerk', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        caches['reports'].clear()
+        self.north = Incubator.objects.create(name='North', capacity=50000)
+        self.south = Incubator.objects.create(name='South', capacity=50000)
+        # B-1: set 1000, 900 fertile, 810 hatched (in two records)
+        # B-2: set 500, 400 fertile, not hatched yet
+        # B-3: set 200 in March, not candled yet
+        self.stage('B-1', self.north, 'Sasso', 1000, date(2025, 1, 6), fertile=900, hatched=(800, 10))
+        self.stage('B-2', self.south, 'Kuroiler', 500, date(2025, 1, 20), fertile=400)
+        self.stage('B-3', self.south, 'Sasso', 200, date(2025, 3, 3))
+
+    @staticmethod
+    def stage(batch_id, incubator, breed, qty, start, fertile=None, hatched=()):
+        IncubationBatch.objects.create(
+            batch_id=batch_id, incubator=incubator, start_date=start,
+            expected_hatch_date=start, quantity=qty, breed=breed,
+            progress=Decimal('0'), status='incubating',
+        )
+        if fertile is not None:
+            FertileEggCandling.objects.create(batch_id=batch_id, candling_date=start, count=fertile)
+        for n in hatched:
+            HatchingRecord.objects.create(
+                batch_id=batch_id, label='L', hatch_date=start, quantity=n, hatched_eggs=n,
+                unhatched_eggs=0, cull_chicks=0, dead_chicks=0, status='done',
+            )
+
+    def get(self, **params):
+        response = self.client.get('/api/reports/hatch-rate/analytics/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_rates_per_batch(self):
+        rows = {row['batch_id']: row for row in self.get()}
+        self.assertEqual(rows['B-1']['fertile_eggs'], 900)
+        self.assertEqual(rows['B-1']['hatched_eggs'], 810)
+        self.assertEqual(rows['B-1']['fertility_percent'], 90.0)
+        self.assertEqual(rows['B-1']['hatch_of_fertile_percent'], 90.0)
+        self.assertEqual(rows['B-1']['hatch_of_set_percent'], 81.0)
+        self.assertEqual(rows['B-2']['fertility_percent'], 80.0)
+        self.assertIsNone(rows['B-2']['hatch_of_set_percent'])
+        self.assertIsNone(rows['B-3']['fertility_percent'])
+
+    def test_unhatched_batches_do_not_dilute_the_rates(self):
+        [row] = self.get(group_by='breed', breed='Sasso')
+        self.assertEqual(row['batches'], 2)
+        self.assertEqual(row['pending_batches'], 1)
+        self.assertEqual(row['eggs_set'], 1200)
+        self.assertEqual(row['fertility_percent'], 90.0)       # B-3 is not candled
+        self.assertEqual(row['hatch_of_set_percent'], 81.0)    # nor hatched
+
+    def test_hatched_batches_without_candling_stay_out_of_hatch_of_fertile(self):
+        self.stage('B-4', self.north, 'Sasso', 300, date(2025, 2, 3), hatched=(250,))
+        [row] = self.get(group_by='breed', breed='Sasso')
+        self.assertEqual(row['hatched_eggs'], 1060)
+        self.assertEqual(row['hatch_of_fertile_percent'], 90.0)     # B-1 only
+
+    def test_grouped_by_incubator_and_month(self):
+        rows = self.get(group_by='incubator,month')
+        self.assertEqual(
+            [(r['incubator__name'], r['month'], r['batches']) for r in rows],
+            [('North', '2025-01-01', 1), ('South', '2025-01-01', 1), ('South', '2025-03-01', 1)],
+        )
+        self.assertEqual(rows[1]['fertility_percent'], 80.0)
+
+    def test_grouped_by_year(self):
+        [row] = self.get(group_by='year')
+        self.assertEqual((row['year'], row['batches'], row['eggs_set']), ('2025-01-01', 3, 1700))
+
+    def test_date_range_and_incubator_filters(self):
+        self.assertEqual([r['batch_id'] for r in self.get(**{'from': '2025-01-10'})], ['B-2', 'B-3'])
+        self.assertEqual([r['batch_id'] for r in self.get(to='2025-01-31', incubator=self.south.pk)],
+                         ['B-2'])
+
+    def test_one_statement_whatever_the_grouping(self):
+        with self.assertNumQueries(1):
+            list(hatch_rates(['incubator', 'breed', 'week'], start=date(2025, 1, 1)))
+
+    def test_bad_parameters_are_a_400(self):
+        for params in ({'group_by': 'colour'}, {'group_by': 'day,month'}, {'from': '2025-13-01'},
+                       {'from': '2025-02-01', 'to': '2025-01-01'}, {'incubator': 'x'}):
+            response = self.client.get('/api/reports/hatch-rate/analytics/', params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class AsyncReportViewTests(TransactionTestCase):
+    """
+    The async views aggregate on worker threads with their own
+    connections, which cannot see a TestCase's open transaction.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('clerk', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        caches['reports'].clear()
+        incubator = Incubator.objects.create(name='North', capacity=50000)
+        make_batch(incubator, 'Sasso', 1000)
+        make_hatch(1, 800)
+        make_sale(1, '100.00')
+        cancelled = make_sale(2, '50.00')
+        cancelled.status = 'cancelled'
+        cancelled.save()
+        Alert.objects.create(type='temperature', severity='high', source='North', value='39', threshold='38',
+                             timestamp=timezone.now(), status='active')
+
+    def get(self, name, **params):
+        response = self.client.get(f'/api/reports/{name}', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_same_reports_as_the_sync_views(self):
+        for name in ('hatch-rate/', 'hatch-rate/analytics/', 'sales/', 'production/', 'dashboard/'):
+            caches['reports'].clear()
+            expected = self.get(name)
+            caches['reports'].clear()
+            self.assertEqual(self.get(f'async/{name}'), expected, name)
+
+    def test_dashboard_figures(self):
+        report = self.get('async/dashboard/')
+        self.assertEqual(report['production'], {'batches': 1, 'eggs_set': 1000})
+        self.assertEqual(report['hatching'], {'hatched': 800, 'unhatched': 5})
+        self.assertEqual(report['sales']['sales'], 1)
+        self.assertEqual(report['alerts'], {'active': 1, 'total': 1})
+
+    def test_shares_the_report_cache(self):
+        self.get('async/hatch-rate/')
+        before = report_cache.stats()['hits']
+        self.get('async/hatch-rate/')
+        self.assertEqual(report_cache.stats()['hits'], before + 1)
+        make_hatch(2, 100)
+        self.assertEqual(self.get('async/hatch-rate/'), self.get('hatch-rate/'))
+
+    def test_gather_aggregates_keeps_the_sections(self):
+        results = async_to_sync(gather_aggregates)(DashboardReportView.aggregates)
+        self.assertEqual(list(results), list(DashboardReportView.aggregates))
+        self.assertEqual(results['production']['eggs_set'], 1000)
+
+    def test_requires_a_valid_token(self):
+        for header in ({}, {'HTTP_AUTHORIZATION': 'Bearer nonsense'}):
+            response = APIClient().get('/api/reports/async/dashboard/', **header)
+            self.assertEqual(response.status_code, 401)
+            self.assertIn('detail', response.json())
+
+    def test_bad_parameters_are_a_400(self):
+        response = self.client.get('/api/reports/async/hatch-rate/analytics/', {'group_by': 'colour'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('group_by', response.json())
+
+
+class LRUFileBasedCacheTests(SimpleTestCase):
+
+    def test_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as location:
+            cache = LRUFileBasedCache(location, {'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3}})
+            for i, key in enumerate(['a', 'b', 'c']):
+                cache.set(key, key)
+                os.utime(cache._key_to_file(key), (1000 + i, 1000 + i))
+            cache.get('a')                      # 'b' is now the oldest
+            cache.set('d', 'd')
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual(cache.get('a'), 'a')
+            self.assertEqual(cache.get('d'), 'd')
@@ -2,47 +2,129 @@
 
 from rest_framework.views import APIView                                  
 from rest_framework.response import Response                             
-from rest_framework.permissions import IsAuthenticated                    
-from django.db.models import Count, Sum                                          
-from apps.incubation.models import IncubationBatch                       
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from django.utils.dateparse import parse_date                    
+from django.db.models import Count, Q, Sum
+from apps.alerts.models import Alert
+from apps.egg_candling.models import FertileEggCandling
+from apps.incubation.models import IncubationBatch, Incubator                       
 from apps.hatching.models import HatchingRecord
 from apps.sales.models import SaleRecord                           
+from .analytics import BUCKETS, GROUPINGS, hatch_rates
+from .cache import CachedReportMixin, report_cache
+from .models import BreedProductionRollup, DailyHatchRollup, DailySalesRollup
 
-class HatchRateReportView(APIView):
-    permission_classes = [IsAuthenticated]  # only logged-in users
+# Reports read the rollup tables (one row per day / breed) instead of
+# re-aggregating the source tables; see rollups.py. Responses are cached
+# until one of the `cache_depends_on` tables is written; see cache.py.
 
-    def get(self, request):
+class HatchRateReportView(CachedReportMixin, APIView):
+    permission_classes = [IsAuthenticated]  # only logged-in users
+    cache_depends_on   = (IncubationBatch, HatchingRecord)
+    aggregates         = {
         # Total eggs set across all batches
-        total_set = IncubationBatch.objects.aggregate(
-            total=Sum('quantity')
-        )['total'] or 0                                                  
-
+        'set':     (BreedProductionRollup.objects.all(), {'total': Sum('total_eggs')}),
         # Total eggs hatched
-        total_hatched = HatchingRecord.objects.aggregate(
-            total=Sum('hatched_eggs')
-        )['total'] or 0                                               
+        'hatched': (DailyHatchRollup.objects.all(),      {'total': Sum('hatched_eggs')}),
+    }
 
+    def render(self, results):
+        total_set     = results['set']['total'] or 0
+        total_hatched = results['hatched']['total'] or 0
         hatch_rate = (total_hatched / total_set * 100) if total_set else 0
-        return Response({'hatch_rate_percent': round(hatch_rate, 2)})
+        return {'hatch_rate_percent': round(hatch_rate, 2)}
+
+class HatchRateAnalyticsView(CachedReportMixin, APIView):
+    """
+    GET ?group_by=batch,incubator,breed,day|week|month|year&from=&to=&incubator=&breed=
 
-class SalesSummaryReportView(APIView):
+    Fertility, hatch-of-fertile and hatch-of-set rates per group, from
+    the source tables in one statement; see analytics.py. ``from`` and
+    ``to`` bound the setting date. Defaults to grouping by batch.
+    """
     permission_classes = [IsAuthenticated]
+    cache_depends_on   = (IncubationBatch, FertileEggCandling, HatchingRecord, Incubator)
 
-    def get(self, request):
-        # Group by date, sum total_amount & quantity
-        data = SaleRecord.objects.values('date').annotate(
-            total_amount=Sum('total_amount'),
-            total_qty=Sum('quantity')
-        ).order_by('date')                                            
-        return Response(data)
-
-class ProductionSummaryReportView(APIView):
+    def report_queryset(self, params):
+        group_by = [name for name in params.get('group_by', 'batch').split(',') if name]
+        unknown  = set(group_by) - set(GROUPINGS)
+        if not group_by or unknown:
+            raise ValidationError({'group_by': f'Comma-separated, from {sorted(GROUPINGS)}.'})
+        if len(set(BUCKETS) & set(group_by)) > 1:
+            raise ValidationError({'group_by': f'At most one of {", ".join(BUCKETS)}.'})
+
+        start = self._parse_date(params, 'from')
+        end   = self._parse_date(params, 'to')
+        if start and end and start > end:
+            raise ValidationError({'from': 'Must not be after "to".'})
+        incubator = params.get('incubator')
+        if incubator and not incubator.isdigit():
+            raise ValidationError({'incubator': 'Integer id.'})
+
+        return hatch_rates(group_by, start=start, end=end, incubator=incubator, breed=params.get('breed'))
+
+    @staticmethod
+    def _parse_date(params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'ISO 8601 date.'})
+        return parsed
+
+class SalesSummaryReportView(CachedReportMixin, APIView):
     permission_classes = [IsAuthenticated]
+    cache_depends_on   = (SaleRecord,)
 
-    def get(self, request):
-        # Group by breed: count batches & sum eggs set
-        data = IncubationBatch.objects.values('breed').annotate(
-            batch_count=Count('id'),
-            total_eggs=Sum('quantity')
+    def report_queryset(self, params):
+        # One rollup row per sale date: total_amount & quantity
+        return DailySalesRollup.objects.values(
+            'date', 'total_amount', 'total_qty'
+        ).order_by('date')
+
+class ProductionSummaryReportView(CachedReportMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    cache_depends_on   = (IncubationBatch,)
+
+    def report_queryset(self, params):
+        # One rollup row per breed: batch count & eggs set
+        return BreedProductionRollup.objects.values(
+            'breed', 'batch_count', 'total_eggs'
         ).order_by('breed')
-        return Response(data)
\ No newline at end of file
+
+class DashboardReportView(CachedReportMixin, APIView):
+    """
+    Headline figures for the dashboard, straight from the source tables.
+    The sections are independent scans of different tables, which the
+    async variant runs side by side; see async_views.py.
+    """
+    permission_classes = [IsAuthenticated]
+    cache_depends_on   = (IncubationBatch, HatchingRecord, SaleRecord, Alert)
+    aggregates         = {
+        'production': (IncubationBatch.objects.all(),
+                       {'batches': Count('id'), 'eggs_set': Sum('quantity')}),
+        'hatching':   (HatchingRecord.objects.all(),
+                       {'hatched': Sum('hatched_eggs'), 'unhatched': Sum('unhatched_eggs')}),
+        'sales':      (SaleRecord.objects.exclude(status='cancelled'),
+                       {'sales': Count('id'), 'revenue': Sum('total_amount'), 'outstanding': Sum('balance')}),
+        'alerts':     (Alert.objects.all(),
+                       {'active': Count('id', filter=Q(status='active')), 'total': Count('id')}),
+    }
+
+    def render(self, results):
+        return {section: {name: value or 0 for name, value in totals.items()}
+                for section, totals in results.items()}
+
+class ReportCacheStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(report_cache.stats())
+
+REPORT_VIEWS = (HatchRateReportView, HatchRateAnalyticsView, SalesSummaryReportView,
+                ProductionSummaryReportView, DashboardReportView)
\ No newline at end of file
@@ -1,7 +1,7 @@
 # apps/sales/admin.py
 
 from django.contrib import admin
-from .models import SaleRecord
+from .models import CustomerLedger, SaleRecord
 
 @admin.register(SaleRecord)
 class SaleRecordAdmin(admin.ModelAdmin):
@@ -11,3 +11,15 @@ class SaleRecordAdmin(admin.ModelAdmin):
     )
     list_filter   = ('date', 'status', 'payment_method')
     search_fields = ('batch_id', 'customer', 'product_type')
+
+@admin.register(CustomerLedger)
+class CustomerLedgerAdmin(admin.ModelAdmin):
+    list_display    = (
+        'customer', 'sale_count', 'balance',
+        'balance_0_30', 'balance_31_60', 'balance_over_60', 'aged_on'
+    )
+    search_fields   = ('customer',)
+    readonly_fields = (
+        'customer', 'sale_count', 'total_amount', 'paid', 'balance',
+        'balance_0_30', 'balance_31_60', 'balance_over_60', 'aged_on'
+    )
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class SalesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'sales'
+    name = 'apps.sales'
+
+    def ready(self):
+        from . import signals
+        signals.connect()
@@ -0,0 +1,150 @@
+# apps/sales/ledger.py
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from apps.core.upsert import add_deltas
+from .models import CustomerLedger, SaleRecord
+
+CANCELLED = 'cancelled'
+
+# Aging buckets, youngest first: (ledger field, oldest age in days or None).
+BUCKETS = (
+    ('balance_0_30',    30),
+    ('balance_31_60',   60),
+    ('balance_over_60', None),
+)
+
+# The maintained figures on each CustomerLedger row.
+LEDGER_FIELDS = ('sale_count', 'total_amount', 'paid', 'balance',
+                 'balance_0_30', 'balance_31_60', 'balance_over_60')
+
+# What a sale contributes depends on these columns only.
+SOURCE_FIELDS = ('customer', 'date', 'status', 'total_amount', 'paid', 'balance')
+
+
+def bucket_for(sale_date, today):
+    age = (today - sale_date).days
+    return next(field for field, oldest in BUCKETS if oldest is None or age <= oldest)
+
+
+def contribution(values, today, sign=1):
+    """{ledger field: delta} one sale adds to its customer; cancelled sales add nothing."""
+    if values['status'] == CANCELLED:
+        return {}
+    balance = sign * values['balance']
+    return {
+        'sale_count':   sign,
+        'total_amount': sign * values['total_amount'],
+        'paid':         sign * values['paid'],
+        'balance':      balance,
+        bucket_for(values['date'], today): balance,
+    }
+
+
+def ledger_deltas(rows, today, sign=1):
+    """Merge the contributions of many sales (dicts of SOURCE_FIELDS) per customer."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for values in rows:
+        for field, delta in contribution(values, today, sign).items():
+            deltas[values['customer']][field] += delta
+    return deltas
+
+
+def row_values(instance):
+    return {name: getattr(instance, name) for name in SOURCE_FIELDS}
+
+
+def adjust(deltas, today=None):
+    """
+    Apply ``{customer: {field: delta}}`` in a fixed number of statements
+    (see core.upsert.add_deltas), creating the ledger row on a customer's
+    first sale and dropping it when their last one goes. Buckets are aged
+    to ``today`` first, so the deltas land in the bucket the sale belongs
+    to now; ``rebuild_ledger`` resyncs anything subtracted from a missing
+    row.
+    """
+    today = today or timezone.localdate()
+    age(today)
+    add_deltas(CustomerLedger, 'customer', deltas, 'sale_count', defaults={'aged_on': today})
+
+
+def age(today=None):
+    """
+    Move open balances into older buckets as days pass.
+
+    Only ledgers last aged before ``today`` are touched, and of their
+    sales only those that can have crossed a bucket boundary since,
+    dated in (aged_on - 61 days, today - 31 days]. On a day with nothing
+    to age this is a single indexed query.
+    """
+    today = today or timezone.localdate()
+    stale = list(CustomerLedger.objects.filter(aged_on__lt=today)
+                 .values_list('aged_on', flat=True).distinct().order_by())
+    for aged_on in stale:
+        with transaction.atomic():
+            ledgers = CustomerLedger.objects.filter(aged_on=aged_on)
+            if not list(ledgers.select_for_update().values_list('pk', flat=True)):
+                continue    # aged by a concurrent writer
+            sales = (SaleRecord.objects
+                     .filter(customer__in=ledgers.values('customer'),
+                             date__gt=aged_on - timedelta(days=61), date__lte=today - timedelta(days=31))
+                     .exclude(status=CANCELLED)
+                     .values('customer', 'date').annotate(open=Sum('balance')).order_by())
+            moves = defaultdict(lambda: defaultdict(int))
+            for row in sales:
+                before, after = bucket_for(row['date'], aged_on), bucket_for(row['date'], today)
+                if before != after and row['open']:
+                    moves[row['customer']][before] -= row['open']
+                    moves[row['customer']][after]  += row['open']
+            for customer, fields in moves.items():
+                CustomerLedger.objects.filter(customer=customer).update(
+                    **{field: F(field) + delta for field, delta in fields.items() if delta})
+            ledgers.update(aged_on=today)
+
+
+def totals(sales, today):
+    """Ledger figures per customer straight from ``sales``, for recounts."""
+    thirty, sixty = today - timedelta(days=30), today - timedelta(days=60)
+    rows = (sales.exclude(status=CANCELLED)
+            .values('customer')
+            .annotate(
+                _sale_count=Count('id'),
+                _total_amount=Sum('total_amount'),
+                _paid=Sum('paid'),
+                _balance=Sum('balance'),
+                _balance_0_30=Sum('balance', filter=Q(date__gte=thirty)),
+                _balance_31_60=Sum('balance', filter=Q(date__lt=thirty, date__gte=sixty)),
+                _balance_over_60=Sum('balance', filter=Q(date__lt=sixty)),
+            )
+            .order_by())
+    for row in rows.iterator():
+        yield {'customer': row['customer'], **{f: row[f'_{f}'] or 0 for f in LEDGER_FIELDS}}
+
+
+@transaction.atomic
+def recount(customers, today=None):
+    """Rebuild the ledger rows of ``customers`` from their sales."""
+    today = today or timezone.localdate()
+    customers = set(customers)
+    CustomerLedger.objects.filter(customer__in=customers).delete()
+    CustomerLedger.objects.bulk_create(
+        CustomerLedger(aged_on=today, **row)
+        for row in totals(SaleRecord.objects.filter(customer__in=customers), today)
+    )
+
+
+@transaction.atomic
+def rebuild(today=None):
+    """Recompute the whole ledger from the sales table in two statements."""
+    today = today or timezone.localdate()
+    CustomerLedger.objects.all().delete()
+    CustomerLedger.objects.bulk_create(
+        (CustomerLedger(aged_on=today, **row) for row in totals(SaleRecord.objects.all(), today)),
+        batch_size=1000,
+    )
+    return CustomerLedger.objects.count()
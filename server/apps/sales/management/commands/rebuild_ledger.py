@@ -0,0 +1,13 @@
+# apps/sales/management/commands/rebuild_ledger.py
+
+from django.core.management.base import BaseCommand
+
+from apps.sales.ledger import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the customer ledger and its aging buckets from the sales table."
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Customer ledger rebuilt: {rows} customers."))
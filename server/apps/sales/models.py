@@ -23,6 +23,47 @@ class SaleRecord(models.Model):
                        ]
                      )                               
     notes          = models.TextField(blank=True)
+    lineage        = models.ForeignKey(
+                       'batches.Batch',
+                       on_delete=models.SET_NULL,
+                       null=True, blank=True, editable=False,
+                       related_name='sales'
+                     )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch_id', 'date'], name='sale_batch_date_idx'),
+            models.Index(fields=['date', 'id'],       name='sale_date_id_idx'),
+            models.Index(fields=['customer', 'date'], name='sale_customer_date_idx'),
+        ]
 
     def __str__(self):
         return f"Sale {self.batch_id} to {self.customer}"
+
+
+class CustomerLedger(models.Model):
+    """
+    What one customer owes, kept in step with SaleRecord writes: running
+    totals over their non-cancelled sales and the open balance split by
+    sale age. See ledger.py.
+    """
+    customer        = models.CharField(max_length=100, unique=True)
+    sale_count      = models.IntegerField(default=0)
+    total_amount    = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid            = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    balance         = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    balance_0_30    = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    balance_31_60   = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    balance_over_60 = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # The day the buckets were last aged to.
+    aged_on         = models.DateField(default=timezone.localdate)
+
+    class Meta:
+        indexes = [
+            # The ledger page: largest balances first.
+            models.Index(fields=['balance', 'id'], name='ledger_balance_id_idx'),
+            models.Index(fields=['aged_on'],       name='ledger_aged_on_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.customer}: {self.balance} owed"
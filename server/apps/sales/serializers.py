@@ -1,9 +1,15 @@
 # apps/sales/serializers.py
 
 from rest_framework import serializers
-from .models import SaleRecord
+from apps.core.serializers import SparseFieldsetMixin
+from .models import CustomerLedger, SaleRecord
 
-class SaleRecordSerializer(serializers.ModelSerializer):
+class SaleRecordSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model  = SaleRecord
         fields = '__all__'
+
+class CustomerLedgerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model  = CustomerLedger
+        fields = '__all__'
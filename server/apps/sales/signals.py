@@ -0,0 +1,70 @@
+# apps/sales/signals.py
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from apps.core.signals import bulk_created, bulk_updated, queryset_updated
+
+from . import ledger
+from .models import SaleRecord
+
+
+def capture_old_values(sender, instance, raw=False, **kwargs):
+    """Remember what the sale contributed to the ledger before the save."""
+    instance._ledger_old = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._ledger_old = sender.objects.filter(pk=instance.pk).values(*ledger.SOURCE_FIELDS).first()
+
+
+def post_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    today  = timezone.localdate()
+    old    = getattr(instance, '_ledger_old', None)
+    deltas = ledger.ledger_deltas([ledger.row_values(instance)], today)
+    if old:
+        for customer, fields in ledger.ledger_deltas([old], today, sign=-1).items():
+            for field, delta in fields.items():
+                deltas[customer][field] += delta
+    ledger.adjust(deltas, today)
+    instance._ledger_old = None
+
+
+def post_deleted(sender, instance, **kwargs):
+    today = timezone.localdate()
+    ledger.adjust(ledger.ledger_deltas([ledger.row_values(instance)], today, sign=-1), today)
+
+
+def post_bulk_created(sender, instances, **kwargs):
+    today = timezone.localdate()
+    ledger.adjust(ledger.ledger_deltas([ledger.row_values(obj) for obj in instances], today), today)
+
+
+def recount_bulk_updated(sender, instances, fields, **kwargs):
+    # bulk_update() gives no old values, so recount whoever was touched;
+    # a change of customer leaves the old one unknown, so rebuild.
+    if 'customer' in fields:
+        ledger.rebuild()
+    elif set(ledger.SOURCE_FIELDS) & set(fields):
+        ledger.recount({obj.customer for obj in instances})
+
+
+def recount_queryset_updated(sender, pks=None, fields=None, **kwargs):
+    # Table-wide rewrites (seeding, imports) name no rows, and after an
+    # UPDATE that may have set the customer the old ones are unknown:
+    # both rebuild. Otherwise the rows' customers are recounted.
+    if pks is None or fields is None or 'customer' in fields:
+        ledger.rebuild()
+    elif set(ledger.SOURCE_FIELDS) & set(fields):
+        ledger.recount(SaleRecord.objects.filter(pk__in=pks).values_list('customer', flat=True))
+
+
+def connect():
+    uid = 'sales.ledger'
+    pre_save.connect(capture_old_values, sender=SaleRecord, dispatch_uid=uid)
+    post_save.connect(post_saved, sender=SaleRecord, dispatch_uid=uid)
+    post_delete.connect(post_deleted, sender=SaleRecord, dispatch_uid=uid)
+    bulk_created.connect(post_bulk_created, sender=SaleRecord, dispatch_uid=uid)
+    bulk_updated.connect(recount_bulk_updated, sender=SaleRecord, dispatch_uid=uid)
+    queryset_updated.connect(recount_queryset_updated, sender=SaleRecord, dispatch_uid=uid)
@@ -1,3 +1,201 @@
+import json
+from io import StringIO
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.assertions import QueryPlanAssertionsMixin
+from apps.core.pagination import KeysetPagination
+from apps.core.signals import queryset_updated
+from . import ledger
+from .models import CustomerLedger, SaleRecord
+
+
+class SaleRecordQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_filter_by_batch(self):
+        qs = SaleRecord.objects.filter(batch_id='B-001')
+        self.assertIndexSearch(qs, 'sale_batch_date_idx')
+
+    def test_filter_by_batch_ordered_by_date(self):
+        qs = SaleRecord.objects.filter(batch_id='B-001').order_by('date')
+        self.assertIndexSearch(qs, 'sale_batch_date_idx')
+
+    def test_filter_by_date_range(self):
+        qs = SaleRecord.objects.filter(date__range=(date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertIndexSearch(qs)
+
+    def test_list_page(self):
+        qs = SaleRecord.objects.order_by('-date', '-id')[:51]
+        self.assertNoSequentialScan(qs)
+
+    def test_customer_statement(self):
+        qs = SaleRecord.objects.filter(customer='Acme Farms').order_by('date')
+        self.assertIndexSearch(qs, 'sale_customer_date_idx')
+
+    def test_list_page_after_cursor(self):
+        ordering = ('-date', '-id')
+        seek = KeysetPagination._seek(ordering, [date(2025, 1, 15), 1000])
+        qs = SaleRecord.objects.filter(seek).order_by(*ordering)[:51]
+        self.assertNoSequentialScan(qs)
+
+
+class SaleRecordExportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('accounts', password='pw'))
+        for day in (1, 2, 3):
+            SaleRecord.objects.create(
+                batch_id=f'B-{day}', date=date(2025, 3, day), customer='Acme, Ltd', product_type='chicks',
+                quantity=day, unit_price=Decimal('2.50'), total_amount=Decimal('2.50') * day,
+                paid=Decimal('0'), balance=Decimal('2.50') * day, payment_method='Cash', status='pending',
+            )
+
+    def body(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_streams_header_then_rows_in_date_order(self):
+        response = self.client.get('/api/sales/export/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('sale-export.csv', response['Content-Disposition'])
+        lines = self.body(response).splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'batch_id', 'date'])
+        self.assertEqual(len(lines), 4)
+        self.assertIn('"Acme, Ltd"', lines[1])
+        self.assertIn('2025-03-01', lines[1])
+
+    def test_ndjson_with_date_range(self):
+        response = self.client.get('/api/sales/export/?output=ndjson&from=2025-03-02&to=2025-03-02')
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual([r['batch_id'] for r in rows], ['B-2'])
+        self.assertEqual(rows[0]['total_amount'], '5.00')
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get('/api/sales/export/?output=xml').status_code, 400)
+        self.assertEqual(self.client.get('/api/sales/export/?from=03/01/2025').status_code, 400)
+
+
+class CustomerLedgerTests(TestCase):
+    """The ledger must always equal the totals over the sales table."""
+
+    def setUp(self):
+        self.today  = timezone.localdate()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('accounts', password='pw'))
+
+    def sale(self, customer, days_ago, amount, paid='0', status='pending'):
+        amount, paid = Decimal(amount), Decimal(paid)
+        return SaleRecord.objects.create(
+            batch_id='B-1', date=self.today - timedelta(days=days_ago), customer=customer,
+            product_type='chicks', quantity=1, unit_price=amount, total_amount=amount, paid=paid,
+            balance=amount - paid, payment_method='Cash', status=status,
+        )
+
+    def ledger(self):
+        return {
+            row.pop('customer'): row
+            for row in CustomerLedger.objects.values('customer', *ledger.LEDGER_FIELDS)
+        }
+
+    def assertLedgerMatchesSales(self, today=None):
+        expected = {row.pop('customer'): row
+                    for row in ledger.totals(SaleRecord.objects.all(), today or self.today)}
+        self.assertEqual(self.ledger(), expected)
+
+    def test_sales_land_in_their_age_bucket(self):
+        self.sale('Acme', 3, '100.00', paid='40.00')
+        self.sale('Acme', 45, '50.00')
+        self.sale('Acme', 90, '10.00')
+        self.sale('Zed', 0, '5.00', paid='5.00', status='completed')
+        acme = self.ledger()['Acme']
+        self.assertEqual(acme['sale_count'], 3)
+        self.assertEqual(acme['balance'], Decimal('120.00'))
+        self.assertEqual((acme['balance_0_30'], acme['balance_31_60'], acme['balance_over_60']),
+                         (Decimal('60.00'), Decimal('50.00'), Decimal('10.00')))
+        self.assertLedgerMatchesSales()
+
+    def test_updates_payments_and_cancellations(self):
+        sale = self.sale('Acme', 10, '100.00')
+        self.sale('Acme', 40, '30.00')
+        sale.paid, sale.balance = Decimal('100.00'), Decimal('0')
+        sale.save()
+        self.assertLedgerMatchesSales()
+
+        sale.customer = 'Acme Farms'
+        sale.save()
+        self.assertLedgerMatchesSales()
+
+        sale.status = 'cancelled'
+        sale.save()
+        self.assertNotIn('Acme Farms', self.ledger())
+        self.assertLedgerMatchesSales()
+
+    def test_deleting_the_last_sale_drops_the_customer(self):
+        sale = self.sale('Acme', 1, '10.00')
+        sale.delete()
+        self.assertEqual(self.ledger(), {})
+
+    def test_bulk_created_sales_are_folded_in(self):
+        rows = [{
+            'batch_id': 'B-1', 'date': str(self.today - timedelta(days=d)), 'customer': f'C{d % 3}',
+            'product_type': 'chicks', 'quantity': 1, 'unit_price': '2.00', 'total_amount': '2.00',
+            'paid': '0', 'balance': '2.00', 'payment_method': 'Cash', 'status': 'pending',
+        } for d in range(0, 100, 7)]
+        self.assertEqual(self.client.post('/api/sales/', rows, format='json').status_code, 201)
+        self.assertLedgerMatchesSales()
+
+    def test_balances_age_as_days_pass(self):
+        self.sale('Acme', 25, '10.00')
+        self.sale('Acme', 50, '20.00')
+        self.sale('Acme', 59, '40.00', status='cancelled')
+        later = self.today + timedelta(days=15)
+        ledger.age(later)
+        acme = self.ledger()['Acme']
+        self.assertEqual((acme['balance_0_30'], acme['balance_31_60'], acme['balance_over_60']),
+                         (0, Decimal('10.00'), Decimal('20.00')))
+        self.assertLedgerMatchesSales(later)
+        with self.assertNumQueries(1):
+            ledger.age(later)
+
+    def test_recounts_after_queryset_updates(self):
+        sale = self.sale('Acme', 5, '10.00')
+        SaleRecord.objects.filter(pk=sale.pk).update(balance=Decimal('4.00'), paid=Decimal('6.00'))
+        queryset_updated.send(sender=SaleRecord, pks=[sale.pk], fields=['balance', 'paid'])
+        self.assertLedgerMatchesSales()
+        SaleRecord.objects.filter(pk=sale.pk).update(customer='Acme Farms')
+        queryset_updated.send(sender=SaleRecord, pks=[sale.pk], fields=['customer'])
+        self.assertLedgerMatchesSales()
+        self.assertNotIn('Acme', self.ledger())
+        SaleRecord.objects.filter(pk=sale.pk).update(customer='Zed')
+        queryset_updated.send(sender=SaleRecord, pks=[sale.pk])     # columns not given
+        self.assertLedgerMatchesSales()
+        SaleRecord.objects.update(status='completed', balance=0)
+        queryset_updated.send(sender=SaleRecord)
+        self.assertLedgerMatchesSales()
+
+    def test_rebuild_command_matches_sales(self):
+        self.sale('Acme', 5, '10.00')
+        self.sale('Zed', 70, '7.00')
+        CustomerLedger.objects.update(balance=0)
+        call_command('rebuild_ledger', stdout=StringIO())
+        self.assertLedgerMatchesSales()
+
+    def test_endpoints_page_through_the_ledger(self):
+        for i in range(5):
+            self.sale(f'C{i}', i * 20, f'{i + 1}0.00')
+        with self.assertNumQueries(2):      # aging check + page
+            page = self.client.get('/api/customer-ledger/', {'page_size': 2}).json()
+        self.assertEqual([row['customer'] for row in page['results']], ['C4', 'C3'])
+        page = self.client.get(page['next']).json()
+        self.assertEqual([row['customer'] for row in page['results']], ['C2', 'C1'])
 
-# Create your tests here.
+        aging = self.client.get('/api/customer-ledger/aging/').json()
+        self.assertEqual(aging, {'balance': '150.00', 'balance_0_30': '30.00',
+                                 'balance_31_60': '70.00', 'balance_over_60': '50.00'})
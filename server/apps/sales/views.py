@@ -1,11 +1,43 @@
 # apps/sales/views.py
 
+from django.db.models import Sum
+from django.utils import timezone
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from .models       import SaleRecord
-from .serializers  import SaleRecordSerializer
+from rest_framework.response import Response
+from apps.changes.conditional import ConditionalGetMixin
+from apps.core.exports import ExportMixin
+from apps.core.mixins import BulkCreateMixin, FastListMixin
+from . import ledger
+from .models       import CustomerLedger, SaleRecord
+from .serializers  import CustomerLedgerSerializer, SaleRecordSerializer
 
-class SaleRecordViewSet(viewsets.ModelViewSet):
+class SaleRecordViewSet(ExportMixin, ConditionalGetMixin, FastListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     queryset           = SaleRecord.objects.all()
     serializer_class   = SaleRecordSerializer
     permission_classes = [IsAuthenticated]
+    ordering           = ('-date', '-id')
+
+class CustomerLedgerViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    What each customer owes, largest balance first, aged 0-30 / 31-60 /
+    60+ days. Reads the ledger maintained on sale writes; see ledger.py.
+    The buckets move with the calendar, so responses carry no ETag.
+    """
+    queryset           = CustomerLedger.objects.all()
+    serializer_class   = CustomerLedgerSerializer
+    permission_classes = [IsAuthenticated]
+    ordering           = ('-balance', '-id')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        ledger.age(timezone.localdate())
+
+    @action(detail=False, methods=['get'])
+    def aging(self, request):
+        """Receivables across all customers, per bucket."""
+        fields = self.get_serializer().fields
+        names  = ['balance'] + [name for name, _ in ledger.BUCKETS]
+        totals = CustomerLedger.objects.aggregate(**{name: Sum(name) for name in names})
+        return Response({name: fields[name].to_representation(totals[name] or 0) for name in names})
@@ -0,0 +1,17 @@
+# apps/telemetry/admin.py
+
+from django.contrib import admin
+from .models import TelemetryBucket, TelemetryRollup
+
+@admin.register(TelemetryBucket)
+class TelemetryBucketAdmin(admin.ModelAdmin):
+    list_display  = ('incubator', 'metric', 'bucket_start', 'count', 'last_value')
+    list_select_related = ('incubator',)
+    list_filter   = ('metric', 'incubator')
+    exclude       = ('samples',)
+
+@admin.register(TelemetryRollup)
+class TelemetryRollupAdmin(admin.ModelAdmin):
+    list_display  = ('incubator', 'metric', 'resolution', 'bucket_start', 'count')
+    list_select_related = ('incubator',)
+    list_filter   = ('metric', 'resolution', 'incubator')
@@ -0,0 +1,176 @@
+# apps/telemetry/ingest.py
+
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+from math import isfinite
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.incubation.models import Incubator
+from .models import METRIC_CHOICES, SAMPLE, TelemetryBucket, TelemetryRollup
+
+METRICS = {name for name, _ in METRIC_CHOICES}
+
+# Sent after a batch is stored, with ``readings`` = list of
+# (incubator_id, metric, timestamp, value) tuples in payload order.
+readings_ingested = Signal()
+
+
+def parse_readings(payload):
+    """
+    Validate a JSON array of {incubator, metric, timestamp, value} objects
+    into (incubator_id, metric, aware datetime, float) tuples. Hand-rolled
+    rather than a serializer: batches are thousands of readings.
+
+    Returns ``(readings, errors)``; errors are [{'index': i, 'errors': msg}].
+    """
+    if not isinstance(payload, list):
+        return [], [{'index': None, 'errors': 'Expected a JSON array of readings.'}]
+
+    readings, errors = [], []
+    for index, item in enumerate(payload):
+        try:
+            readings.append(_parse_one(item))
+        except (KeyError, TypeError, ValueError) as exc:
+            errors.append({'index': index, 'errors': str(exc) or 'Invalid reading.'})
+    if errors:
+        return [], errors
+
+    known = set(Incubator.objects.filter(pk__in={r[0] for r in readings}).values_list('pk', flat=True))
+    errors = [
+        {'index': i, 'errors': f'Unknown incubator {r[0]}.'}
+        for i, r in enumerate(readings) if r[0] not in known
+    ]
+    return ([], errors) if errors else (readings, [])
+
+
+def _parse_one(item):
+    incubator = item['incubator']
+    if isinstance(incubator, bool) or not isinstance(incubator, int):
+        raise ValueError('incubator must be an integer id.')
+    metric = item['metric']
+    if metric not in METRICS:
+        raise ValueError(f'metric must be one of {sorted(METRICS)}.')
+    timestamp = parse_datetime(item['timestamp']) if isinstance(item['timestamp'], str) else None
+    if timestamp is None:
+        raise ValueError('timestamp must be an ISO 8601 datetime.')
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp, dt_timezone.utc)
+    value = item['value']
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not isfinite(value):
+        raise ValueError('value must be a finite number.')
+    return incubator, metric, timestamp, float(value)
+
+
+def _window(epoch, seconds):
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=dt_timezone.utc)
+
+
+def _lock_rows(model, empties, **filters):
+    """
+    The rows for ``empties`` (key -> an unsaved, count=0 row), locked FOR
+    UPDATE. Missing rows are inserted empty first, skipping any another
+    ingest inserted meanwhile; SELECT ... FOR UPDATE cannot lock a row
+    that does not exist yet, the unique constraint can.
+    """
+    model.objects.bulk_create(empties.values(), batch_size=500, ignore_conflicts=True)
+    return {
+        (row.incubator_id, row.metric, row.bucket_start): row
+        for row in model.objects.select_for_update().filter(
+            incubator_id__in={k[0] for k in empties},
+            metric__in={k[1] for k in empties},
+            bucket_start__in={k[2] for k in empties},
+            **filters,
+        )
+    }
+
+
+@transaction.atomic
+def ingest(readings):
+    """
+    Store a batch of parsed readings: append them to their raw buckets and
+    fold them into every rollup resolution. The statement count depends on
+    the number of resolutions, not on the number of readings.
+    """
+    if not readings:
+        return 0
+
+    # -- raw buckets ---------------------------------------------------------
+    by_bucket = defaultdict(list)
+    for incubator_id, metric, timestamp, value in readings:
+        epoch = timestamp.timestamp()
+        start = _window(int(epoch), TelemetryBucket.BUCKET_SECONDS)
+        by_bucket[(incubator_id, metric, start)].append((epoch, timestamp, value))
+
+    buckets = _lock_rows(TelemetryBucket, {
+        key: TelemetryBucket(incubator_id=key[0], metric=key[1], bucket_start=key[2], count=0,
+                             value_min=points[0][2], value_max=points[0][2], last_at=points[0][1],
+                             last_value=points[0][2])
+        for key, points in by_bucket.items()
+    })
+    for key, points in by_bucket.items():
+        base   = key[2].timestamp()
+        packed = b''.join(SAMPLE.pack(int((epoch - base) * 1000), value) for epoch, _, value in points)
+        values = [value for _, _, value in points]
+        newest = max(points, key=lambda p: p[0])
+
+        bucket = buckets[key]
+        if not bucket.count:
+            bucket.samples, bucket.value_sum = b'', 0
+            bucket.value_min, bucket.value_max = values[0], values[0]
+            bucket.last_at, bucket.last_value = newest[1], newest[2]
+        bucket.samples    = bytes(bucket.samples) + packed
+        bucket.count     += len(points)
+        bucket.value_min  = min(bucket.value_min, *values)
+        bucket.value_max  = max(bucket.value_max, *values)
+        bucket.value_sum += sum(values)
+        if newest[1] >= bucket.last_at:
+            bucket.last_at, bucket.last_value = newest[1], newest[2]
+
+    TelemetryBucket.objects.bulk_update(
+        [buckets[key] for key in by_bucket],
+        ['samples', 'count', 'value_min', 'value_max', 'value_sum', 'last_at', 'last_value'],
+        batch_size=500,
+    )
+
+    # -- downsampled rollups ---------------------------------------------------
+    for resolution, seconds in TelemetryRollup.RESOLUTIONS.items():
+        _fold_rollups(resolution, seconds, readings)
+
+    transaction.on_commit(lambda: readings_ingested.send(sender=TelemetryBucket, readings=readings))
+    return len(readings)
+
+
+def _fold_rollups(resolution, seconds, readings):
+    stats = {}
+    for incubator_id, metric, timestamp, value in readings:
+        key = (incubator_id, metric, _window(int(timestamp.timestamp()), seconds))
+        s = stats.get(key)
+        if s is None:
+            stats[key] = [1, value, value, value]
+        else:
+            s[0] += 1
+            s[1] += value
+            s[2] = min(s[2], value)
+            s[3] = max(s[3], value)
+
+    rows = _lock_rows(TelemetryRollup, {
+        key: TelemetryRollup(incubator_id=key[0], metric=key[1], resolution=resolution, bucket_start=key[2],
+                             count=0, value_min=low, value_max=high)
+        for key, (_, _, low, high) in stats.items()
+    }, resolution=resolution)
+    for key, (count, total, low, high) in stats.items():
+        row = rows[key]
+        if not row.count:
+            row.value_sum, row.value_min, row.value_max = 0, low, high
+        row.count     += count
+        row.value_sum += total
+        row.value_min  = min(row.value_min, low)
+        row.value_max  = max(row.value_max, high)
+
+    TelemetryRollup.objects.bulk_update([rows[key] for key in stats], ['count', 'value_sum', 'value_min', 'value_max'],
+                                        batch_size=500)
+
@@ -0,0 +1,77 @@
+# apps/telemetry/models.py
+
+import struct
+
+from django.db import models
+from apps.incubation.models import Incubator
+
+METRIC_CHOICES = [
+    ('temperature', 'Temperature'),     # °C
+    ('humidity',    'Humidity'),        # % RH
+    ('co2',         'CO2'),             # ppm
+]
+
+# One raw sample inside a bucket: ms offset from bucket_start + float32 value.
+SAMPLE = struct.Struct('<If')
+
+class TelemetryBucket(models.Model):
+    """
+    Raw readings for one incubator/metric over one BUCKET_SECONDS window,
+    packed into a single row instead of one row per reading.
+    """
+    BUCKET_SECONDS = 3600
+
+    incubator    = models.ForeignKey(Incubator, on_delete=models.CASCADE, related_name='telemetry_buckets')
+    metric       = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    bucket_start = models.DateTimeField()
+    samples      = models.BinaryField(default=b'')          # SAMPLE records, arrival order
+    count        = models.PositiveIntegerField(default=0)
+    value_min    = models.FloatField()
+    value_max    = models.FloatField()
+    value_sum    = models.FloatField(default=0)
+    last_at      = models.DateTimeField()                   # newest reading in the bucket
+    last_value   = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['incubator', 'metric', 'bucket_start'], name='telemetry_bucket_uniq'),
+        ]
+        indexes = [
+            # The dashboard's latest values: recent buckets of every incubator.
+            models.Index(fields=['bucket_start'], name='telemetry_bucket_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.incubator_id}/{self.metric} @ {self.bucket_start} ({self.count})"
+
+    def iter_samples(self):
+        """Yield (offset_ms, value) pairs."""
+        return SAMPLE.iter_unpack(bytes(self.samples))
+
+class TelemetryRollup(models.Model):
+    """Pre-aggregated readings at a fixed resolution, for dashboard range queries."""
+    RESOLUTIONS = {'1m': 60, '15m': 900, '1h': 3600}
+
+    incubator    = models.ForeignKey(Incubator, on_delete=models.CASCADE, related_name='telemetry_rollups')
+    metric       = models.CharField(max_length=20, choices=METRIC_CHOICES)
+    resolution   = models.CharField(max_length=4, choices=[(r, r) for r in RESOLUTIONS])
+    bucket_start = models.DateTimeField()
+    count        = models.PositiveIntegerField(default=0)
+    value_min    = models.FloatField()
+    value_max    = models.FloatField()
+    value_sum    = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['incubator', 'metric', 'resolution', 'bucket_start'],
+                name='telemetry_rollup_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.incubator_id}/{self.metric} {self.resolution} @ {self.bucket_start}"
+
+    @property
+    def value_mean(self):
+        return self.value_sum / self.count if self.count else None
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.core.assertions import QueryPlanAssertionsMixin
+from apps.incubation.models import Incubator
+from .ingest import ingest, parse_readings
+from .models import TelemetryBucket, TelemetryRollup
+
+T0 = datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def parsed(payload):
+    readings, errors = parse_readings(payload)
+    assert not errors, errors
+    return readings
+
+
+def reading(incubator, seconds, value, metric='temperature'):
+    return {
+        'incubator': incubator.pk, 'metric': metric,
+        'timestamp': (T0 + timedelta(seconds=seconds)).isoformat(), 'value': value,
+    }
+
+
+class TelemetryIngestTests(TestCase):
+
+    def setUp(self):
+        self.incubator = Incubator.objects.create(name='Setter 1', capacity=50000)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('sensor', password='pw'))
+
+    def test_readings_are_bucketed_not_stored_per_row(self):
+        # Two hours of 5-second readings.
+        payload = [reading(self.incubator, s, 37.5 + (s % 60) / 100) for s in range(0, 7200, 5)]
+        response = self.client.post('/api/telemetry/readings/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'ingested': 1440})
+
+        self.assertEqual(TelemetryBucket.objects.count(), 2)
+        self.assertEqual(sum(b.count for b in TelemetryBucket.objects.all()), 1440)
+        self.assertEqual(TelemetryRollup.objects.filter(resolution='1m').count(), 120)
+        self.assertEqual(TelemetryRollup.objects.filter(resolution='15m').count(), 8)
+        self.assertEqual(TelemetryRollup.objects.filter(resolution='1h').count(), 2)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        small = parsed([reading(self.incubator, s, 37.0) for s in range(10)])
+        large = parsed([reading(self.incubator, s, 37.0) for s in range(3600, 7200)])
+        with CaptureQueriesContext(connection) as small_ctx:
+            ingest(small)
+        with CaptureQueriesContext(connection) as large_ctx:
+            ingest(large)
+        # savepoint/release + insert/select/update for buckets and each resolution
+        self.assertLessEqual(len(small_ctx), 14)
+        self.assertLessEqual(len(large_ctx), 14)
+
+    def test_later_batches_merge_into_existing_buckets(self):
+        ingest(parsed([reading(self.incubator, 0, 37.0), reading(self.incubator, 30, 38.0)]))
+        ingest(parsed([reading(self.incubator, 45, 36.0)]))
+
+        bucket = TelemetryBucket.objects.get()
+        self.assertEqual(bucket.count, 3)
+        self.assertEqual([round(v, 1) for _, v in bucket.iter_samples()], [37.0, 38.0, 36.0])
+        self.assertEqual((bucket.value_min, bucket.value_max, bucket.last_value), (36.0, 38.0, 36.0))
+
+        minute = TelemetryRollup.objects.get(resolution='1m')
+        self.assertEqual(minute.count, 3)
+        self.assertAlmostEqual(minute.value_mean, 37.0)
+
+    def test_rows_inserted_by_a_concurrent_ingest_are_merged_into(self):
+        # Another ingest has inserted, but not yet filled, this hour's rows.
+        TelemetryBucket.objects.create(incubator=self.incubator, metric='temperature', bucket_start=T0,
+                                       value_min=0, value_max=0, last_at=T0, last_value=0)
+        TelemetryRollup.objects.create(incubator=self.incubator, metric='temperature', resolution='1h',
+                                       bucket_start=T0, value_min=0, value_max=0)
+        ingest(parsed([reading(self.incubator, 0, 37.0), reading(self.incubator, 30, 38.0)]))
+
+        bucket = TelemetryBucket.objects.get()
+        self.assertEqual((bucket.count, bucket.value_min, bucket.value_max), (2, 37.0, 38.0))
+        hour = TelemetryRollup.objects.get(resolution='1h')
+        self.assertEqual((hour.count, hour.value_min, hour.value_sum), (2, 37.0, 75.0))
+
+    def test_invalid_readings_report_their_index(self):
+        payload = [reading(self.incubator, 0, 37.0), {'incubator': 999, 'metric': 'temperature',
+                   'timestamp': T0.isoformat(), 'value': 1.0}, reading(self.incubator, 0, 'hot')]
+        response = self.client.post('/api/telemetry/readings/', payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e['index'] for e in response.json()['errors']], [2])
+        self.assertFalse(TelemetryBucket.objects.exists())
+
+
+class TelemetryQueryTests(TestCase):
+
+    def setUp(self):
+        self.incubator = Incubator.objects.create(name='Setter 1', capacity=50000)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('viewer', password='pw'))
+        ingest(parsed(
+            [reading(self.incubator, s, 37.0 + s / 3600) for s in range(0, 3 * 3600, 10)]
+            + [reading(self.incubator, s, 55.0, metric='humidity') for s in range(0, 3 * 3600, 60)]
+        ))
+
+    def series(self, **params):
+        params.setdefault('incubator', self.incubator.pk)
+        params.setdefault('metric', 'temperature')
+        return self.client.get('/api/telemetry/series/', params).json()
+
+    def test_auto_resolution_reads_rollups(self):
+        day = self.series(**{'from': T0.isoformat(), 'to': (T0 + timedelta(days=1)).isoformat()})
+        self.assertEqual(day['resolution'], '15m')
+        self.assertEqual(len(day['points']), 12)
+
+        hour = self.series(**{'from': T0.isoformat(), 'to': (T0 + timedelta(hours=1)).isoformat()})
+        self.assertEqual(hour['resolution'], '1m')
+        self.assertEqual(len(hour['points']), 60)
+        self.assertEqual(hour['points'][0]['count'], 6)
+
+    def test_raw_resolution_unpacks_samples(self):
+        data = self.series(resolution='raw', **{
+            'from': (T0 + timedelta(minutes=59)).isoformat(),
+            'to':   (T0 + timedelta(minutes=61)).isoformat(),
+        })
+        self.assertEqual(len(data['points']), 12)
+
+    def test_latest_per_incubator_and_metric(self):
+        now = datetime.now(timezone.utc)
+        ingest(parsed([
+            {'incubator': self.incubator.pk, 'metric': 'temperature', 'timestamp': now.isoformat(), 'value': 37.7},
+            {'incubator': self.incubator.pk, 'metric': 'humidity', 'timestamp': now.isoformat(), 'value': 55.0},
+        ]))
+        data = self.client.get('/api/telemetry/latest/').json()
+        self.assertEqual([row['metric'] for row in data], ['humidity', 'temperature'])
+        self.assertEqual([row['value'] for row in data], [55.0, 37.7])
+
+
+class TelemetryQueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_latest_values(self):
+        qs = TelemetryBucket.objects.filter(bucket_start__gte=T0).values_list('incubator_id', 'last_value')
+        self.assertIndexSearch(qs, 'telemetry_bucket_start_idx')
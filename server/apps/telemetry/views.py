@@ -0,0 +1,133 @@
+# apps/telemetry/views.py
+
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .ingest import METRICS, ingest, parse_readings
+from .models import TelemetryBucket, TelemetryRollup
+
+MAX_POINTS = 720    # what a dashboard chart can usefully draw
+
+class TelemetryIngestView(APIView):
+    """
+    POST a JSON array of {incubator, metric, timestamp, value} readings.
+    The batch is stored in a fixed number of statements.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        readings, errors = parse_readings(request.data)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'ingested': ingest(readings)}, status=status.HTTP_201_CREATED)
+
+class TelemetrySeriesView(APIView):
+    """
+    GET ?incubator=&metric=&from=&to=&resolution=auto|raw|1m|15m|1h
+
+    ``auto`` picks the finest rollup that fits the window in MAX_POINTS.
+    Defaults to the last 24 hours.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params    = request.query_params
+        incubator = params.get('incubator')
+        metric    = params.get('metric')
+        if not (incubator and incubator.isdigit()):
+            raise ValidationError({'incubator': 'Required integer id.'})
+        if metric not in METRICS:
+            raise ValidationError({'metric': f'One of {sorted(METRICS)}.'})
+
+        end   = self._parse_time(params, 'to') or timezone.now()
+        start = self._parse_time(params, 'from') or end - timedelta(days=1)
+        if start >= end:
+            raise ValidationError({'from': 'Must be before "to".'})
+
+        resolution = params.get('resolution', 'auto')
+        if resolution == 'auto':
+            span = (end - start).total_seconds()
+            resolution = next(
+                (r for r, seconds in sorted(TelemetryRollup.RESOLUTIONS.items(), key=lambda kv: kv[1])
+                 if span / seconds <= MAX_POINTS),
+                '1h',
+            )
+        if resolution == 'raw':
+            points = self._raw_points(int(incubator), metric, start, end)
+        elif resolution in TelemetryRollup.RESOLUTIONS:
+            points = self._rollup_points(int(incubator), metric, resolution, start, end)
+        else:
+            raise ValidationError({'resolution': 'One of auto, raw, 1m, 15m, 1h.'})
+
+        return Response({
+            'incubator':  int(incubator),
+            'metric':     metric,
+            'resolution': resolution,
+            'points':     points,
+        })
+
+    @staticmethod
+    def _parse_time(params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValidationError({name: 'ISO 8601 datetime.'})
+        return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+    @staticmethod
+    def _rollup_points(incubator, metric, resolution, start, end):
+        rows = TelemetryRollup.objects.filter(
+            incubator_id=incubator, metric=metric, resolution=resolution,
+            bucket_start__gte=start, bucket_start__lt=end,
+        ).order_by('bucket_start').values_list('bucket_start', 'count', 'value_sum', 'value_min', 'value_max')
+        return [
+            {'t': t, 'mean': round(total / count, 3), 'min': low, 'max': high, 'count': count}
+            for t, count, total, low, high in rows
+        ]
+
+    @staticmethod
+    def _raw_points(incubator, metric, start, end):
+        if (end - start).total_seconds() > TelemetryBucket.BUCKET_SECONDS * 24:
+            raise ValidationError({'resolution': 'Raw readings are limited to 24 hours per request.'})
+        buckets = TelemetryBucket.objects.filter(
+            incubator_id=incubator, metric=metric,
+            bucket_start__gt=start - timedelta(seconds=TelemetryBucket.BUCKET_SECONDS),
+            bucket_start__lt=end,
+        ).order_by('bucket_start')
+        points = []
+        for bucket in buckets:
+            for offset_ms, value in bucket.iter_samples():
+                t = bucket.bucket_start + timedelta(milliseconds=offset_ms)
+                if start <= t < end:
+                    points.append({'t': t, 'value': round(value, 3)})
+        points.sort(key=lambda p: p['t'])
+        return points
+
+class TelemetryLatestView(APIView):
+    """Current value per incubator and metric, for the Dashboard cards."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # Only the two newest buckets can hold a live reading.
+        since = timezone.now() - timedelta(seconds=2 * TelemetryBucket.BUCKET_SECONDS)
+        rows = TelemetryBucket.objects.filter(bucket_start__gte=since).values_list(
+            'incubator_id', 'incubator__name', 'metric', 'last_at', 'last_value',
+        )
+        latest = {}
+        for incubator_id, name, metric, last_at, last_value in rows:
+            key = (incubator_id, metric)
+            if key not in latest or last_at > latest[key]['timestamp']:
+                latest[key] = {
+                    'incubator': incubator_id, 'incubator_name': name, 'metric': metric,
+                    'timestamp': last_at, 'value': round(last_value, 3),
+                }
+        return Response(sorted(latest.values(), key=lambda r: (r['incubator'], r['metric'])))
@@ -2,6 +2,10 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Run the API from this module (uvicorn, daphne, ...) so the live feed at
+/api/stream/ can keep connections open without tying up worker threads.
+The async report variants under /api/reports/async/ also run their
+independent aggregates side by side here (apps/reports_analytics/async_views.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -1,5 +1,6 @@
 # server/config/settings/base.py
 import os
+import tempfile
 import environ
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -20,6 +21,28 @@ DATABASES = {
     'default': env.db(),  # Reads DATABASE_URL
 }
 
+# Optional read replica: reports and exports read from it (see
+# apps/core/routers.py). Locally, point it at a second SQLite file and
+# copy the primary over with `manage.py sync_replica`.
+if env.str('DATABASE_REPLICA_URL', default=''):
+    DATABASES['replica'] = env.db('DATABASE_REPLICA_URL')
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    if DATABASES['replica']['ENGINE'].endswith('sqlite3'):
+        DATABASES['replica'].setdefault('OPTIONS', {})['init_command'] = 'PRAGMA query_only = ON;'
+
+DATABASE_ROUTERS = ['apps.core.routers.ReplicaRouter']
+
+# Keep connections open between requests (DB_CONN_MAX_AGE seconds). On
+# PostgreSQL, DB_POOL=true uses a psycopg connection pool per process
+# instead, which needs CONN_MAX_AGE = 0.
+for db in DATABASES.values():
+    if env.bool('DB_POOL', default=False) and db['ENGINE'].endswith('postgresql'):
+        db.setdefault('OPTIONS', {})['pool'] = True
+        db['CONN_MAX_AGE'] = 0
+    else:
+        db['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+    db['CONN_HEALTH_CHECKS'] = True
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -32,6 +55,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     
     # Custom apps
+    'apps.core',
     'apps.egg_collections',
     'apps.egg_settings',
     'apps.incubation',
@@ -43,14 +67,21 @@ INSTALLED_APPS = [
     'apps.alerts',
     'apps.reports_analytics',
     'apps.notifications',
+    'apps.telemetry',
+    'apps.batches',
+    'apps.changes',
+    'apps.jobs',
     # 'apps.inventory',
     # 'apps.hatchery_management',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.core.authentication.CachedJWTAuthentication',
     ),
+    # Keyset cursors by default; ?paginate=offset for admin-style tables
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.HatcheryPagination',
+    'PAGE_SIZE': 50,
 }
 
 MIDDLEWARE = [
@@ -61,8 +92,61 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.core.middleware.QueryCountMiddleware',
 ]
 
+# Users behind access tokens are cached per process for this many seconds
+# (0 disables). Saves, deletes and queryset_updated() revoke them through
+# the 'auth' cache, which every process must share: the default file cache
+# covers the workers of one host; point AUTH_CACHE_URL at redis/memcached
+# when they span hosts. With a per-process (locmem) cache a deactivated
+# user's live token keeps working in the other processes for up to
+# AUTH_USER_CACHE_TTL seconds, and `check` warns (core.W001). See
+# apps/core/authentication.py.
+AUTH_USER_CACHE_TTL    = env.float('AUTH_USER_CACHE_TTL', default=10.0)
+AUTH_USER_CACHE_SIZE   = env.int('AUTH_USER_CACHE_SIZE', default=1024)
+AUTH_USER_CACHE_STAMPS = 'auth'
+
+# Requests running more queries than this are logged to 'apps.queries'.
+QUERY_COUNT_WARN = env.int('QUERY_COUNT_WARN', default=50)
+
+# Caches: report responses live in their own bounded LRU cache. Use a
+# filecache:// URL to share it between worker processes.
+REPORT_CACHE = env.cache('REPORT_CACHE_URL', default='locmemcache://reports?max_entries=512')
+if REPORT_CACHE['BACKEND'].endswith('FileBasedCache'):
+    REPORT_CACHE['BACKEND'] = 'apps.core.cache.LRUFileBasedCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'reports': REPORT_CACHE,
+    'auth':    env.cache('AUTH_CACHE_URL', default='filecache://'
+                         + os.path.join(tempfile.gettempdir(), 'hatchery-auth') + '?max_entries=100000'),
+}
+
+# Live updates (/api/stream/). The in-process broker only reaches clients
+# connected to the same process; swap in a shared one for several workers.
+EVENT_BROKER           = env.str('EVENT_BROKER', default='apps.core.events.InProcessBroker')
+EVENT_STREAM_HEARTBEAT = env.float('EVENT_STREAM_HEARTBEAT', default=15.0)
+
+# Background jobs (manage.py run_jobs) write their results here; the API
+# serves them to the user who submitted the job.
+JOBS_RESULT_ROOT = env.str('JOBS_RESULT_ROOT', default=os.path.join(BASE_DIR, 'media', 'jobs'))
+
+# The change log behind ?since= feeds keeps this many days (manage.py
+# prune_changes); clients with an older cursor reload their list.
+CHANGE_LOG_RETENTION_DAYS = env.int('CHANGE_LOG_RETENTION_DAYS', default=30)
+
+
+ROOT_URLCONF     = 'config.urls'
+WSGI_APPLICATION = 'config.wsgi.application'
+
+USE_TZ    = True
+TIME_ZONE = 'UTC'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
 # (rest of common settings: TEMPLATES, STATIC_URL, etc.)
 TEMPLATES = [
     {
@@ -0,0 +1,24 @@
+# server/config/settings/testing.py
+import os
+import tempfile
+
+# Tests run without a .env file: give base.py what it needs up front.
+os.environ.setdefault('SECRET_KEY', 'testing-insecure-secret-key-for-jwt-signing')
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+# Job results go to a scratch directory rather than media/.
+os.environ.setdefault('JOBS_RESULT_ROOT', os.path.join(tempfile.gettempdir(), 'hatchery-test-jobs'))
+
+from .base import *
+
+DEBUG = False
+ALLOWED_HOSTS = ['testserver', 'localhost']
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# The apps ship without migration files yet; build tables straight from models.
+MIGRATION_MODULES = {
+    app.rsplit('.', 1)[-1]: None
+    for app in INSTALLED_APPS if app.startswith('apps.')
+}
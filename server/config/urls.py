@@ -32,14 +32,32 @@ from apps.egg_candling.views import (
 from apps.lockdown.views import LockdownBatchViewSet
 from apps.hatching.views import HatchingRecordViewSet
 from apps.final_packaging.views import PackagingBatchViewSet
-from apps.sales.views import SaleRecordViewSet
-from apps.alerts.views import AlertViewSet
+from apps.sales.views import CustomerLedgerViewSet, SaleRecordViewSet
+from apps.alerts.views import AlertViewSet, AlertRuleViewSet
 from apps.reports_analytics.views import (
     HatchRateReportView,
+    HatchRateAnalyticsView,
     SalesSummaryReportView,
-    ProductionSummaryReportView
+    ProductionSummaryReportView,
+    DashboardReportView,
+    ReportCacheStatsView
+)
+from apps.reports_analytics.async_views import (
+    AsyncHatchRateReportView,
+    AsyncHatchRateAnalyticsView,
+    AsyncSalesSummaryReportView,
+    AsyncProductionSummaryReportView,
+    AsyncDashboardReportView
 )
 from apps.notifications.views import NotificationViewSet
+from apps.batches.views import BatchViewSet
+from apps.jobs.views import JobViewSet
+from apps.core.stream import event_stream
+from apps.telemetry.views import (
+    TelemetryIngestView,
+    TelemetrySeriesView,
+    TelemetryLatestView
+)
 
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -57,8 +75,12 @@ router.register(r'lockdown-batches', LockdownBatchViewSet, basename='lockdown-ba
 router.register(r'hatchings', HatchingRecordViewSet, basename='hatching')
 router.register(r'packaging-batches', PackagingBatchViewSet, basename='packaging-batch')
 router.register(r'sales', SaleRecordViewSet, basename='sale')
+router.register(r'customer-ledger', CustomerLedgerViewSet, basename='customer-ledger')
 router.register(r'alerts', AlertViewSet, basename='alert')
+router.register(r'alert-rules', AlertRuleViewSet, basename='alert-rule')
 router.register(r'notifications', NotificationViewSet, basename='notification')
+router.register(r'batches', BatchViewSet, basename='batch')
+router.register(r'jobs', JobViewSet, basename='job')
 
 
 urlpatterns = [
@@ -70,8 +92,27 @@ urlpatterns = [
     
     # Report endpoints (not router-registered)
     path('api/reports/hatch-rate/',   HatchRateReportView.as_view(),    name='report-hatch-rate'),
+    path('api/reports/hatch-rate/analytics/', HatchRateAnalyticsView.as_view(), name='report-hatch-rate-analytics'),
     path('api/reports/sales/',        SalesSummaryReportView.as_view(), name='report-sales'),
     path('api/reports/production/',   ProductionSummaryReportView.as_view(), name='report-production'),
+    path('api/reports/dashboard/',    DashboardReportView.as_view(),    name='report-dashboard'),
+    path('api/reports/cache-stats/',  ReportCacheStatsView.as_view(),   name='report-cache-stats'),
+    
+    # The same reports as async views (serve them through config.asgi)
+    path('api/reports/async/hatch-rate/',   AsyncHatchRateReportView.as_view(),    name='report-hatch-rate-async'),
+    path('api/reports/async/hatch-rate/analytics/', AsyncHatchRateAnalyticsView.as_view(),
+         name='report-hatch-rate-analytics-async'),
+    path('api/reports/async/sales/',        AsyncSalesSummaryReportView.as_view(), name='report-sales-async'),
+    path('api/reports/async/production/',   AsyncProductionSummaryReportView.as_view(), name='report-production-async'),
+    path('api/reports/async/dashboard/',    AsyncDashboardReportView.as_view(),    name='report-dashboard-async'),
+    
+    # Incubator telemetry (not router-registered)
+    path('api/telemetry/readings/',   TelemetryIngestView.as_view(),    name='telemetry-ingest'),
+    path('api/telemetry/series/',     TelemetrySeriesView.as_view(),    name='telemetry-series'),
+    path('api/telemetry/latest/',     TelemetryLatestView.as_view(),    name='telemetry-latest'),
+    
+    # Live alert/notification feed (server-sent events, ASGI only)
+    path('api/stream/',               event_stream,                     name='event-stream'),
     
     # App-specific API routes
     path('api/', include(router.urls)),